@@ -0,0 +1,4 @@
+'''
+Benchmarks for the ``XEdit`` object layer, run against ``SimulatedBackend`` so
+that they need neither Windows nor ``XEditLib.dll``. See ``benchmarks.run``.
+'''
@@ -0,0 +1,127 @@
+'''
+Builds the synthetic load order the benchmarks run against, as a fixture for
+``SimulatedBackend``. Everything is generated deterministically, so that api
+call counts are stable from run to run.
+'''
+MASTER = 'Bench.esm'
+
+ACBS_FLAGS = ['Female', 'Essential', 'Is CharGen Face Preset', 'Respawn',
+              'Auto-calc stats', 'Unique', 'Doesn\'t affect stealth meter',
+              'PC Level Mult', 'Audio template?', 'Protected', 'Summonable',
+              'Doesn\'t Bleed', 'Bleedout Override', 'Opposite Gender Anims',
+              'Simple Actor', 'looped script?', 'looped audio?',
+              'Ghost/non-interactable', 'Invulnerable']
+
+KEYWORDS = 0x800
+RACES = 0x900
+CLASSES = 0x910
+VOICE_TYPES = 0x920
+OUTFITS = 0x930
+COMBAT_STYLES = 0x940
+NPCS = 0x1000
+ARMORS = 0x4000
+CELLS = 0x6000
+
+
+def ref(form_id):
+    return {'$ref': form_id}
+
+
+def simple_records(signature, base, count, prefix):
+    return [{'$signature': signature,
+             '$form_id': base + i,
+             'EDID - Editor ID': f'{prefix}{i:03}',
+             'FULL - Name': f'{prefix} {i}'}
+            for i in range(count)]
+
+
+def npc(i):
+    return {
+        '$signature': 'NPC_',
+        '$form_id': NPCS + i,
+        'EDID - Editor ID': f'BenchNPC{i:04}',
+        'OBND - Object Bounds': {'X1': -22, 'Y1': -14, 'Z1': 0,
+                                 'X2': 22, 'Y2': 14, 'Z2': 128},
+        'ACBS - Configuration': {
+            'Flags': {'$flags': {flag: (i + bit) % 3 == 0
+                                 for bit, flag in enumerate(ACBS_FLAGS)}},
+            'Magicka Offset': 0,
+            'Stamina Offset': 0,
+            'Level': i % 50 + 1,
+            'Calc min level': 1,
+            'Calc max level': 0,
+            'Speed Multiplier': 100,
+            'Disposition Base': 35,
+            'Health Offset': 0,
+            'Bleedout Override': 0,
+        },
+        'RNAM - Race': ref(RACES + i % 3),
+        'KWDA - Keywords': [ref(KEYWORDS + (i + k) % 20) for k in range(2)],
+        'CNAM - Class': ref(CLASSES + i % 3),
+        'FULL - Name': f'Bench NPC {i}',
+        'SHRT - Short Name': f'NPC {i}',
+        'DNAM - Player Skills': {'Health': 50 + i % 100,
+                                 'Magicka': 50,
+                                 'Stamina': 50,
+                                 'Far away model distance': 0.0},
+        'ZNAM - Combat Style': ref(COMBAT_STYLES + i % 3),
+        'NAM6 - Height': 1.0,
+        'NAM7 - Weight': float(i % 100),
+        'VTCK - Voice': ref(VOICE_TYPES + i % 3),
+        'DOFT - Default outfit': ref(OUTFITS + i % 3),
+    }
+
+
+def armor(i):
+    return {
+        '$signature': 'ARMO',
+        '$form_id': ARMORS + i,
+        'EDID - Editor ID': f'BenchArmor{i:04}',
+        'FULL - Name': f'Bench Armor {i}',
+        'KWDA - Keywords': [ref(KEYWORDS + (i + k) % 20)
+                            for k in range(3 + i % 3)],
+        'DATA - Data': {'Value': 10 + i, 'Weight': 1.5},
+        'DNAM - Armor Rating': 20,
+    }
+
+
+def cell(i):
+    return {
+        '$signature': 'CELL',
+        '$form_id': CELLS + i,
+        'EDID - Editor ID': f'BenchCell{i:03}',
+        'FULL - Name': f'Bench Cell {i}',
+        'DATA - Flags': {'$flags': ['Is Interior Cell', 'Has Water']},
+        'XCLL - Lighting': {
+            'Ambient Color': {'Red': 10, 'Green': 12, 'Blue': 14},
+            'Directional Color': {'Red': 40, 'Green': 40, 'Blue': 40},
+            'Fog Color Near': {'Red': 0, 'Green': 0, 'Blue': 0},
+            'Fog Near': 0.0,
+            'Fog Far': 8000.0,
+            'Directional Rotation XY': 0,
+            'Directional Rotation Z': 0,
+            'Directional Fade': 1.0,
+            'Fog Clip Distance': 0.0,
+            'Fog Power': 1.0,
+        },
+        'XCLW - Water Height': -2147483648.0,
+        'XCLR - Regions': [ref(KEYWORDS + k) for k in range(4)],
+        'XCWT - Water': ref(0),
+    }
+
+
+def build_fixture(npc_count=1000, armor_count=200, cell_count=20):
+    '''
+    Returns a fixture with a single master holding the records the
+    benchmark workloads operate on.
+    '''
+    records = (simple_records('KYWD', KEYWORDS, 20, 'BenchKeyword') +
+               simple_records('RACE', RACES, 3, 'BenchRace') +
+               simple_records('CLAS', CLASSES, 3, 'BenchClass') +
+               simple_records('VTYP', VOICE_TYPES, 3, 'BenchVoice') +
+               simple_records('OTFT', OUTFITS, 3, 'BenchOutfit') +
+               simple_records('CSTY', COMBAT_STYLES, 3, 'BenchStyle') +
+               [npc(i) for i in range(npc_count)] +
+               [armor(i) for i in range(armor_count)] +
+               [cell(i) for i in range(cell_count)])
+    return {'files': [{'name': MASTER, 'records': records}]}
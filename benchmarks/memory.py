@@ -0,0 +1,65 @@
+'''
+Measures the memory held per element when holding on to the descendants of
+records, as full xedit objects and as the lightweight ``XEditView`` objects
+produced with ``fast=True``.
+
+Two numbers are reported per element: the size of the python object itself,
+including its ``__dict__`` if it has one, and everything allocated while
+collecting the elements, which also includes handle bookkeeping, and the
+simulated api's own allocations for each handle.
+
+.. highlight:: bash
+.. code-block:: bash
+
+    python -m benchmarks.memory
+'''
+import gc
+import sys
+import tracemalloc
+
+from benchmarks.fixture import MASTER, build_fixture
+from benchmarks.workloads import records
+from pyxedit import XEdit
+from pyxedit.xelib.backends import SimulatedBackend
+
+
+def measure(xedit, signature, fast, count=None):
+    '''
+    Collects the descendants of records of the given signature, and returns
+    the number collected, and the object size and total bytes allocated per
+    element.
+    '''
+    with xedit.manage_handles():
+        parents = list(records(xedit, signature, count))
+        gc.collect()
+        tracemalloc.start()
+        try:
+            elements = [element
+                        for parent in parents
+                        for element in parent.descendants(fast=fast)]
+            allocated, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        size = sum(sys.getsizeof(element) +
+                   (sys.getsizeof(element.__dict__)
+                    if hasattr(element, '__dict__') else 0)
+                   for element in elements)
+        return len(elements), size / len(elements), allocated / len(elements)
+
+
+def main(argv=None):
+    fixture = build_fixture(npc_count=200)
+    xedit = XEdit(plugins=[MASTER], backend=SimulatedBackend(fixture))
+    print(f'{"records":<8} {"elements":>9} {"kind":>5} {"object B/el":>12} '
+          f'{"allocated B/el":>15}')
+    with xedit.session():
+        for signature in ('NPC_', 'CELL'):
+            for kind, fast in (('full', False), ('view', True)):
+                count, size, allocated = measure(xedit, signature, fast=fast)
+                print(f'{signature:<8} {count:>9} {kind:>5} {size:>12.0f} '
+                      f'{allocated:>15.0f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
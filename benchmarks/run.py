@@ -0,0 +1,176 @@
+'''
+Runs the benchmark workloads against ``SimulatedBackend``, and compares the
+results to the baselines stored in ``benchmarks/baselines.json``.
+
+Api calls per operation are deterministic, so even small increases in them
+are regressions; wall time per operation varies from machine to machine and
+run to run, so it gets a far more generous threshold.
+
+.. highlight:: bash
+.. code-block:: bash
+
+    python -m benchmarks                     # run and compare to baselines
+    python -m benchmarks copy_into           # run only some workloads
+    python -m benchmarks --update            # store results as new baselines
+'''
+import argparse
+import json
+from pathlib import Path
+import sys
+
+from benchmarks.fixture import MASTER, build_fixture
+from benchmarks.workloads import WORKLOADS
+from pyxedit import XEdit
+from pyxedit.xelib.backends import SimulatedBackend
+
+BASELINES_PATH = Path(__file__).parent / 'baselines.json'
+
+CALL_THRESHOLD = 0.02
+TIME_THRESHOLD = 1.0
+
+
+class BenchmarkResult:
+    def __init__(self, name, operations, stats):
+        self.name = name
+        self.operations = operations
+        self.stats = stats
+
+    @property
+    def calls_per_operation(self):
+        return round(self.stats.total / self.operations, 2)
+
+    @property
+    def seconds_per_operation(self):
+        return self.stats.elapsed / self.operations
+
+    def to_dict(self):
+        return {
+            'operations': self.operations,
+            'calls_per_operation': self.calls_per_operation,
+            'seconds_per_operation': round(self.seconds_per_operation, 9),
+            'calls': dict(self.stats.calls.most_common()),
+        }
+
+
+def run_workload(workload, fixture, repeat=3, latency=0.0):
+    '''
+    Runs a workload ``repeat`` times, each in a fresh session, and returns
+    the result of the fastest run.
+    '''
+    best = None
+    for _ in range(repeat):
+        backend = SimulatedBackend(fixture, latency=latency, instrument=True)
+        xedit = XEdit(plugins=[MASTER], backend=backend)
+        with xedit.session():
+            if workload.setup:
+                workload.setup(xedit)
+            with backend.measure() as stats:
+                operations = workload.function(xedit)
+        if best is None or stats.elapsed < best.stats.elapsed:
+            best = BenchmarkResult(workload.name, operations, stats)
+    return best
+
+
+def compare(result, baseline, call_threshold=CALL_THRESHOLD,
+            time_threshold=TIME_THRESHOLD):
+    '''
+    Compares a result to its baseline.
+
+    Returns:
+        (``List[str]``) descriptions of any regressions beyond the thresholds
+    '''
+    regressions = []
+    calls, baseline_calls = (result.calls_per_operation,
+                             baseline['calls_per_operation'])
+    if calls > baseline_calls * (1 + call_threshold):
+        regressions.append(f'{result.name}: {calls} api calls per operation, '
+                           f'up from {baseline_calls}')
+
+    seconds, baseline_seconds = (result.seconds_per_operation,
+                                 baseline['seconds_per_operation'])
+    if seconds > baseline_seconds * (1 + time_threshold):
+        regressions.append(f'{result.name}: {seconds * 1e6:.1f}us per '
+                           f'operation, up from {baseline_seconds * 1e6:.1f}us')
+    return regressions
+
+
+def load_baselines(path=BASELINES_PATH):
+    try:
+        with open(path) as fp:
+            return json.load(fp)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(baselines, path=BASELINES_PATH):
+    with open(path, 'w') as fp:
+        json.dump(baselines, fp, indent=2, sort_keys=True)
+        fp.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmarks the XEdit object layer against a simulated '
+                    'XEditLib, reporting api calls and wall time per '
+                    'operation.')
+    parser.add_argument('workloads', nargs='*', metavar='workload',
+                        help=f'workloads to run, out of: '
+                             f'{", ".join(WORKLOADS)}; defaults to all')
+    parser.add_argument('--update', action='store_true',
+                        help='store the results as the new baselines')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per workload; the fastest is reported')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds of simulated latency per api call')
+    parser.add_argument('--call-threshold', type=float,
+                        default=CALL_THRESHOLD,
+                        help='allowed relative increase in api calls')
+    parser.add_argument('--time-threshold', type=float,
+                        default=TIME_THRESHOLD,
+                        help='allowed relative increase in wall time')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f'unknown workloads: {", ".join(sorted(unknown))}')
+
+    fixture = build_fixture()
+    baselines = load_baselines()
+    regressions = []
+
+    print(f'{"workload":<20} {"ops":>6} {"calls/op":>10} {"baseline":>10} '
+          f'{"us/op":>10} {"baseline":>10}')
+    for name in args.workloads or WORKLOADS:
+        result = run_workload(WORKLOADS[name], fixture, repeat=args.repeat,
+                              latency=args.latency)
+        baseline = baselines.get(name)
+        if baseline:
+            baseline_calls = baseline['calls_per_operation']
+            baseline_time = f'{baseline["seconds_per_operation"] * 1e6:.1f}'
+        else:
+            baseline_calls = baseline_time = '-'
+        print(f'{name:<20} {result.operations:>6} '
+              f'{result.calls_per_operation:>10} {baseline_calls:>10} '
+              f'{result.seconds_per_operation * 1e6:>10.1f} '
+              f'{baseline_time:>10}')
+
+        if args.update:
+            baselines[name] = result.to_dict()
+        elif baseline and not args.latency:
+            regressions.extend(compare(result, baseline,
+                                       call_threshold=args.call_threshold,
+                                       time_threshold=args.time_threshold))
+
+    if args.update:
+        save_baselines(baselines)
+        print(f'baselines written to {BASELINES_PATH}')
+        return 0
+
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+'''
+Measures startup cost: importing ``pyxedit``, constructing the ``XEdit``
+object, starting a session against ``SimulatedBackend``, and binding the
+ctypes prototypes of every ``XEditLib.dll`` function, as ``DLLBackend`` used
+to do on each session start before binding them lazily.
+
+Each phase is timed in a fresh interpreter, since imports are only ever paid
+for once per process; the fastest of several runs is reported, and compared
+to the ``startup`` entry of ``benchmarks/baselines.json``.
+
+.. highlight:: bash
+.. code-block:: bash
+
+    python -m benchmarks.startup             # run and compare to baselines
+    python -m benchmarks.startup --update    # store results as new baselines
+'''
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.run import load_baselines, save_baselines, BASELINES_PATH
+
+TIME_THRESHOLD = 1.0
+
+PHASES = ('import', 'construct', 'session', 'prototypes')
+
+# run in a fresh interpreter; prints the seconds taken by each phase as json
+SCRIPT = '''
+import json, time
+clock = time.perf_counter
+
+start = clock()
+import pyxedit
+imported = clock()
+
+from benchmarks.fixture import MASTER, build_fixture
+from pyxedit.xelib.backends import SimulatedBackend
+fixture = build_fixture(npc_count=1, armor_count=1, cell_count=1)
+
+start_construct = clock()
+xedit = pyxedit.XEdit(plugins=[MASTER], backend=SimulatedBackend(fixture))
+constructed = clock()
+with xedit.session():
+    session = clock()
+
+from pyxedit.xelib.backends.dll import prototype
+from pyxedit.xelib.definitions import XEditLibSignatures
+start_prototypes = clock()
+for signature in XEditLibSignatures:
+    prototype(signature.name)
+prototypes = clock()
+
+print(json.dumps({
+    'import': imported - start,
+    'construct': constructed - start_construct,
+    'session': session - constructed,
+    'prototypes': prototypes - start_prototypes,
+}))
+'''
+
+
+def measure_startup(repeat=5):
+    '''
+    Times each startup phase in ``repeat`` fresh interpreters.
+
+    Returns:
+        (``Dict[str, float]``) the fastest seconds taken by each phase
+    '''
+    best = {}
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', SCRIPT],
+                                check=True, capture_output=True, text=True)
+        for phase, seconds in json.loads(output.stdout).items():
+            best[phase] = min(seconds, best.get(phase, seconds))
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.startup',
+        description='Benchmarks the startup cost of pyxedit: import, XEdit '
+                    'construction, session start, and DLL prototype '
+                    'binding.')
+    parser.add_argument('--update', action='store_true',
+                        help='store the results as the new baselines')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='fresh interpreters to run; the fastest is '
+                             'reported')
+    parser.add_argument('--time-threshold', type=float,
+                        default=TIME_THRESHOLD,
+                        help='allowed relative increase in wall time')
+    args = parser.parse_args(argv)
+
+    result = measure_startup(repeat=args.repeat)
+    baselines = load_baselines()
+    baseline = baselines.get('startup', {})
+    regressions = []
+
+    print(f'{"phase":<12} {"ms":>10} {"baseline":>10}')
+    for phase in PHASES:
+        seconds = result[phase]
+        baseline_seconds = baseline.get(phase)
+        baseline_ms = (f'{baseline_seconds * 1e3:.2f}'
+                       if baseline_seconds is not None else '-')
+        print(f'{phase:<12} {seconds * 1e3:>10.2f} {baseline_ms:>10}')
+        if (baseline_seconds is not None and
+                seconds > baseline_seconds * (1 + args.time_threshold)):
+            regressions.append(f'startup {phase}: {seconds * 1e3:.2f}ms, '
+                               f'up from {baseline_seconds * 1e3:.2f}ms')
+
+    if args.update:
+        baselines['startup'] = {phase: round(seconds, 6)
+                                for phase, seconds in result.items()}
+        save_baselines(baselines)
+        print(f'baselines written to {BASELINES_PATH}')
+        return 0
+
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+'''
+The benchmarked workloads. Each one is a function taking an ``XEdit`` object
+in a session over the benchmark fixture, and returning the number of
+operations it performed; results are reported per operation. A workload may
+also have a setup function, which is run on the ``XEdit`` object first, and
+not measured.
+'''
+from collections import namedtuple
+from itertools import islice
+
+from benchmarks.fixture import MASTER
+from pyxedit.xedit.schema import XEditSchema
+
+Workload = namedtuple('Workload', ['name', 'function', 'description',
+                                   'setup'])
+
+WORKLOADS = {}
+
+
+def workload(name, setup=None):
+    def register(function):
+        WORKLOADS[name] = Workload(name, function,
+                                   function.__doc__.strip().splitlines()[0],
+                                   setup)
+        return function
+    return register
+
+
+def records(xedit, signature, count=None):
+    return islice(xedit[MASTER][signature].child_elements, count)
+
+
+@workload('iterate_records')
+def iterate_records(xedit):
+    '''
+    Iterate all NPC_ records of a plugin, reading each FormID
+    '''
+    count = 0
+    for record in records(xedit, 'NPC_'):
+        record.form_id
+        count += 1
+    return count
+
+
+@workload('iter_records')
+def iter_records(xedit):
+    '''
+    Iterate all NPC_ records of a plugin in handle chunks, reading each FormID
+    '''
+    count = 0
+    for record in xedit[MASTER].iter_records('NPC_'):
+        record.form_id
+        count += 1
+    return count
+
+
+@workload('npc_attributes')
+def npc_attributes(xedit):
+    '''
+    Read ten attributes from each of 200 NPC_ records
+    '''
+    count = 0
+    for npc in records(xedit, 'NPC_', 200):
+        npc.editor_id
+        npc.full_name
+        npc.short_name
+        npc.race
+        npc.class_
+        npc.height
+        npc.weight
+        npc.voice_type
+        npc.default_outfit
+        npc.combat_style
+        count += 1
+    return count
+
+
+@workload('iterate_kwda')
+def iterate_kwda(xedit):
+    '''
+    Iterate the KWDA keywords of 200 ARMO records, reading each FormID
+    '''
+    count = 0
+    for armor in records(xedit, 'ARMO', 200):
+        for keyword in armor.keywords:
+            keyword.form_id
+            count += 1
+    return count
+
+
+@workload('copy_into')
+def copy_into(xedit):
+    '''
+    Copy 1000 NPC_ records into a new plugin as overrides
+    '''
+    plugin = xedit.add_file('BenchPatch.esp')
+    count = 0
+    for npc in records(xedit, 'NPC_', 1000):
+        npc.copy_into(plugin)
+        count += 1
+    return count
+
+
+@workload('copy_records')
+def copy_records(xedit):
+    '''
+    Copy 1000 NPC_ records into a new plugin as overrides, in one batch
+    '''
+    plugin = xedit.add_file('BenchPatch.esp')
+    result = plugin.copy_records(records(xedit, 'NPC_', 1000))
+    return len(result)
+
+
+@workload('create_records')
+def create_records(xedit):
+    '''
+    Create 1000 NPC_ records from a template in a new plugin, each with its
+    own editor ID
+    '''
+    plugin = xedit.add_file('BenchPatch.esp')
+    template = next(records(xedit, 'NPC_', 1))
+    created = plugin.create_records(
+        template, values=[{'EDID': f'BenchClone{i:04}'} for i in range(1000)])
+    return len(created)
+
+
+@workload('cell_descendants')
+def cell_descendants(xedit):
+    '''
+    Walk the descendants of 20 CELL records
+    '''
+    count = 0
+    for cell in records(xedit, 'CELL', 20):
+        for descendant in cell.descendants():
+            count += 1
+    return count
+
+
+@workload('flags_to_dict')
+def flags_to_dict(xedit):
+    '''
+    Convert the ACBS flags of 200 NPC_ records to dicts
+    '''
+    count = 0
+    for npc in records(xedit, 'NPC_', 200):
+        npc['ACBS\\Flags'].to_dict()
+        count += 1
+    return count
+
+
+@workload('cell_descendants_fast')
+def cell_descendants_fast(xedit):
+    '''
+    Walk the descendants of 20 CELL records as lightweight views
+    '''
+    count = 0
+    with xedit.manage_handles():
+        for cell in records(xedit, 'CELL', 20):
+            for descendant in cell.descendants(fast=True):
+                count += 1
+    return count
+
+
+@workload('read_flags')
+def read_flags(xedit):
+    '''
+    Read the ACBS flags of 200 NPC_ records at once with read_flags
+    '''
+    npcs = list(records(xedit, 'NPC_', 200))
+    return len(xedit.read_flags(npcs, 'ACBS\\Flags'))
+
+
+def build_schema(xedit):
+    xedit.schema = XEditSchema.build(xedit, sample=1)
+
+
+@workload('npc_attributes_schema', setup=build_schema)
+def npc_attributes_schema(xedit):
+    '''
+    Read ten attributes from each of 200 NPC_ records, with a schema loaded
+    '''
+    return npc_attributes(xedit)
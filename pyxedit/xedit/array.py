@@ -1,5 +1,6 @@
 from pyxedit.xedit.generic import XEditGenericObject
 from pyxedit.xedit.misc import XEditError
+from pyxedit.xedit.ref import XEditRef
 
 
 class XEditArray(XEditGenericObject):
@@ -74,7 +75,9 @@ class XEditArray(XEditGenericObject):
                              f'index {index} is out of range')
 
         # return the object at the index
-        return self.objectify(self.xelib_run('get_element', path=f'[{index}]'))
+        path = f'[{index}]'
+        return self.objectify(self.xelib_run('get_element', path=path),
+                              self.child_definition(path))
 
     @property
     def objects(self):
@@ -83,6 +86,18 @@ class XEditArray(XEditGenericObject):
         __iter__ that strictly works with array item objects (instead of
         possibly their values)
         '''
+        return self.iter_objects()
+
+    def iter_objects(self, fast=False):
+        '''
+        Yields the array item objects. With `fast` set to True, lightweight,
+        read-only `XEditView` objects are yielded instead, all retrieved with a
+        single call rather than one lookup per index; see `XEditView`.
+        '''
+        if fast:
+            yield from self.iter_child_elements(fast=True)
+            return
+
         for index in range(len(self)):
             yield self.get_object_at_index(index)
 
@@ -124,22 +139,24 @@ class XEditArray(XEditGenericObject):
         '''
         Adds an item to the array with the given value at the given subpath.
 
-        An xedit object can be given as the value, in which case its form_id_str
-        will be set as the value at the given subpath under the array.
+        An xedit object or reference can be given as the value, in which case
+        its form_id_str will be set as the value at the given subpath under
+        the array.
         '''
-        if isinstance(value, XEditGenericObject):
+        if isinstance(value, (XEditGenericObject, XEditRef)):
             value = value.form_id_str
         return self.objectify(
-            self.xelib_run('add_array_item', '', subpath, value))
+            self.xelib_run('add_array_item', '', subpath, value),
+            self.child_definition('[0]'))
 
     def has_item_with(self, value, subpath=''):
         '''
         Checks whether an item exists with the given value at the given subpath.
 
-        An xedit object can be given as the value, in which case its form_id_str
-        will be used as value for the check.
+        An xedit object or reference can be given as the value, in which case
+        its form_id_str will be used as value for the check.
         '''
-        if isinstance(value, XEditGenericObject):
+        if isinstance(value, (XEditGenericObject, XEditRef)):
             value = value.form_id_str
         return self.xelib_run('has_array_item', '', subpath, value, ex=False)
 
@@ -147,24 +164,24 @@ class XEditArray(XEditGenericObject):
         '''
         Returns the array item with the given value at the given subpath.
 
-        An xedit object can be given as the value, in which case its form_id_str
-        will be used as value for the retrieval.
+        An xedit object or reference can be given as the value, in which case
+        its form_id_str will be used as value for the retrieval.
         '''
-        if isinstance(value, XEditGenericObject):
+        if isinstance(value, (XEditGenericObject, XEditRef)):
             value = value.form_id_str
         item_handle = self.xelib_run(
             'get_array_item', '', subpath, value, ex=False)
         if item_handle:
-            return self.objectify(item_handle)
+            return self.objectify(item_handle, self.child_definition('[0]'))
 
     def remove_item_with(self, value, subpath=''):
         '''
         Removes the array item with the given value at the given subpath.
 
-        An xedit object can be given as the value, in which case its form_id_str
-        will be used as value for the removal.
+        An xedit object or reference can be given as the value, in which case
+        its form_id_str will be used as value for the removal.
         '''
-        if isinstance(value, XEditGenericObject):
+        if isinstance(value, (XEditGenericObject, XEditRef)):
             value = value.form_id_str
         return self.xelib_run('remove_array_item', '', subpath, value)
 
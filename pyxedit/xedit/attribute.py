@@ -1,5 +1,6 @@
 from pyxedit.xedit.base import XEditBase
 from pyxedit.xedit.misc import XEditError
+from pyxedit.xedit.ref import XEditRef
 
 
 class XEditAttribute:
@@ -7,16 +8,23 @@ class XEditAttribute:
     A descriptor class that can be used to quickly declare any sub-field of
     a record as an xedit object property. This encapsulates the logic for
     getting and setting a value at a subpath from the object.
+
+    When the value kind of the field is known, either given as ``kind`` or
+    looked up from the loaded schema (see ``XEditSchema``), values are read
+    with the matching typed xelib getter directly, instead of creating an
+    object for the field and probing its types first.
     '''
     def __init__(self,
                  path,
                  required=False,
                  enum=None,
-                 object_class=None):
+                 object_class=None,
+                 kind=None):
         self.path = path
         self.enum = enum
         self.object_class = object_class
         self.required = required
+        self.kind = kind
 
     def __get__(self, obj, type=None):
         '''
@@ -29,6 +37,17 @@ class XEditAttribute:
           * if an enum has been provided for us, we will use the enum to
               translate between enum values and raw values for the caller
         '''
+        if obj is None:
+            return self
+
+        # read values of known kinds straight away; enums and object classes
+        # need the sub-object, so they always take the long way
+        if not self.enum and not self.object_class:
+            kind = self.kind or obj.schema_kind(self.path)
+            reader = self.READERS.get(kind)
+            if reader:
+                return reader(self, obj)
+
         # get the sub-object at the given path, if a sub_obj can't be
         # gotten, just return None
         sub_obj = obj.get(self.path)
@@ -39,14 +58,17 @@ class XEditAttribute:
         # its value (and transform it via enum if provided); otherwise,
         # we will be returning the sub-object as-is
         if sub_obj.type in (sub_obj.Types.Ref, sub_obj.Types.Value):
-            value = sub_obj.value
             if self.enum:
-                value = self.enum(value)
+                value = self.enum(self.option_name(sub_obj))
+            else:
+                value = sub_obj.value
         else:
             value = sub_obj
 
         # if the value ended up being an object derived from XEditBase,
         # we will need to apply any explicitly-given object class
+        if isinstance(value, XEditRef) and self.object_class:
+            value = value.record
         if isinstance(value, XEditBase):
             if self.object_class:
                 value.auto_release = False
@@ -96,7 +118,10 @@ class XEditAttribute:
         # if we just created it
         try:
             if sub_obj.type in (sub_obj.Types.Ref, sub_obj.Types.Value):
-                sub_obj.value = value
+                if self.enum:
+                    self.set_option(obj, sub_obj, value)
+                else:
+                    sub_obj.value = value
             else:
                 raise XEditError(f'Cannot set value of non-value object '
                                     f'{sub_obj} to {value}')
@@ -104,3 +129,70 @@ class XEditAttribute:
             if not originally_exists:
                 sub_obj.delete()
             raise
+
+    def enum_options(self, obj, sub_obj):
+        '''
+        Returns the names of the options of the enum element at our path.
+        These are the same for every record of a signature, so they are
+        cached for the session per signature.
+        '''
+        if not obj.signature:
+            return tuple(sub_obj.xelib_run('get_enum_options'))
+        return obj.session_cached(
+            ('enum_options', obj.signature, self.path),
+            lambda: tuple(sub_obj.xelib_run('get_enum_options')))
+
+    def option_name(self, sub_obj):
+        '''
+        Returns the name of the option set on an enum element. Enum values
+        are often sparse or do not start at 0, so the name is read as the
+        element's edit value rather than looked up by position among the
+        options.
+        '''
+        return sub_obj.xelib_run('get_value')
+
+    def set_option(self, obj, sub_obj, name):
+        '''
+        Sets an enum element to the option with the given name, by its edit
+        value, after checking that it is one of the element's options
+        '''
+        options = self.enum_options(obj, sub_obj)
+        if name not in options:
+            raise XEditError(f'{name} is not one of the options of '
+                             f'{sub_obj}: {options}')
+        sub_obj.xelib_run('set_value', name)
+
+    # typed readers, by value kind; these return the same values as reading
+    # `.value` off the sub-object would
+    def read_string(self, obj):
+        value = obj.xelib.get_value(obj.handle, self.path, ex=False)
+        if value or obj.xelib.has_element(obj.handle, self.path, ex=False):
+            return value
+        return None
+
+    def read_integer(self, obj):
+        return obj.xelib.get_int_value(obj.handle, self.path, ex=False)
+
+    def read_unsigned(self, obj):
+        return obj.xelib.get_uint_value(obj.handle, self.path, ex=False)
+
+    def read_bytes(self, obj):
+        value = obj.xelib.get_value(obj.handle, self.path, ex=False)
+        if value or obj.xelib.has_element(obj.handle, self.path, ex=False):
+            return bytes.fromhex(value)
+        return None
+
+    def read_float(self, obj):
+        return obj.xelib.get_float_value(obj.handle, self.path, ex=False)
+
+    def read_reference(self, obj):
+        return XEditRef.read(obj, self.path)
+
+    READERS = {
+        'string': read_string,
+        'integer': read_integer,
+        'unsigned': read_unsigned,
+        'float': read_float,
+        'bytes': read_bytes,
+        'reference': read_reference,
+    }
@@ -1,9 +1,21 @@
 from cached_property import cached_property
 from contextlib import contextmanager
+from importlib import import_module
 from pathlib import Path
+import pkgutil
+import re
 
 from pyxedit.xelib import Xelib
 from pyxedit.xedit.misc import XEditError, XEditTypes
+from pyxedit.xedit.values import value_accessor
+
+# paths made of element names and array indices only; anything else, like
+# xEdit's `.` (add), `^` (sort key) or `@` (references) path syntax, or
+# `=`/`<>` value matching, does not identify a single definition
+UNPLAIN_PATH = re.compile(r"[\^@=<>\"]|(^|\\)\.($|\\)")
+
+# an array index segment of a path, e.g. `[2]`
+ARRAY_INDEX = re.compile(r"\[\d+\]")
 
 
 class XEditBase:
@@ -15,20 +27,69 @@ class XEditBase:
     ValueTypes = Xelib.ValueTypes
     GameModes = Xelib.GameModes
 
+    # the root XEdit object of the session; objects created "off" of other
+    # objects inherit it, so session-wide state kept on the XEdit object is
+    # reachable from anywhere
+    _root = None
+
+    # object classes by the signature of the records they are for; classes
+    # register themselves as they are defined (see __init_subclass__), and
+    # the object class modules are only imported once a record of their
+    # signature is first objectified (see object_class_for). Signatures with
+    # no object class map to None
+    _object_classes = {}
+    _object_class_modules = None
+
+    # the definition of the element, as a (record signature, path) tuple
+    # where array indices are left out of the path, if known; see `objectify`
+    _definition = None
+
+    # type properties that follow from the definition of an element, and are
+    # the same for every element with the same definition
+    DEFINITION_PROPERTIES = ("element_type", "def_type", "signature")
+
+    # type properties that follow from the value type of an element; they are
+    # the same for every element with the same definition, unless its def
+    # type is one of `ELEMENT_VALUE_DEF_TYPES`
+    VALUE_TYPE_PROPERTIES = ("value_type", "is_flags")
+
+    # integer def types, whose value type can differ per element, e.g. for
+    # union members like CTDA parameters, which xEdit resolves per record to
+    # a reference or a plain number
+    ELEMENT_VALUE_DEF_TYPES = (
+        DefTypes.Integer,
+        DefTypes.IntegerFormater,
+    )
+
+    # def types of elements resolving to one of several definitions per
+    # element, whose types are not shared by the elements of their definition
+    UNION_DEF_TYPES = (
+        DefTypes.Union,
+        DefTypes.SubRecordUnion,
+        DefTypes.IntegerFormaterUnion,
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        signature = vars(cls).get("SIGNATURE")
+        if signature:
+            XEditBase._object_classes[signature] = cls
+
     # initializer
-    def __init__(self, xelib, handle, handle_layer, auto_release=True):
+    def __init__(self, xelib, handle, handle_token, auto_release=True, root=None):
         """
         Initializer
         """
         # each XEditBase-derived object wraps an xedit-lib handle
         self.handle = handle
 
-        # we keep a reference to the handle layer (from the xelib object)
-        # containing the handle, in order to keep tabs on whether the handle
-        # is still valid. The Xelib object is responsible for depopulating
-        # the layer as handles are released; if the layer has been emptied,
-        # we should be able to detect that here
-        self._handle_layer = handle_layer
+        # we keep the (layer, generation) token the xelib object tracks the
+        # handle with, in order to keep tabs on whether the handle is still
+        # valid. The Xelib object maps every tracked handle to such a token,
+        # and drops handles from that table as they are released; handle ids
+        # are reissued after release, but never with the same token, so the
+        # handle is valid exactly as long as the table still maps it to it
+        self._handle_token = handle_token
 
         # we keep a reference to the overarching xelib object; this is the
         # gateway to the xelib API that lets us do just about everything.
@@ -46,15 +107,21 @@ class XEditBase:
         # start managing this handle
         self.auto_release = auto_release
 
+        # keep a reference to the root XEdit object this object was ultimately
+        # created from
+        self._root = root
+
     # finalizer
     def __del__(self):
         """
         Finalizer. It should release the handle and remove the handle from
-        any tracked handle groups (this is what Xelib.release_handle does).
-        Respects an auto-release switch that can be used to disable it.
+        the tracked handle group it belongs to. The handle stops being tracked
+        right away, but the release itself is queued up and done in a batch,
+        see `Xelib.defer_release`. Respects an auto-release switch that can be
+        used to disable it.
         """
         if self.auto_release:
-            self._xelib.release_handle(self.handle)
+            self._xelib.defer_release(self.handle, self._handle_token)
 
     # xelib-related methods
     @property
@@ -67,9 +134,12 @@ class XEditBase:
         effectively renders the class unusable.
 
         @return: self._xelib attribute, but only if handle is still valid
-                 (i.e. still exists in the handle group it's supposed to be in)
+                 (i.e. still tracked with the token it was tracked with)
         """
-        if self.handle and self.handle not in self._handle_layer:
+        if (
+            self.handle
+            and self._xelib._handle_table.get(self.handle) != self._handle_token
+        ):
             raise XEditError(
                 f"Accessing XEdit object of handle {self.handle} "
                 f"which has already been released from the "
@@ -90,6 +160,36 @@ class XEditBase:
         """
         return getattr(self.xelib, method)(self.handle, *args, **kwargs)
 
+    def session_cached(self, key, loader):
+        """
+        Returns a value cached on the root XEdit object for the rest of the
+        session, calling `loader` to produce it the first time the key is
+        asked for. Meant for values derived from xEdit's record definitions,
+        which do not change during a session.
+
+        @param key: a hashable key identifying the value
+        @param loader: a callable without arguments producing the value
+        @return: the cached value
+        """
+        cache = self._root._session_cache if self._root else {}
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = loader()
+            return value
+
+    def schema_kind(self, path):
+        """
+        Returns the value kind of the field at the given path under this
+        record, according to the schema loaded on the root XEdit object, or
+        None if there is no schema, this is not a record, or the field is not
+        known. See `XEditSchema`.
+        """
+        schema = self._root.schema if self._root else None
+        if schema is None or self.element_type != self.ElementTypes.MainRecord:
+            return None
+        return schema.kind(self.signature, path)
+
     # dunderbar methods, implement native object functionalities
     def __hash__(self):
         """
@@ -102,7 +202,12 @@ class XEditBase:
 
         Having xedit objects being both hashable and with __eq__ defined,
         should allow it to be used as keys of dictionaries and added to sets.
+
+        Records hash on their FormID instead, like the `XEditRef` references
+        to them, which they are equal to.
         """
+        if self.element_type == self.ElementTypes.MainRecord:
+            return hash(self.form_id)
         return hash(self.path)
 
     def __eq__(self, other):
@@ -110,8 +215,11 @@ class XEditBase:
         Implements equality behavior (`==` operator)
 
         Two xedit objects are equal if xelib.element_equals on the two handles
-        return true.
+        return true. Records are also equal to `XEditRef` references with
+        their FormID, which compare themselves (see `XEditRef.__eq__`).
         """
+        if not isinstance(other, XEditBase):
+            return NotImplemented
         return self.xelib_run("element_equals", other.handle)
 
     def __getitem__(self, path):
@@ -144,9 +252,8 @@ class XEditBase:
         harmlessly do nothing.
         """
         if self.handle:
-            parent_layer = self.xelib.promote_handle(self.handle)
-            if parent_layer:
-                self._handle_layer = parent_layer
+            if self.xelib.promote_handle(self.handle) is not None:
+                self._handle_token = self._xelib.handle_token(self.handle)
 
     # basic type properties, these should be safely accessible and return
     # a falsey value if inapplicable
@@ -184,32 +291,23 @@ class XEditBase:
         ):
             return self.xelib_run("value_type")
 
+    @cached_property
+    def value_accessor(self):
+        """
+        The `ValueAccessor` reading and writing the value of this element,
+        looked up from its def type, and its value type where that matters;
+        those are probed once per definition when it is known (see
+        `objectify`), so this costs no calls into xEdit then
+        """
+        return value_accessor(self.def_type, lambda: self.value_type)
+
     @cached_property
     def type(self):
         """
         Resolve an XEditType value for this element based on the various
         other types.
         """
-        if self.def_type in (
-            self.DefTypes.String,
-            self.DefTypes.LString,
-            self.DefTypes.LenString,
-            self.DefTypes.ByteArray,
-            self.DefTypes.Integer,
-            self.DefTypes.IntegerFormater,
-            self.DefTypes.IntegerFormaterUnion,
-            self.DefTypes.Flag,
-            self.DefTypes.Float,
-        ):
-            if (
-                self.def_type == self.DefTypes.Integer
-                and self.value_type == self.ValueTypes.Reference
-            ):
-                return self.Types.Ref
-            else:
-                return self.Types.Value
-        else:
-            return self.Types.Container
+        return self.value_accessor.type
 
     @cached_property
     def is_ref(self):
@@ -256,28 +354,35 @@ class XEditBase:
         """
         return self.value_type == self.ValueTypes.Flags
 
-    def objectify(self, handle):
+    def objectify(self, handle, definition=None):
         """
         Given a handle, create an appropriate object to wrap around the handle.
 
-        During initialization, we run a staticmethod stored on the class to
-        explicitly import all possible object classes. We then choose the
-        object class to use depending on the def type, the value type, and
-        the signature of the handle. Any xedit object will be able to call
-        this method to create objects of any appropriate xedit subclass to
-        match for a given handle.
+        We choose the object class to use depending on the def type, the value
+        type, and the signature of the handle; object classes for signatures
+        are imported as they are first needed, see `object_class_for`. Any
+        xedit object will be able to call this method to create objects of
+        any appropriate xedit subclass to match for a given handle.
+
+        When the definition of the element is known, as a (record signature,
+        path) tuple like `("NPC_", "ACBS\\Flags")`, its types are probed once
+        per definition for the session (see `session_cached`), and handed to
+        every object of the definition, instead of being probed per object.
+        `get` passes the definitions of the elements it gets under records.
+        Unions, and fields the loaded schema has seen with more than one value
+        kind, are still probed per object, and so are the elements under them
+        (see `child_definition`); so are the value types of integer elements,
+        which tell references from numbers, and can differ per element.
 
         @param handle: a xelib handle
+        @param definition: the definition of the element, if known
         @return: an object of some class derived from this base class, that
                  wraps around the handle
         """
         # import the following at runtime; they are only needed at method
         # runtime, and putting these imports at the top of this module would
         # result in circular imports
-        from pyxedit.xedit.array import XEditArray
-        from pyxedit.xedit.flags import XEditFlags
         from pyxedit.xedit.generic import XEditGenericObject
-        from pyxedit.xedit.plugin import XEditPlugin
 
         # first create a generic object out of it so we can easily inspect it;
         # this object may not be the final produced object, so make sure it does
@@ -286,6 +391,63 @@ class XEditBase:
         generic_obj = XEditGenericObject.from_xedit_object(
             handle, self, auto_release=False
         )
+        types = None
+        if definition and not self.definition_varies(definition):
+            types = self.session_cached(
+                ("definition",) + definition,
+                lambda: self.definition_types(generic_obj),
+            )
+            if types:
+                generic_obj.__dict__.update(types)
+
+        obj = self._objectify(handle, generic_obj)
+        if obj is not generic_obj:
+            # hand the types probed so far over to the final object
+            probed = self.DEFINITION_PROPERTIES + self.VALUE_TYPE_PROPERTIES
+            obj.__dict__.update(
+                (name, generic_obj.__dict__[name])
+                for name in probed
+                if name in generic_obj.__dict__
+            )
+        if types:
+            obj._definition = definition
+        elif generic_obj.element_type == self.ElementTypes.MainRecord:
+            obj._definition = (generic_obj.signature, "")
+        return obj
+
+    def definition_types(self, obj):
+        """
+        Returns the types of an object that are shared by every element of its
+        definition, as a dict of property name to value, or None if they are
+        not, because the element is a union that resolves per element. The
+        value type is left out for integer def types, and probed per object.
+        """
+        types = {name: getattr(obj, name) for name in self.DEFINITION_PROPERTIES}
+        if types["def_type"] in self.UNION_DEF_TYPES:
+            return None
+        if types["def_type"] not in self.ELEMENT_VALUE_DEF_TYPES:
+            types.update(
+                (name, getattr(obj, name)) for name in self.VALUE_TYPE_PROPERTIES
+            )
+        return types
+
+    def definition_varies(self, definition):
+        """
+        Returns whether elements of a definition have been seen with more than
+        one value kind, according to the schema loaded on the root XEdit
+        object; their types are probed per element then. See `XEditSchema`.
+        """
+        schema = self._root.schema if self._root else None
+        return bool(schema) and schema.varies(*definition)
+
+    def _objectify(self, handle, generic_obj):
+        """
+        Returns the object of the right class for a handle, given the generic
+        object made out of it; see `objectify`
+        """
+        from pyxedit.xedit.array import XEditArray
+        from pyxedit.xedit.flags import XEditFlags
+        from pyxedit.xedit.plugin import XEditPlugin
 
         # if object is flags, use the XEditFlags class
         if generic_obj.is_flags:
@@ -319,10 +481,17 @@ class XEditBase:
         # otherwise, see if we can find a subclass of XEditBase
         # corresponding to the signature; if so, use the subclass to make
         # the object, otherwise just use the generic object
+        # with a schema loaded, records get the typed accessor class for their
+        # signature instead, see `XEditSchema.accessor_class`
         if generic_obj.signature:
-            for subclass in XEditBase.get_imported_subclasses():
-                if subclass.SIGNATURE == generic_obj.signature:
-                    return subclass.from_xedit_object(handle, self)
+            object_class = self.object_class_for(generic_obj.signature)
+            schema = self._root.schema if self._root else None
+            if schema and generic_obj.element_type == self.ElementTypes.MainRecord:
+                object_class = schema.accessor_class(
+                    generic_obj.signature, object_class
+                )
+            if object_class:
+                return object_class.from_xedit_object(handle, self)
 
         generic_obj.auto_release = True
         return generic_obj
@@ -353,7 +522,8 @@ class XEditBase:
             handle = self.xelib_run("get_element", path=path, ex=ex)
 
         if handle:
-            return self.objectify(handle)
+            definition = None if absolute else self.child_definition(path)
+            return self.objectify(handle, definition)
         elif ex:
             if absolute:
                 raise XEditError(
@@ -368,6 +538,19 @@ class XEditBase:
         else:
             return default
 
+    def child_definition(self, path):
+        """
+        Returns the definition of the element at a path under this element,
+        as a (record signature, path) tuple without array indices (see
+        `objectify`), or None if this element's definition is not known or
+        the path uses anything other than element names and indices.
+        """
+        if self._definition is None or UNPLAIN_PATH.search(path):
+            return None
+        signature, parent_path = self._definition
+        path = ARRAY_INDEX.sub("[]", path)
+        return (signature, f"{parent_path}\\{path}" if parent_path else path)
+
     def add(self, path):
         """
         Adds an element at the given path and return it as an xedit object
@@ -479,7 +662,35 @@ class XEditBase:
         Returns any known human-readable name for the element's signature
         """
         signature = self.signature
-        return self.xelib.name_from_signature(signature, ex=False) if signature else ""
+        return self.signature_names.get(signature, "") if signature else ""
+
+    @property
+    def signature_names(self):
+        """
+        Returns the lookup table of human-readable names by signature, which
+        is loaded once per session
+        """
+        return self.session_cached(
+            "signature_names", lambda: self.xelib.get_signature_name_map(ex=False)
+        )
+
+    def name_from_signature(self, signature):
+        """
+        Translates a signature (e.g. `ARMO`) to its human-readable name (e.g.
+        `Armor`), or an empty string if it is not a known signature
+        """
+        return self.signature_names.get(signature, "")
+
+    def signature_from_name(self, name):
+        """
+        Translates a human-readable name (e.g. `Armor`) to its signature (e.g.
+        `ARMO`), or an empty string if it is not a known name
+        """
+        signatures = self.session_cached(
+            "signatures_by_name",
+            lambda: {name: sig for sig, name in self.signature_names.items()},
+        )
+        return signatures.get(name, "")
 
     @property
     def has_child_group(self):
@@ -507,6 +718,23 @@ class XEditBase:
         """
         Produces each child element underneath this element
         """
+        return self.iter_child_elements()
+
+    def iter_child_elements(self, fast=False):
+        """
+        Produces each child element underneath this element.
+
+        @param fast: if set to True, lightweight, read-only `XEditView`
+                     objects are produced instead of full xedit objects; see
+                     `XEditView`
+        """
+        if fast:
+            from pyxedit.xedit.view import XEditView
+
+            for handle in self.xelib_run("get_elements", ex=False):
+                yield XEditView(self, handle)
+            return
+
         for handle in self.xelib_run("get_elements", ex=False):
             obj = self.objectify(handle)
             yield obj
@@ -537,17 +765,28 @@ class XEditBase:
         if child_group:
             yield child_group
 
-    def descendants(self, iter_groups=False):
+    def descendants(self, iter_groups=False, fast=False):
         """
         Produces objects underneath this element
+
+        @param iter_groups: whether to descend into child groups
+        @param fast: if set to True, lightweight, read-only `XEditView`
+                     objects are produced instead of full xedit objects; see
+                     `XEditView`
         """
         if self.num_child_elements:
-            for child in self.child_elements:
+            for child in self.iter_child_elements(fast=fast):
                 yield child
                 yield from child.descendants(iter_groups=iter_groups)
 
         if iter_groups and self.has_child_group:
-            child = self.child_group
+            if fast:
+                from pyxedit.xedit.view import XEditView
+
+                child = XEditView(self, self.xelib_run("get_element",
+                                                       "Child Group"))
+            else:
+                child = self.child_group
             yield child
             yield from child.descendants(iter_groups=iter_groups)
 
@@ -608,15 +847,17 @@ class XEditBase:
         When new objects are created "off" of the existing object, the new
         object inherit the xelib attribute pointing to the current overarching
         xelib context. When each new object is created, it also saves the
-        xelib context's current handle group onto itself, in order to track its
-        own handle's validity against.
+        token the xelib context tracks its handle with onto itself, in order
+        to track its own handle's validity against.
 
         @param handle: the handle to create the new obj with
         @param xedit_obj: the xedit object to create the new object "off" of;
                           a handle to the xelib context can be "inherited" from
                           it.
         """
-        if not handle or handle not in xedit_obj._xelib._current_handles:
+        xelib = xedit_obj._xelib
+        token = xelib.handle_token(handle)
+        if not handle or not token or token[0] != xelib._layer_stack[-1]:
             raise XEditError(
                 f"Attempting to create XEdit object from invalid "
                 f"handle {handle} with respect to source object "
@@ -626,17 +867,45 @@ class XEditBase:
         return cls(
             xedit_obj.xelib,
             handle,
-            xedit_obj._xelib._current_handles,
+            token,
             auto_release=auto_release,
+            root=xedit_obj._root,
         )
 
+    @staticmethod
+    def object_class_for(signature):
+        """
+        Returns the object class for records of the given signature, or None
+        if there is none. Object classes live in modules named after their
+        signature under `pyxedit.xedit.object_classes`; the module is imported
+        the first time its signature is looked up.
+
+        @param signature: a record signature, e.g. `NPC_`
+        @return: the XEditBase-derived class for the signature, or None
+        """
+        try:
+            return XEditBase._object_classes[signature]
+        except KeyError:
+            pass
+
+        if XEditBase._object_class_modules is None:
+            path = Path(__file__).parent / "object_classes"
+            XEditBase._object_class_modules = {
+                module.name for module in pkgutil.iter_modules([str(path)])
+            }
+
+        if signature in XEditBase._object_class_modules:
+            # importing the module registers its class
+            import_module(f"pyxedit.xedit.object_classes.{signature}")
+        return XEditBase._object_classes.setdefault(signature, None)
+
     @staticmethod
     def import_all_object_classes():
         """
         A staticmethod that simply imports all object classes into the python
-        namespace. When xelib handles are objectified into xedit objects,
-        one of the below object classes might be used, and thus must be
-        imported onto the namespace prior.
+        namespace. This is not needed for objectifying handles, which imports
+        object classes as they are needed, but makes all of them show up in
+        `get_imported_subclasses`.
         """
         from pyxedit.xedit.object_classes.ACHR import XEditActor  # NOQA
         from pyxedit.xedit.object_classes.ARMA import XEditArmature  # NOQA
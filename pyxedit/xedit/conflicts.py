@@ -0,0 +1,229 @@
+import json
+
+from pyxedit.xelib import Xelib
+
+
+class XEditConflictReport:
+    """
+    Finds conflicting elements in records by walking xEdit's node trees (the
+    same trees backing the conflict colouring in xEdit's record view), and
+    produces one report entry per conflicting leaf element.
+
+    Node trees are walked iteratively, a level at a time, across every
+    version of the record at once, so that elements missing from the walked
+    version but present in other overrides are reported as well: the child
+    elements of a node are fetched with one `get_node_elements` call per
+    version having the node, and their conflict data with a single
+    `get_conflict_data_many` call. Any subtree
+    whose overall conflict status is less severe than `min_conflict` is
+    pruned without being descended into. Node trees are always freed with
+    `release_nodes`, even if the walk is interrupted.
+
+    Each report entry is a dict with the following keys:
+        record: the record's signature and FormID, e.g. `NPC_:00013BA3`
+        editor_id: the record's editor ID, if it has one
+        plugin: the name of the plugin whose version of the record was walked
+        path: the local path of the conflicting element within the record
+        conflict_all: the `ConflictAll` name for the element
+        conflict_this: the `ConflictThis` name for the element, or
+            `NotDefined` if the walked version does not have the element
+        winning_value: the element's value in the winning override
+    """
+
+    ConflictAll = Xelib.ConflictAll
+
+    def __init__(self, xelib, min_conflict=ConflictAll.Conflict):
+        """
+        @param xelib: the `Xelib` instance to run against
+        @param min_conflict: the least severe `ConflictAll` value that is
+                             reported; anything below it is pruned
+        """
+        self.xelib = xelib
+        self.min_conflict = min_conflict
+
+    def is_pruned(self, conflict_all):
+        return conflict_all.value < self.min_conflict.value
+
+    def iter_plugins(self, plugin_names, signatures=None):
+        """
+        Produces report entries for the records of the named plugins.
+
+        A record is only walked once, for the first listed plugin it is found
+        in, and records no other plugin overrides are skipped without
+        building a node tree for them.
+
+        @param plugin_names: the names of the plugins whose records to walk
+        @param signatures: an optional list of record signatures to limit the
+                           walk to
+        """
+        xelib = self.xelib
+        search = ",".join(signatures) if signatures else ""
+        seen = set()
+        for name in plugin_names:
+            with xelib.manage_handles():
+                plugin = xelib.file_by_name(name)
+                records = xelib.get_records(plugin, search, include_overrides=True)
+                for record in records:
+                    with xelib.manage_handles():
+                        form_id = xelib.get_form_id(record)
+                        if form_id in seen:
+                            continue
+                        seen.add(form_id)
+
+                        master = xelib.get_master_record(record, ex=False) or record
+                        if not xelib.get_overrides(master, ex=False):
+                            continue
+
+                        yield from self.iter_record(record, plugin_name=name)
+
+    def iter_record(self, record, plugin_name=None):
+        """
+        Produces report entries for a single record.
+
+        @param record: the handle of the record version to walk
+        @param plugin_name: the name of the plugin the record version belongs
+                            to; looked up if not given
+        """
+        xelib = self.xelib
+        with xelib.manage_handles():
+            nodes = xelib.get_nodes(record)
+            # node trees are freed with `release_nodes`, not `release`
+            xelib.untrack_handle(nodes)
+            try:
+                yield from self._walk(nodes, record, plugin_name)
+            finally:
+                xelib.release_nodes(nodes, ex=False)
+
+    def _walk(self, nodes, record, plugin_name):
+        xelib = self.xelib
+        ((conflict_all, _),) = xelib.get_conflict_data_many(nodes, [record])
+        if self.is_pruned(conflict_all):
+            return
+
+        # things shared by every entry of this record, fetched only once we
+        # know there's something to report
+        context = None
+        winner = None
+
+        # elements are walked across every version of the record at once, as
+        # lists of handles lined up with `versions`, so that elements only
+        # some overrides have are reported too; the walked version comes
+        # first, and has None for elements it does not have
+        versions = self._versions(record)
+
+        # each stack item is the local path of a node whose conflict status
+        # made it through pruning, its handles, and that conflict status
+        stack = [("", versions, None)]
+        while stack:
+            path, elements, conflict = stack.pop()
+            children = self._union_children(nodes, elements)
+
+            if not children:
+                if conflict is None:
+                    continue
+                if context is None:
+                    context = self._record_context(record, plugin_name)
+                    winner = xelib.get_winning_override(record, ex=False)
+                conflict_this = conflict[1]
+                if elements[0] is None:
+                    conflict_this = Xelib.ConflictThis.NotDefined
+                yield dict(
+                    context,
+                    path=path,
+                    conflict_all=conflict[0].name,
+                    conflict_this=conflict_this.name,
+                    winning_value=(
+                        xelib.get_value(winner, path, ex=False)
+                        if winner and path
+                        else None
+                    ),
+                )
+                continue
+
+            pruned = []
+            descend = []
+            conflicts = xelib.get_conflict_data_many(
+                nodes, [self._first(handles) for _, handles in children]
+            )
+            for (child_path, handles), child_conflict in zip(children, conflicts):
+                if self.is_pruned(child_conflict[0]):
+                    pruned.extend(handle for handle in handles if handle)
+                else:
+                    descend.append((child_path, handles, child_conflict))
+
+            # pruned subtrees are done with; don't hold on to their handles
+            # until the whole record has been walked
+            xelib.release_handles(pruned)
+
+            # push in reverse so that elements are reported in record order
+            stack.extend(reversed(descend))
+
+    def _versions(self, record):
+        """
+        Returns handles of every version of a record, the given version
+        first, then the others in load order.
+        """
+        xelib = self.xelib
+        master = xelib.get_master_record(record, ex=False) or record
+        others = [master] + xelib.get_overrides(master, ex=False)
+        return [record] + [
+            version
+            for version in others
+            if not xelib.element_equals(version, record, ex=False)
+        ]
+
+    def _union_children(self, nodes, elements):
+        """
+        Returns the children of an element across versions, as a list of
+        `(local path, handles)` pairs, where the handles line up with the
+        given handles of the element; children of the first version come
+        first, in its order, followed by those only other versions have.
+        """
+        xelib = self.xelib
+        merged = {}
+        for index, element in enumerate(elements):
+            if not element:
+                continue
+            for child in xelib.get_node_elements(nodes, element, ex=False):
+                if not child:
+                    continue
+                path = xelib.local_path(child, ex=False)
+                handles = merged.get(path)
+                if handles is None:
+                    handles = merged[path] = [None] * len(elements)
+                handles[index] = child
+        return list(merged.items())
+
+    @staticmethod
+    def _first(handles):
+        return next(handle for handle in handles if handle)
+
+    def _record_context(self, record, plugin_name):
+        xelib = self.xelib
+        if plugin_name is None:
+            with xelib.manage_handles():
+                plugin_name = xelib.name(xelib.get_element_file(record))
+        signature = xelib.signature(record, ex=False)
+        form_id = xelib.get_hex_form_id(record, ex=False)
+        return {
+            "record": f"{signature}:{form_id}",
+            "editor_id": xelib.editor_id(record, ex=False) or None,
+            "plugin": plugin_name,
+        }
+
+    @staticmethod
+    def write(entries, fp):
+        """
+        Streams report entries to an open text file as JSON lines, one entry
+        per line, without holding the entire report in memory.
+
+        @param entries: an iterable of report entries
+        @param fp: a file object opened for writing text
+        @return: the number of entries written
+        """
+        count = 0
+        for entry in entries:
+            fp.write(json.dumps(entry))
+            fp.write("\n")
+            count += 1
+        return count
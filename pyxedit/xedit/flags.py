@@ -1,9 +1,55 @@
+import enum
+from functools import lru_cache
+
+from cached_property import cached_property
+
 from pyxedit.xedit.generic import XEditGenericObject
+from pyxedit.xedit.misc import XEditError
+
+# GetUIntValue/SetUIntValue work with 32-bit values; flags defs with more
+# flags than that are read and written by flag name instead
+UINT_FLAG_COUNT = 32
+
+
+@lru_cache(maxsize=None)
+def flags_enum(flag_names):
+    '''
+    Returns an `enum.IntFlag` class with a member for each flag of a flags
+    def, given the def's flag names in bit order. Unnamed and repeated flag
+    names get no member of their own, but their bits are kept in values.
+    An enum class without members cannot hold values, so ``int`` is returned
+    for defs without named flags.
+    '''
+    members, seen = [], set()
+    for bit, flag_name in enumerate(flag_names):
+        if flag_name and flag_name not in seen:
+            seen.add(flag_name)
+            members.append((flag_name, 1 << bit))
+    if not members:
+        return int
+    return enum.IntFlag('XEditFlagValues', members)
+
+
+def read_bitmask(xelib, handle, flag_names, path=''):
+    '''
+    Reads the flags at the element as an integer bitmask, with a single api
+    call; returns None if there is no element to read.
+    '''
+    if len(flag_names) <= UINT_FLAG_COUNT:
+        return xelib.get_uint_value(handle, path=path, ex=False)
+    enabled = set(xelib.get_enabled_flags(handle, path=path, ex=False))
+    return sum(1 << bit for bit, flag_name in enumerate(flag_names)
+               if flag_name in enabled)
 
 
 class XEditFlags(XEditGenericObject):
     '''
     Used for flag types
+
+    The flags are read as a whole, as an integer bitmask, with a single api
+    call, and decoded against the flag names of the element, which are only
+    retrieved once per object. `bitmask` gives the flags as an `enum.IntFlag`
+    value, which can be used as a plain integer as well.
     '''
     # dictionary-like functionality
     def __getitem__(self, key):
@@ -29,20 +75,31 @@ class XEditFlags(XEditGenericObject):
             yield flag_name
 
     def values(self):
-        for key in self.keys():
-            yield self[key]
+        for _, value in self.items():
+            yield value
 
     def items(self):
-        for key in self.keys():
-            yield key, self[key]
+        bitmask = self.bitmask
+        for bit, flag_name in enumerate(self.all_flags):
+            yield flag_name, bool(bitmask & (1 << bit))
 
     # translating to and from a raw dictionary
     def to_dict(self):
         return {key: value for key, value in self.items()}
 
     def from_dict(self, dict_):
-        for key, value in dict_:
-            self[key] = value
+        bitmask = int(self.bitmask)
+        for key, value in dict_.items():
+            bit = self.bit_of(key)
+            bitmask = bitmask | bit if value else bitmask & ~bit
+        self.bitmask = bitmask
+
+    def bit_of(self, flag_name):
+        try:
+            return 1 << self.all_flags.index(flag_name)
+        except ValueError:
+            raise XEditError(f'{self} has no flag {flag_name}; available '
+                             f'flags are {self.all_flags}')
 
     # wrappers for xelib methods
     def get_flag(self, flag_name):
@@ -51,13 +108,40 @@ class XEditFlags(XEditGenericObject):
     def set_flag(self, flag_name, state):
         return self.xelib_run('set_flag', flag_name, state)
 
-    @property
+    @cached_property
     def all_flags(self):
+        # the flag names of an element never change, so they are only
+        # retrieved once
         return self.xelib_run('get_all_flags')
 
+    @property
+    def Flags(self):
+        '''
+        The `enum.IntFlag` class for the flags of this element
+        '''
+        return flags_enum(tuple(self.all_flags))
+
+    @property
+    def bitmask(self):
+        '''
+        The flags as a whole, as a value of the `Flags` enum class
+        '''
+        return self.Flags(read_bitmask(self.xelib, self.handle,
+                                       self.all_flags))
+
+    @bitmask.setter
+    def bitmask(self, value):
+        value = int(value)
+        if len(self.all_flags) <= UINT_FLAG_COUNT:
+            self.xelib_run('set_uint_value', value)
+        else:
+            self.enabled = [flag_name
+                            for bit, flag_name in enumerate(self.all_flags)
+                            if value & (1 << bit)]
+
     @property
     def enabled(self):
-        return self.xelib_run('get_enabled_flags')
+        return [flag_name for flag_name, state in self.items() if state]
 
     @enabled.setter
     def enabled(self, value):
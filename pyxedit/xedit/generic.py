@@ -1,6 +1,5 @@
 from pyxedit.xedit.attribute import XEditAttribute
 from pyxedit.xedit.base import XEditBase
-from pyxedit.xedit.misc import XEditError
 
 
 class XEditGenericObject(XEditBase):
@@ -19,36 +18,20 @@ class XEditGenericObject(XEditBase):
 
         Xelib handles point to elements that may or may not be an element that
         stores a value. If stored, the value will have a type, and for integer
-        values it may be a reference to a record. All of this can be determined
-        based on some combination of element_type, def_type, smash_type, and
-        value_type.
-
-        The `.type` property already does the work of inspecting the record to
-        figure out whether it is a `Value` or `Ref` element. Here, we will
-        retrieve the value based on the `.type` property and the value's def
-        type.
+        values it may be a reference to a record. How the value is read and
+        written follows from the element's def type, and for integer def types
+        its value type; the matching `ValueAccessor` is looked up once per
+        definition (see `objectify` and `pyxedit.xedit.values`), so reads take
+        a single api call, or two for references, whose load order FormID is
+        read off the record they link to.
 
           - A <Types.Ref> element should return the linked object as the value.
-          - A <Types.Value> element should return the appropriately typed value
-                based on the DefType
+          - A <Types.Value> element should return the appropriately typed value:
+                a `str`, `int`, `float`, `bool` for single flags, or `bytes`
+                for byte arrays; integer flags are read unsigned
           - Otherwise, a None should be returned.
         """
-        if self.type == self.Types.Ref:
-            referenced = self.xelib.get_links_to(self.handle, ex=False)
-            return self.objectify(referenced) if referenced else None
-        elif self.type == self.Types.Value:
-            if self.def_type in (self.DefTypes.String, self.DefTypes.LString):
-                return self.xelib.get_value(self.handle)
-            elif self.def_type == self.DefTypes.Integer:
-                return self.xelib.get_int_value(self.handle)
-            elif self.def_type == self.DefTypes.Float:
-                return self.xelib.get_float_value(self.handle)
-            else:
-                raise NotImplementedError(
-                    f"Just encountered value type {self.def_type}, which is "
-                    f"not yet supported as a gettable value; we should check "
-                    f"it out and add it"
-                )
+        return self.value_accessor.get(self)
 
     @value.setter
     def value(self, value):
@@ -57,28 +40,10 @@ class XEditGenericObject(XEditBase):
           - A <Types.Ref> element should expect another object to be provided
                 and link to it.
           - A <Types.Value> element should be set the appropriately typed value
-                based on the DefType
+                based on the def type
           - Otherwise, attempting to set the value should result in an error.
         """
-        if self.type == self.Types.Ref:
-            return self.xelib.set_links_to(self.handle, value.handle)
-        elif self.type == self.Types.Value:
-            if self.def_type in (self.DefTypes.String, self.DefTypes.LString):
-                return self.xelib.set_value(self.handle, str(value))
-            elif self.def_type == self.DefTypes.Integer:
-                return self.xelib.set_int_value(self.handle, int(value))
-            elif self.def_type == self.DefTypes.Float:
-                return self.xelib.set_float_value(self.handle, float(value))
-            else:
-                raise NotImplementedError(
-                    f"Just encountered value type {self.def_type}, which is "
-                    f"not yet supported as a settable value; we should check "
-                    f"it out and add it"
-                )
-        else:
-            raise XEditError(
-                f"Cannot set the value of element {self} with " f"type {self.type}"
-            )
+        return self.value_accessor.set(self, value)
 
     data_size = XEditAttribute("Record Header\\Data Size")
     form_version = XEditAttribute("Record Header\\Form Version")
@@ -179,6 +144,15 @@ class XEditGenericObject(XEditBase):
         for handle in self.xelib_run("get_overrides"):
             yield self.objectify(handle)
 
+    @property
+    def referenced_by(self):
+        """
+        Produces the records referencing this record. References are built
+        on demand, only for the plugins that need them; see
+        `XEdit.get_referenced_by`.
+        """
+        yield from self._root.referenced_by(self)
+
     @property
     def winning_override(self):
         if self.is_winning_override(self):
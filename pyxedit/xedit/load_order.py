@@ -0,0 +1,113 @@
+from collections import namedtuple
+
+from pyxedit.xedit.plugin import XEditPlugin
+
+# what is known about each loaded file:
+#   - name: the file name
+#   - handle: a handle to the file, valid for as long as the model is current
+#   - load_order: the load order position of the file
+#   - masters: a tuple of the names of the file's masters
+#   - is_esm, is_esl: the ESM and ESL flags of the file header
+#   - num_records: the number of records in the file when the model was built
+PluginInfo = namedtuple(
+    "PluginInfo",
+    ["name", "handle", "load_order", "masters", "is_esm", "is_esl", "num_records"],
+)
+
+HEADER_FLAGS_PATH = "File Header\\Record Header\\Record Flags"
+
+
+class XEditLoadOrder:
+    """
+    A model of the files loaded in an xedit session, read once and kept until
+    the load order changes. See `XEdit.load_order`.
+
+    The model is tied to the `load_order_generation` of the xelib session it
+    was read from, which is bumped by adding, loading, unloading, renaming
+    and nuking files, by adding, cleaning and sorting masters, and by
+    setting the ESM and ESL flags; `is_current` tells whether it still
+    holds. Handles of
+    the files are kept in the session's bottom handle management layer, so
+    they outlive any `manage_handles` context the model is built in, and are
+    released by `release` once the model is replaced.
+
+    Record counts are read when the model is built; adding or removing
+    records does not change the load order, so use `XEditPlugin.num_records`
+    for live counts.
+    """
+
+    def __init__(self, xedit):
+        xelib = xedit.xelib
+        self.generation = xelib.load_order_generation
+        self._xelib = xelib
+        self.plugins = []
+        self.infos = []
+        for handle in xelib.get_elements(0):
+            xelib.untrack_handle(handle)
+            xelib.track_handle(handle, layer=xelib.session_layer)
+            flags = xelib.get_enabled_flags(handle, HEADER_FLAGS_PATH, ex=False)
+            flags = flags or ()
+            self.infos.append(
+                PluginInfo(
+                    name=xelib.name(handle),
+                    handle=handle,
+                    load_order=xelib.get_file_load_order(handle),
+                    masters=tuple(xelib.get_master_names(handle, ex=False) or ()),
+                    is_esm="ESM" in flags,
+                    is_esl="ESL" in flags,
+                    num_records=xelib.get_record_count(handle, ex=False),
+                )
+            )
+            self.plugins.append(
+                XEditPlugin(
+                    xelib,
+                    handle,
+                    xelib.handle_token(handle),
+                    auto_release=False,
+                    root=xedit._root,
+                )
+            )
+        self._by_name = {info.name: info for info in self.infos}
+
+    def __iter__(self):
+        return iter(self.infos)
+
+    def __len__(self):
+        return len(self.infos)
+
+    def __getitem__(self, key):
+        """
+        Returns the `PluginInfo` of a file, given its name or its position in
+        the list of loaded files
+        """
+        if isinstance(key, str):
+            return self._by_name[key]
+        return self.infos[key]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    @property
+    def names(self):
+        """
+        The names of the loaded files, hardcoded files like `Skyrim.exe`
+        excluded, as with `xelib.get_loaded_file_names`
+        """
+        return [info.name for info in self.infos if not info.name.endswith(".exe")]
+
+    @property
+    def is_current(self):
+        """
+        Whether the load order has not changed since the model was read
+        """
+        return (
+            self._xelib.loaded
+            and self._xelib.load_order_generation == self.generation
+        )
+
+    def release(self):
+        """
+        Releases the file handles held by the model
+        """
+        if self._xelib.loaded:
+            self._xelib.release_handles([info.handle for info in self.infos])
@@ -1,4 +1,23 @@
 from pyxedit.xedit.base import XEditBase
+from pyxedit.xedit.misc import XEditError
+from pyxedit.xelib import XelibError
+
+# the number of records `XEditPlugin.iter_records` yields per handle chunk
+RECORD_CHUNK_SIZE = 256
+
+# modes of `XEditPlugin.copy_records`, see `XEditGenericObject.copy_into`
+COPY_MODES = ('override', 'new', 'mirror')
+
+# the object IDs, the lower bits of FormIDs, new records can be given; those
+# below 0x800 are reserved by the game, and ESL-flagged plugins can only hold
+# records with object IDs up to 0xFFF
+FIRST_OBJECT_ID = 0x800
+LAST_OBJECT_ID = 0xFFFFFF
+LAST_ESL_OBJECT_ID = 0xFFF
+
+# top-level groups nesting groups of their own; records that have no
+# top-level group, like REFR, ACHR, NAVM and INFO, live in these
+NESTED_GROUPS = ('CELL', 'WRLD', 'DIAL')
 
 
 class XEditPlugin(XEditBase):
@@ -29,6 +48,22 @@ class XEditPlugin(XEditBase):
     def is_esm(self, value):
         return self.xelib_run('set_is_esm', value)
 
+    @property
+    def is_esl(self):
+        return self.xelib_run('get_is_esl')
+
+    @is_esl.setter
+    def is_esl(self, value):
+        return self.xelib_run('set_is_esl', value)
+
+    @property
+    def next_object_id(self):
+        return self.xelib_run('get_next_object_id')
+
+    @next_object_id.setter
+    def next_object_id(self, value):
+        return self.xelib_run('set_next_object_id', value)
+
     @property
     def next_object(self):
         return self.objectify(self.xelib_run('get_next_object_id'))
@@ -101,3 +136,382 @@ class XEditPlugin(XEditBase):
 
     def save_as(self, file_path):
         return self.xelib_run('save_file', file_path=str(file_path))
+
+    def iter_records(self, signatures=None, chunk_size=RECORD_CHUNK_SIZE):
+        '''
+        Yields the records of the plugin, group by group, keeping the number
+        of live handles flat however large the plugin is, unlike
+        `xelib.get_records`, which returns handles for every record at once.
+
+        The handles of each group's records are fetched with a single call,
+        and are yielded in chunks of `chunk_size` records, each chunk in a
+        handle management layer of its own (see `Xelib.open_layer`). When
+        the next chunk is requested, or the iterator is closed, the handles
+        of the chunk's records are released; records to keep using beyond
+        that have to be `promote()`-d into the handle management context the
+        chunk was requested from. The handles of a group are all released
+        once the group is done. No handle management context is held open
+        while a record is yielded, so the iterator can be resumed from any
+        context, and interleaved with other iterators.
+
+        @param signatures: the signature of the records to yield, a
+                           comma-separated string of signatures, or an
+                           iterable of them; all records are yielded if None
+        @param chunk_size: the number of records yielded per chunk
+        '''
+        if isinstance(signatures, str):
+            signatures = signatures.split(',')
+        wanted = set(signatures) if signatures is not None else None
+        xelib = self.xelib
+        # the generator's own handles are kept in a layer of their own, off
+        # the handle management stack, since it may be resumed from within
+        # other handle management contexts than it was started in
+        layer = xelib.open_layer()
+        try:
+            with xelib.use_layer(layer):
+                groups = xelib.get_elements(self.handle)
+            for group in groups:
+                if xelib.element_type(group) != self.ElementTypes.GroupRecord:
+                    continue
+                signature = xelib.signature(group)
+                nested = signature in NESTED_GROUPS
+                if nested or wanted is None or signature in wanted:
+                    yield from self._iter_group_records(
+                        group, wanted, nested, chunk_size)
+        finally:
+            xelib.close_layer(layer)
+
+    def _iter_group_records(self, group, wanted, nested, chunk_size):
+        '''
+        Yields the records of a group in chunks. Groups holding only records
+        of their own signature need not have their records checked one by
+        one; for `nested` groups, each element is checked, only records with
+        one of the `wanted` signatures are yielded, and nested groups are
+        descended into.
+        '''
+        xelib = self.xelib
+        # handles not handed out in a chunk are released along with the layer
+        layer = xelib.open_layer()
+        try:
+            with xelib.use_layer(layer):
+                handles = xelib.get_elements(group, ex=False)
+            records, groups = handles, []
+            if nested:
+                records = []
+                for handle in handles:
+                    element_type = xelib.element_type(handle)
+                    if element_type == self.ElementTypes.GroupRecord:
+                        groups.append(handle)
+                    elif (element_type == self.ElementTypes.MainRecord and
+                          (wanted is None or
+                           xelib.signature(handle) in wanted)):
+                        records.append(handle)
+
+            for start in range(0, len(records), chunk_size):
+                # the chunk's handles are moved into a layer of their own,
+                # released when the next chunk is requested; promoted records
+                # end up in the caller's context
+                chunk = xelib.open_layer()
+                try:
+                    for handle in records[start:start + chunk_size]:
+                        xelib.untrack_handle(handle)
+                        xelib.track_handle(handle, chunk)
+                        with xelib.use_layer(chunk):
+                            record = self.objectify(handle)
+                        yield record
+                finally:
+                    xelib.close_layer(chunk)
+
+            for nested_group in groups:
+                yield from self._iter_group_records(
+                    nested_group, wanted, True, chunk_size)
+        finally:
+            xelib.close_layer(layer)
+
+    def copy_records(self, records, mode='override', clean_masters=True):
+        '''
+        Copies many records into this plugin, resolving masters once for the
+        whole batch rather than once per record as `copy_into` does.
+
+        The masters needed are taken to be the plugins the records come from,
+        along with their own masters, read once per plugin; those missing are
+        added in a single call, in load order (see `XEdit.load_order`),
+        before any record is copied. This can add masters no copied record
+        refers to, which are removed again afterwards unless
+        `clean_masters` is turned off, e.g. to save the cost of cleaning
+        masters after each of many batches copied into the same plugin.
+
+        Records that cannot be copied, including those whose plugins load
+        after this one, are reported in the result's `failures` rather than
+        aborting the batch.
+
+        @param records: an iterable of record objects to copy
+        @param mode: 'override', 'new' or 'mirror'; see `copy_into`
+        @param clean_masters: whether to remove masters none of the records
+                              of this plugin need once the records are
+                              copied; on by default
+        @return: an `XEditCopyResult`, which creates the copied record objects
+                 as they are accessed
+        '''
+        if mode not in COPY_MODES:
+            raise XEditError(f'Unknown copy mode {mode}; expected one of '
+                             f'{COPY_MODES}')
+        records = list(records)
+        name, sources, required = self._add_masters_for(records)
+
+        xelib = self.xelib
+        handles, failures = [], []
+        for record, source in zip(records, sources):
+            if required[source] is None:
+                failures.append((record, XEditError(
+                    f'Cannot copy {record} into {name}, since {source} or '
+                    f'one of its masters loads after it')))
+                continue
+            as_new = (mode == 'new' or
+                      (mode == 'mirror' and xelib.is_master(record.handle)))
+            try:
+                handles.append(xelib.copy_element(record.handle, self.handle,
+                                                  as_new=as_new))
+            except XelibError as error:
+                failures.append((record, error))
+
+        if clean_masters:
+            xelib.clean_masters(self.handle)
+        return XEditCopyResult(self, handles, failures)
+
+    def allocate_form_ids(self, count, esl=None):
+        '''
+        Reserves a contiguous block of object IDs for new records of the
+        plugin, the first one from its next object ID on that no record of
+        the plugin uses yet; the next object ID is then moved past the block
+        with a single call. Give the reserved IDs to records with
+        `assign_form_ids`.
+
+        @param count: the number of object IDs to reserve
+        @param esl: whether the block has to fit the 0x800-0xFFF range of
+                    ESL-flagged plugins; by default, whether the plugin is
+                    flagged as an ESL
+        @return: a range of the reserved object IDs
+        '''
+        block = self._object_id_block(count, esl)
+        self.xelib.set_next_object_id(self.handle, block.stop)
+        return block
+
+    def assign_form_ids(self, records, object_ids=None,
+                        fix_references=False):
+        '''
+        Gives records of this plugin new FormIDs, with one `set_form_id` call
+        per record and no other lookups.
+
+        References to the records are left alone by default, which is right
+        for records just created, that nothing refers to yet.
+
+        @param records: an iterable of record objects of this plugin
+        @param object_ids: the object IDs to give the records, in order;
+                           a block is allocated with `allocate_form_ids` if
+                           not given
+        @param fix_references: whether to update references to the records
+                               to their new FormIDs
+        @return: the object IDs given to the records
+        '''
+        records = list(records)
+        if object_ids is None:
+            object_ids = self.allocate_form_ids(len(records))
+        elif len(object_ids) != len(records):
+            raise XEditError(f'Got {len(object_ids)} object IDs for '
+                             f'{len(records)} records')
+        xelib = self.xelib
+        prefix = self._native_form_id_prefix()
+        for record, object_id in zip(records, object_ids):
+            xelib.set_form_id(record.handle, prefix | object_id, native=True,
+                              fix_references=fix_references)
+        return object_ids
+
+    def create_records(self, template, count=None, values=None, esl=None):
+        '''
+        Creates new records in this plugin as copies of a template record,
+        with FormIDs from a single contiguous block of object IDs (see
+        `allocate_form_ids`).
+
+        The masters the template needs are added once, as for
+        `copy_records`; each record then takes one call to check its object
+        ID is not in use yet, one to copy and one to set its FormID, on top
+        of the calls setting its values, and the plugin's next object ID is
+        moved past the block once all records are created.
+
+        @param template: the record to copy; it can belong to this plugin
+        @param count: the number of records to create; defaults to the
+                      number of `values`
+        @param values: an iterable of dicts, one per record, mapping element
+                       paths to the values to set on the record's copy of
+                       the template; elements missing from the template are
+                       added
+        @param esl: whether the FormIDs have to fit the range of ESL-flagged
+                    plugins; by default, whether the plugin is flagged as an
+                    ESL
+        @return: a list of the created record objects
+        '''
+        if values is not None:
+            values = list(values)
+            if count is None:
+                count = len(values)
+            elif len(values) != count:
+                raise XEditError(f'Got {len(values)} sets of values for '
+                                 f'{count} records')
+        elif count is None:
+            raise XEditError('Either a count or values must be given')
+        block = self._object_id_block(count, esl)
+
+        _, _, required = self._add_masters_for([template])
+        if None in required.values():
+            raise XEditError(f'Cannot copy {template} into {self.name}, '
+                             f'since its plugin or one of its masters loads '
+                             f'after it')
+
+        # copies made as new are given the next object ID of the plugin,
+        # so pointing it at the block makes them take the block's IDs in the
+        # first place; the IDs are still set explicitly, rather than relying
+        # on how xEdit moves the next object ID on after each copy
+        xelib = self.xelib
+        xelib.set_next_object_id(self.handle, block.start)
+        prefix = self._native_form_id_prefix()
+        records = []
+        for index, object_id in enumerate(block):
+            handle = xelib.copy_element(template.handle, self.handle,
+                                        as_new=True)
+            xelib.set_form_id(handle, prefix | object_id, native=True,
+                              fix_references=False)
+            record = self.objectify(handle)
+            for path, value in (values[index] if values else {}).items():
+                record.get_or_add(path).value = value
+            records.append(record)
+
+        xelib.set_next_object_id(self.handle, block.stop)
+        return records
+
+    def _object_id_block(self, count, esl):
+        '''
+        Returns the first range of `count` object IDs from the next object ID
+        of the plugin on that no record of the plugin uses yet, checking that
+        it fits the range of object IDs new records can be given. Each ID of
+        the block is looked up with one call.
+        '''
+        if esl is None:
+            esl = self.is_esl
+        last = LAST_ESL_OBJECT_ID if esl else LAST_OBJECT_ID
+        xelib = self.xelib
+        prefix = self._native_form_id_prefix()
+        start = max(xelib.get_next_object_id(self.handle), FIRST_OBJECT_ID)
+        object_id = start
+        while object_id < start + count:
+            if start + count - 1 > last:
+                raise XEditError(f'Cannot allocate {count} object IDs in '
+                                 f'{self.name}; only '
+                                 f'{max(last + 1 - start, 0)} are left up '
+                                 f'to {last:X}')
+            handle = xelib.get_record(self.handle, prefix | object_id,
+                                      search_masters=False, ex=False)
+            if handle:
+                # in use; the block has to start past it
+                xelib.release_handle(handle)
+                start = object_id + 1
+            object_id += 1
+        return range(start, start + count)
+
+    def _native_form_id_prefix(self):
+        '''
+        The upper bits of the file-native FormIDs of records new to the
+        plugin, which hold the number of its masters
+        '''
+        return len(self.xelib.get_master_names(self.handle)) << 24
+
+    def _add_masters_for(self, records):
+        '''
+        Adds the masters needed to copy the given records into this plugin
+        with a single call, in load order: the plugins the records come from,
+        along with their own masters. Masters are read with one call per
+        plugin the records come from, since they change as records are copied;
+        load order positions are taken from the cached load order model.
+
+        @return: the name of this plugin, the name of the plugin each record
+                 comes from, and a dict of the masters each of those plugins
+                 requires, or None for plugins loading after this one, whose
+                 records cannot be copied into it
+        '''
+        xelib = self.xelib
+        load_order = self._root.load_order
+        name = xelib.name(self.handle)
+        position = load_order[name].load_order
+
+        # the plugin each record comes from, from the first segment of its
+        # path, which takes no handle to find out
+        sources = [xelib.path(record.handle).split('\\', 1)[0]
+                   for record in records]
+
+        required = {}
+        for source in set(sources):
+            source_masters = xelib.get_master_names(load_order[source].handle)
+            masters = {source, *source_masters} - {name}
+            if any(load_order[master].load_order > position
+                   for master in masters):
+                required[source] = None
+            else:
+                required[source] = masters
+
+        current = set(xelib.get_master_names(self.handle))
+        missing = set().union(*(masters for masters in required.values()
+                                if masters)) - current
+        if missing:
+            xelib.add_masters(self.handle, sorted(
+                missing, key=lambda master: load_order[master].load_order))
+        return name, sources, required
+
+
+class XEditCopyResult:
+    '''
+    The outcome of `XEditPlugin.copy_records`: the handles of the copied
+    records, in the order they were copied, and the records that failed to
+    copy.
+
+    Indexing and iterating produce the copied record objects, each created
+    the first time it is accessed, in the handle management context it is
+    accessed in.
+    '''
+    def __init__(self, plugin, handles, failures):
+        self._plugin = plugin
+        self._objects = {}
+        self.handles = handles
+        # (record, exception) pairs for the records that failed to copy
+        self.failures = failures
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} {len(self.handles)} copied, '
+                f'{len(self.failures)} failed>')
+
+    def __len__(self):
+        return len(self.handles)
+
+    def __getitem__(self, index):
+        handle = self.handles[index]
+        obj = self._objects.get(handle)
+        if obj is None:
+            xelib = self._plugin.xelib
+            if xelib.handle_layer(handle) is None:
+                raise XEditError(f'Copied record handle {handle} has already '
+                                 f'been released')
+            # objects are created from handles of the current context
+            xelib.untrack_handle(handle)
+            xelib.track_handle(handle)
+            obj = self._objects[handle] = self._plugin.objectify(handle)
+        return obj
+
+    def __iter__(self):
+        for index in range(len(self.handles)):
+            yield self[index]
+
+    @property
+    def ok(self):
+        '''
+        Whether every record was copied
+        '''
+        return not self.failures
@@ -0,0 +1,108 @@
+from pyxedit.xedit.misc import XEditError
+
+
+class XEditRef:
+    """
+    A lazy reference to a record, as the value of a Ref-typed element.
+
+    Only the load order FormID of the referenced record is read up front;
+    the record object is looked up and created the first time any attribute
+    other than `form_id` and `form_id_str` is accessed, and then kept for
+    later accesses. Everything else, attributes, indexing and
+    assignments alike, is passed on to the record object, so a reference can
+    be used wherever the record object itself would be.
+
+    References are equal to other references and to record objects with the
+    same FormID, and hash on their FormID, as record objects do, so
+    references to the same record collapse in sets and dictionaries without
+    being resolved, and find the record objects there too.
+    """
+
+    __slots__ = ("form_id", "_parent", "_record")
+
+    def __init__(self, parent, form_id):
+        """
+        @param parent: the xedit object the reference was read from; it is
+                       used to look up and objectify the referenced record
+        @param form_id: the load order FormID of the referenced record
+        """
+        object.__setattr__(self, "form_id", form_id)
+        object.__setattr__(self, "_parent", parent)
+        object.__setattr__(self, "_record", None)
+
+    @classmethod
+    def read(cls, obj, path=""):
+        """
+        Reads the reference at the given path of an xedit object.
+
+        @return: the reference, or None for a null reference, a reference to
+                 a record that is not loaded, or if there is no element at
+                 the path
+        """
+        # the value of a reference element is its FormID as stored in the
+        # file, relative to the file's own masters; the load order FormID is
+        # read off the record it links to instead
+        xelib = obj.xelib
+        target = xelib.get_links_to(obj.handle, path=path, ex=False)
+        if not target:
+            return None
+        form_id = xelib.get_form_id(target, ex=False)
+        xelib.defer_release(target, xelib.handle_token(target))
+        return cls(obj, form_id) if form_id else None
+
+    @property
+    def form_id_str(self):
+        return f"{self.form_id:0>8X}"
+
+    @property
+    def record(self):
+        """
+        The object of the referenced record, looked up on first access
+        """
+        if self._record is None:
+            parent = self._parent
+            handle = parent.xelib.get_record(0, self.form_id, ex=False)
+            if not handle:
+                raise XEditError(
+                    f"{self!r} refers to a record that is not loaded"
+                )
+            object.__setattr__(self, "_record", parent.objectify(handle))
+        return self._record
+
+    @property
+    def is_resolved(self):
+        """
+        Whether the referenced record object has been looked up yet
+        """
+        return self._record is not None
+
+    def __getattr__(self, name):
+        return getattr(self.record, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.record, name, value)
+
+    def __getitem__(self, path):
+        return self.record[path]
+
+    def __setitem__(self, path, value):
+        self.record[path] = value
+
+    def __eq__(self, other):
+        # imported here, since the base module imports this one indirectly
+        from pyxedit.xedit.base import XEditBase
+
+        if isinstance(other, XEditRef):
+            return self.form_id == other.form_id
+        if (isinstance(other, XEditBase) and
+                other.element_type == other.ElementTypes.MainRecord):
+            return self.form_id == other.form_id
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.form_id)
+
+    def __repr__(self):
+        if self._record is not None:
+            return f"<{self.__class__.__name__} {self._record!r}>"
+        return f"<{self.__class__.__name__} {self.form_id_str}>"
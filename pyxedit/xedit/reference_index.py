@@ -0,0 +1,193 @@
+from array import array
+from collections import Counter, defaultdict
+
+
+class XEditReferenceIndex:
+    '''
+    A reverse reference index mapping a FormID to the FormIDs of the records
+    referencing it, built and held entirely on the python side.
+
+    The index is stored in CSR (compressed sparse row) layout: every target
+    FormID owns a row, `_offsets[row]:_offsets[row + 1]` is the slice of
+    `_referrers` holding that row's referrers, and `_rows` maps a target
+    FormID to its row. Offsets and referrers are `array.array` integer
+    arrays, so even millions of references stay compact.
+
+    One entry is kept per reference (a record referencing the same target
+    from two fields shows up twice), which lets incremental updates tell
+    whether a referrer still references a target after one of its fields has
+    been re-pointed. Updates go into a small overlay of per-target count
+    deltas; `compact` folds them back into the CSR arrays.
+
+    An index built from a session (see `track`) rebuilds itself when it is
+    queried after references may have changed in ways it was not told about.
+    '''
+    def __init__(self, rows=None, offsets=None, referrers=None):
+        self._rows = rows or {}
+        self._offsets = offsets or array('I', [0])
+        self._referrers = referrers or array('I')
+        self._deltas = defaultdict(Counter)
+
+        # the xelib session the index follows, see `track`
+        self._xelib = None
+        self._rebuild = None
+        self.generation = None
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        '''
+        Builds an index from an iterable of `(target, referrer)` FormID pairs,
+        one pair per reference. The iterable is consumed exactly once, so it
+        can be a generator streaming pairs out of a plugin scan.
+        '''
+        targets = array('I')
+        referrers = array('I')
+        for target, referrer in pairs:
+            targets.append(target)
+            referrers.append(referrer)
+
+        # count references per target, assigning rows in first-seen order
+        rows = {}
+        counts = array('I')
+        for target in targets:
+            row = rows.get(target)
+            if row is None:
+                row = rows[target] = len(counts)
+                counts.append(0)
+            counts[row] += 1
+
+        # turn the counts into row offsets
+        offsets = array('I', [0])
+        for count in counts:
+            offsets.append(offsets[-1] + count)
+
+        # scatter referrers into their rows
+        cursors = offsets[:-1]
+        packed = array('I', bytes(referrers.itemsize * len(referrers)))
+        for target, referrer in zip(targets, referrers):
+            row = rows[target]
+            packed[cursors[row]] = referrer
+            cursors[row] += 1
+
+        return cls(rows, offsets, packed)
+
+    def track(self, xelib, rebuild):
+        '''
+        Ties the index to the `references_generation` of the given xelib
+        session. Once the generation has moved on, the next query replaces
+        the contents of the index with the `(target, referrer)` pairs
+        produced by calling `rebuild`.
+        '''
+        self._xelib = xelib
+        self._rebuild = rebuild
+        self.generation = xelib.references_generation
+
+    @property
+    def is_current(self):
+        '''
+        Whether no references have changed since the index was last built or
+        updated, as far as the xelib session it follows can tell
+        '''
+        return (self._xelib is None
+                or self._xelib.references_generation == self.generation)
+
+    def refresh(self):
+        '''
+        Rebuilds the index if it is no longer current.
+        '''
+        if not self.is_current:
+            self._replace(self.from_pairs(self._rebuild()))
+            self.generation = self._xelib.references_generation
+
+    def _replace(self, other):
+        self._rows = other._rows
+        self._offsets = other._offsets
+        self._referrers = other._referrers
+        self._deltas = defaultdict(Counter)
+
+    def _base_referrers(self, form_id):
+        row = self._rows.get(form_id)
+        if row is None:
+            return self._referrers[0:0]
+        return self._referrers[self._offsets[row]:self._offsets[row + 1]]
+
+    def referenced_by(self, form_id):
+        '''
+        Returns the FormIDs of the records referencing the given FormID, as a
+        tuple without duplicates.
+        '''
+        self.refresh()
+        base = self._base_referrers(form_id)
+        delta = self._deltas.get(form_id)
+        if not delta:
+            return tuple(dict.fromkeys(base))
+        counts = Counter(base)
+        counts.update(delta)
+        return tuple(referrer for referrer, count in counts.items()
+                     if count > 0)
+
+    def __contains__(self, form_id):
+        return bool(self.referenced_by(form_id))
+
+    def __len__(self):
+        '''
+        Number of FormIDs that are referenced by at least one record
+        '''
+        return sum(1 for form_id in self.targets if self.referenced_by(form_id))
+
+    @property
+    def targets(self):
+        '''
+        Produces every FormID the index knows about
+        '''
+        self.refresh()
+        yield from self._rows
+        for form_id in self._deltas:
+            if form_id not in self._rows:
+                yield form_id
+
+    def add_reference(self, target, referrer):
+        '''
+        Records that `referrer` gained a reference to `target`.
+        '''
+        if target:
+            self._deltas[target][referrer] += 1
+
+    def remove_reference(self, target, referrer):
+        '''
+        Records that `referrer` lost a reference to `target`.
+        '''
+        if target:
+            self._deltas[target][referrer] -= 1
+
+    def move_reference(self, referrer, old_target, new_target):
+        '''
+        Records that one of `referrer`'s reference fields was re-pointed from
+        `old_target` to `new_target`. Either target may be falsey for a field
+        that was or becomes a null reference.
+        '''
+        if old_target == new_target:
+            return
+        self.remove_reference(old_target, referrer)
+        self.add_reference(new_target, referrer)
+
+    def pairs(self):
+        '''
+        Produces a `(target, referrer)` pair for every reference currently
+        held by the index, including pending updates.
+        '''
+        self.refresh()
+        for form_id in list(self.targets):
+            counts = Counter(self._base_referrers(form_id))
+            counts.update(self._deltas.get(form_id, {}))
+            for referrer, count in counts.items():
+                for _ in range(max(count, 0)):
+                    yield form_id, referrer
+
+    def compact(self):
+        '''
+        Folds pending incremental updates back into the CSR arrays.
+        '''
+        self.refresh()
+        if self._deltas:
+            self._replace(self.from_pairs(self.pairs()))
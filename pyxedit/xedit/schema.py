@@ -0,0 +1,248 @@
+import hashlib
+import json
+from pathlib import Path
+import re
+
+from pyxedit.xedit.attribute import XEditAttribute
+from pyxedit.xedit.generic import XEditGenericObject
+from pyxedit.xedit.values import value_accessor
+from pyxedit.xelib import Xelib
+
+# schema files are written here by default, one per game mode and list of
+# plugins, since schemas are built from the records of the loaded plugins
+SCHEMA_DIR = Path.home() / ".pyxedit" / "schemas"
+
+SCHEMA_VERSION = 4
+
+# a path segment naming a subrecord, e.g. `ACBS - Configuration`
+SUBRECORD_SEGMENT = re.compile(r"^([A-Z0-9_]{4}) - ")
+
+
+def value_kind(def_type, value_type):
+    """
+    Returns how the value of an element with the given def and value types
+    is read; this is the kind of its `ValueAccessor`, as used by
+    `XEditGenericObject.value`.
+
+    @return: one of `"string"`, `"integer"`, `"unsigned"`, `"float"`,
+             `"bytes"`, `"flag"` and `"reference"` for value elements, or
+             `"container"` for elements without a value of their own
+    """
+    return value_accessor(def_type, value_type).kind
+
+
+def single_kind(kinds):
+    """
+    Returns the one value kind in a list of the kinds seen for a field, or
+    None if there is more than one, or none, as for union members
+    """
+    return kinds[0] if len(kinds) == 1 else None
+
+
+def short_path(path):
+    """
+    Returns a path with its subrecord segments reduced to their signatures,
+    e.g. `ACBS\\Flags` for `ACBS - Configuration\\Flags`; xEdit resolves
+    both, and hand-written attributes use the short form.
+    """
+    return "\\".join(
+        match.group(1) if match else segment
+        for segment, match in (
+            (segment, SUBRECORD_SEGMENT.match(segment))
+            for segment in path.split("\\")
+        )
+    )
+
+
+def attribute_name(path):
+    """
+    Returns the name of the generated attribute for a field path, e.g.
+    `acbs_flags` for `ACBS - Configuration\\Flags`
+    """
+    name = "_".join(
+        re.sub(r"\W+", "_", segment).strip("_").lower()
+        for segment in short_path(path).split("\\")
+    )
+    return f"f_{name}" if name[:1].isdigit() else name
+
+
+def default_schema_path(game_mode, plugins=()):
+    """
+    Returns the default schema file for a game mode and the list of plugins
+    loaded, e.g. `~/.pyxedit/schemas/SSE-1f0c3b2a9d4e.json`
+    """
+    key = "\n".join(plugin.lower() for plugin in plugins)
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    return SCHEMA_DIR / f"{game_mode.name}-{digest}.json"
+
+
+class XEditSchema:
+    """
+    Describes the fields of each record signature of a game mode, and how
+    their values are read, so that reading them does not need to probe the
+    def and value types of each element first.
+
+    A schema is built from the records of a loaded load order, and saved to
+    a file to be loaded in later sessions with the same plugins; see
+    `XEdit.load_schema`. With a schema loaded, `XEditAttribute` reads of
+    known fields go straight to the typed xelib getter, and records are
+    objectified with accessor classes carrying a typed attribute per known
+    field.
+
+    Every kind seen for a field is kept. Fields of more than one kind are
+    not given a kind, and are read by probing their types as without a
+    schema. Neither are union members, whatever the sampled records hold,
+    since xEdit resolves them per record.
+    """
+
+    def __init__(self, game_mode, records, version=SCHEMA_VERSION, plugins=None):
+        """
+        @param game_mode: the `GameModes` value the schema describes
+        @param records: a dict of record signature to a dict of field path
+                        to the list of value kinds seen for the field (see
+                        `value_kind`), which is empty for union members
+        @param version: the version of the schema format
+        @param plugins: the names of the plugins the schema was built from
+        """
+        self.game_mode = game_mode
+        self.records = records
+        self.version = version
+        self.plugins = plugins
+        # signature -> short and full field paths -> value kind, or None for
+        # fields of more than one kind
+        self._kinds = {
+            signature: {
+                **{short_path(path): single_kind(kinds)
+                   for path, kinds in fields.items()},
+                **{path: single_kind(kinds) for path, kinds in fields.items()},
+            }
+            for signature, fields in records.items()
+        }
+        self._accessor_classes = {}
+
+    @classmethod
+    def build(cls, xedit, sample=5):
+        """
+        Builds the schema from the records of the plugins loaded in an xedit
+        session, by probing every element of the first `sample` records of
+        each signature. Fields none of the sampled records have are left out;
+        reading them falls back to probing.
+
+        @param xedit: the `XEdit` object of the session
+        @param sample: the number of records of each signature to probe
+        @return: the built schema
+        """
+        xelib = xedit.xelib
+        records = {}
+        counts = {}
+        for plugin_name in xelib.get_loaded_file_names():
+            with xelib.manage_handles():
+                file_ = xelib.file_by_name(plugin_name)
+                for group in xelib.get_elements(file_):
+                    if xelib.element_type(group) != xelib.ElementTypes.GroupRecord:
+                        continue
+                    signature = xelib.signature(group)
+                    if counts.get(signature, 0) >= sample:
+                        continue
+                    with xelib.manage_handles():
+                        for record in xelib.get_elements(group):
+                            if counts.get(signature, 0) >= sample:
+                                break
+                            counts[signature] = counts.get(signature, 0) + 1
+                            fields = records.setdefault(signature, {})
+                            cls.probe_fields(xelib, record, fields)
+        return cls(xedit.game_mode, records,
+                   plugins=xelib.get_loaded_file_names())
+
+    @staticmethod
+    def probe_fields(xelib, record, fields):
+        """
+        Adds the value kind of each element under a record to the kinds seen
+        for its path in `fields`, except for array items, whose paths depend
+        on their index. Union members, which xEdit resolves per record, are
+        added without a kind.
+        """
+        pending = [(handle, False) for handle in xelib.get_elements(record)]
+        while pending:
+            handle, in_union = pending.pop()
+            path = xelib.local_path(handle)
+            if "[" in path:
+                continue
+            def_type = xelib.def_type(handle, ex=False)
+            kind = value_kind(def_type, xelib.value_type(handle, ex=False))
+            in_union = in_union or def_type in XEditGenericObject.UNION_DEF_TYPES
+            kinds = fields.setdefault(path, [])
+            if not in_union and kind not in kinds:
+                kinds.append(kind)
+            if kind == "container":
+                pending.extend(
+                    (child, in_union)
+                    for child in xelib.get_elements(handle, ex=False)
+                )
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as fp:
+            data = json.load(fp)
+        return cls(
+            Xelib.GameModes[data["game_mode"]],
+            data["records"],
+            version=data.get("version"),
+            plugins=data.get("plugins"),
+        )
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump(
+                {
+                    "version": self.version,
+                    "game_mode": self.game_mode.name,
+                    "plugins": self.plugins,
+                    "records": self.records,
+                },
+                fp,
+                indent=1,
+                sort_keys=True,
+            )
+
+    def kind(self, signature, path):
+        """
+        Returns the value kind of the field at the given path of records of
+        the given signature, or None if it is not known or not always the
+        same
+        """
+        fields = self._kinds.get(signature)
+        return fields.get(path) if fields else None
+
+    def varies(self, signature, path):
+        """
+        Returns whether the field at the given path of records of the given
+        signature has been seen with more than one value kind
+        """
+        fields = self._kinds.get(signature)
+        return bool(fields) and path in fields and fields[path] is None
+
+    def accessor_class(self, signature, base=None):
+        """
+        Returns an accessor class for records of the given signature: a
+        subclass of `base` (the hand-written object class of the signature,
+        or `XEditGenericObject`) with a typed `XEditAttribute` for each known
+        field that `base` does not already have an attribute for.
+        """
+        base = base or XEditGenericObject
+        fields = self.records.get(signature)
+        if not fields:
+            return base
+        key = (signature, base)
+        accessor_class = self._accessor_classes.get(key)
+        if accessor_class is None:
+            attributes = {}
+            for path, kinds in sorted(fields.items()):
+                name = attribute_name(path)
+                if name and not hasattr(base, name) and name not in attributes:
+                    attributes[name] = XEditAttribute(path, kind=single_kind(kinds))
+            accessor_class = type(f"Typed{base.__name__}", (base,), attributes)
+            self._accessor_classes[key] = accessor_class
+        return accessor_class
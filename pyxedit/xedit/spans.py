@@ -0,0 +1,197 @@
+from contextlib import contextmanager
+from functools import wraps
+import inspect
+import json
+import os
+import threading
+import time
+
+from cached_property import cached_property
+
+from pyxedit.xedit.misc import XEditError
+
+# members that are called so often, and do so little, that spans for them
+# would only bury the interesting ones
+EXCLUDED_MEMBERS = {"xelib", "xelib_run"}
+
+
+def default_targets():
+    """
+    Returns the classes `SpanTracer` instruments by default, with the span
+    category for each: the core XEdit object classes, and the Xelib wrapper
+    method classes.
+    """
+    from pyxedit.xedit.array import XEditArray
+    from pyxedit.xedit.base import XEditBase
+    from pyxedit.xedit.generic import XEditGenericObject
+    from pyxedit.xedit.plugin import XEditPlugin
+    from pyxedit.xelib.wrapper_methods.helpers import HelpersMethods
+    from pyxedit.xelib.xelib import Xelib
+
+    targets = {
+        XEditBase: "xedit",
+        XEditGenericObject: "xedit",
+        XEditPlugin: "xedit",
+        XEditArray: "xedit",
+    }
+
+    # as with the debug log wrappers in xelib.py, HelpersMethods are left out,
+    # since they are too low level and would mostly add noise
+    for cls in Xelib.__mro__:
+        if cls.__name__.endswith("Methods") and cls is not HelpersMethods:
+            targets[cls] = "xelib"
+    return targets
+
+
+class SpanTracer:
+    """
+    Records how long calls to the public methods and properties of a set of
+    classes take, as spans that can be exported to a Chrome trace event file,
+    and viewed in `chrome://tracing` or https://ui.perfetto.dev as a flame
+    chart of nested operations.
+
+    Instrumentation works by replacing the methods on the classes with timing
+    wrappers when the tracer is enabled, and putting the originals back when
+    it is disabled, so that there is no cost at all while it is disabled.
+    Only one tracer can be enabled at a time.
+
+    Generator methods get a span for each step of the iteration, rather than
+    one for the whole iteration, since the iteration is interleaved with the
+    code consuming it.
+    """
+
+    _enabled_tracer = None
+
+    def __init__(self, targets=None):
+        """
+        @param targets: a dict of the classes to instrument, to the category
+                        to record their spans under; defaults to
+                        `default_targets()`
+        """
+        self.targets = targets
+        self.events = []
+        self._originals = []
+
+    @property
+    def enabled(self):
+        return SpanTracer._enabled_tracer is self
+
+    def enable(self):
+        if self.enabled:
+            return
+        if SpanTracer._enabled_tracer is not None:
+            raise XEditError("Another SpanTracer is already enabled")
+        targets = self.targets if self.targets is not None else default_targets()
+        for cls, category in targets.items():
+            for name, member in list(vars(cls).items()):
+                if name.startswith("_") or name in EXCLUDED_MEMBERS:
+                    continue
+                wrapped = self.wrap_member(member, f"{cls.__name__}.{name}",
+                                           category)
+                if wrapped is not None:
+                    self._originals.append((cls, name, member))
+                    setattr(cls, name, wrapped)
+        SpanTracer._enabled_tracer = self
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for cls, name, member in reversed(self._originals):
+            setattr(cls, name, member)
+        self._originals = []
+        SpanTracer._enabled_tracer = None
+
+    def clear(self):
+        # cleared in place, since the wrappers hold on to the list
+        self.events.clear()
+
+    def wrap_member(self, member, name, category):
+        """
+        Returns a timing replacement for a class member, or None if it is not
+        something that can be timed.
+        """
+        if inspect.isfunction(member):
+            return self.wrap_function(member, name, category)
+        if isinstance(member, cached_property):
+            return cached_property(
+                self.wrap_function(member.func, name, category))
+        if isinstance(member, property) and member.fget:
+            return property(self.wrap_function(member.fget, name, category),
+                            member.fset, member.fdel, member.__doc__)
+        return None
+
+    def wrap_function(self, function, name, category):
+        events = self.events
+        clock = time.perf_counter
+        pid = os.getpid()
+        get_ident = threading.get_ident
+
+        if inspect.isgeneratorfunction(function):
+            @wraps(function)
+            def traced(*args, **kwargs):
+                iterator = function(*args, **kwargs)
+                try:
+                    while True:
+                        start = clock()
+                        try:
+                            item = next(iterator)
+                        except StopIteration:
+                            return
+                        finally:
+                            events.append((name, category, start, clock(),
+                                           pid, get_ident()))
+                        yield item
+                finally:
+                    iterator.close()
+        else:
+            @wraps(function)
+            def traced(*args, **kwargs):
+                start = clock()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    events.append(
+                        (name, category, start, clock(), pid, get_ident()))
+        return traced
+
+    def trace_events(self):
+        """
+        @return: the recorded spans, as a list of Chrome trace complete
+                 ("X") events, with times in microseconds
+        """
+        return [
+            {"name": name, "cat": category, "ph": "X", "ts": start * 1e6,
+             "dur": (end - start) * 1e6, "pid": pid, "tid": tid}
+            for name, category, start, end, pid, tid in self.events
+        ]
+
+    def export(self, path):
+        """
+        Writes the recorded spans to a Chrome trace event JSON file.
+
+        @param path: the file path to write to
+        @return: the number of spans written
+        """
+        events = self.trace_events()
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fp)
+        return len(events)
+
+
+@contextmanager
+def trace_spans(path=None, targets=None):
+    """
+    A context manager that records spans with a `SpanTracer` while it is
+    active, and exports them to `path` on exit, if given.
+
+    @param path: an optional file path to export the trace to
+    @param targets: see `SpanTracer`
+    """
+    tracer = SpanTracer(targets=targets)
+    tracer.enable()
+    try:
+        yield tracer
+    finally:
+        tracer.disable()
+        if path:
+            tracer.export(path)
@@ -0,0 +1,163 @@
+from collections import namedtuple
+
+from pyxedit.xedit.misc import XEditError, XEditTypes
+from pyxedit.xedit.ref import XEditRef
+from pyxedit.xelib import Xelib
+
+DefTypes = Xelib.DefTypes
+ValueTypes = Xelib.ValueTypes
+
+# how the value of an element is read and written:
+#   - kind: the name of the value kind, as stored in schemas
+#   - type: the `XEditTypes` value of elements of the kind
+#   - get: a function of the element object returning its value
+#   - set: a function of the element object and a value, setting its value
+ValueAccessor = namedtuple("ValueAccessor", ["kind", "type", "get", "set"])
+
+
+def get_string(obj):
+    return obj.xelib.get_value(obj.handle)
+
+
+def set_string(obj, value):
+    return obj.xelib.set_value(obj.handle, str(value))
+
+
+def get_integer(obj):
+    return obj.xelib.get_int_value(obj.handle)
+
+
+def set_integer(obj, value):
+    return obj.xelib.set_int_value(obj.handle, int(value))
+
+
+def get_unsigned(obj):
+    return obj.xelib.get_uint_value(obj.handle)
+
+
+def set_unsigned(obj, value):
+    return obj.xelib.set_uint_value(obj.handle, int(value))
+
+
+def get_float(obj):
+    return obj.xelib.get_float_value(obj.handle)
+
+
+def set_float(obj, value):
+    return obj.xelib.set_float_value(obj.handle, float(value))
+
+
+def get_bytes(obj):
+    # xedit-lib has no call returning the raw bytes of an element; byte
+    # arrays are edited as space-separated hex pairs, e.g. `00 1A FF`
+    return bytes.fromhex(obj.xelib.get_value(obj.handle))
+
+
+def set_bytes(obj, value):
+    return obj.xelib.set_value(
+        obj.handle, " ".join(f"{byte:02X}" for byte in bytes(value))
+    )
+
+
+def get_flag(obj):
+    return obj.xelib.get_value(obj.handle) not in ("", "0")
+
+
+def set_flag(obj, value):
+    return obj.xelib.set_value(obj.handle, "1" if value else "0")
+
+
+def get_reference(obj):
+    # only the FormID is read; the record is looked up when it is needed
+    return XEditRef.read(obj)
+
+
+def set_reference(obj, value):
+    index = obj._root.reference_index if obj._root else None
+    if index is None or not index.is_current:
+        # a stale index is rebuilt when it is next queried
+        return obj.xelib.set_links_to(obj.handle, value.handle)
+
+    # keep the python-side reverse reference index up to date
+    with obj.manage_handles():
+        old_target = obj.xelib.get_links_to(obj.handle, ex=False)
+        old_form_id = old_target and obj.xelib.get_form_id(old_target)
+        record = obj.xelib.get_element_record(obj.handle)
+        referrer = obj.xelib.get_form_id(record)
+    result = obj.xelib.set_links_to(obj.handle, value.handle)
+    index.move_reference(referrer, old_form_id, value.form_id)
+    # the index has followed the change, so it is still current
+    index.generation = obj.xelib.references_generation
+    return result
+
+
+def get_none(obj):
+    return None
+
+
+def set_none(obj, value):
+    raise XEditError(f"Cannot set the value of element {obj} with type {obj.type}")
+
+
+STRING = ValueAccessor("string", XEditTypes.Value, get_string, set_string)
+INTEGER = ValueAccessor("integer", XEditTypes.Value, get_integer, set_integer)
+UNSIGNED = ValueAccessor("unsigned", XEditTypes.Value, get_unsigned, set_unsigned)
+FLOAT = ValueAccessor("float", XEditTypes.Value, get_float, set_float)
+BYTES = ValueAccessor("bytes", XEditTypes.Value, get_bytes, set_bytes)
+FLAG = ValueAccessor("flag", XEditTypes.Value, get_flag, set_flag)
+REFERENCE = ValueAccessor("reference", XEditTypes.Ref, get_reference, set_reference)
+CONTAINER = ValueAccessor("container", XEditTypes.Container, get_none, set_none)
+
+# (def type, value type) -> value accessor; def types whose values are read
+# the same way whatever their value type are keyed with a value type of None,
+# so their value type never needs to be retrieved
+VALUE_ACCESSORS = {
+    (None, None): CONTAINER,
+    (DefTypes.String, None): STRING,
+    (DefTypes.LString, None): STRING,
+    (DefTypes.LenString, None): STRING,
+    (DefTypes.ByteArray, None): BYTES,
+    (DefTypes.Flag, None): FLAG,
+    (DefTypes.Float, None): FLOAT,
+}
+for def_type in (
+    DefTypes.Record,
+    DefTypes.SubRecord,
+    DefTypes.SubRecordArray,
+    DefTypes.SubRecordStruct,
+    DefTypes.SubRecordUnion,
+    DefTypes.Array,
+    DefTypes.Struct,
+    DefTypes.Union,
+    DefTypes.Empty,
+    DefTypes.StructChapter,
+):
+    VALUE_ACCESSORS[(def_type, None)] = CONTAINER
+for def_type in (
+    DefTypes.Integer,
+    DefTypes.IntegerFormater,
+    DefTypes.IntegerFormaterUnion,
+):
+    for value_type in ValueTypes:
+        VALUE_ACCESSORS[(def_type, value_type)] = INTEGER
+    VALUE_ACCESSORS[(def_type, ValueTypes.Reference)] = REFERENCE
+    VALUE_ACCESSORS[(def_type, ValueTypes.Flags)] = UNSIGNED
+del def_type, value_type
+
+
+def value_accessor(def_type, value_type=None):
+    """
+    Returns the value accessor for elements of the given def and value types.
+
+    @param def_type: the `DefTypes` value of the element, or None
+    @param value_type: the `ValueTypes` value of the element, or a function
+                       returning it, which is only called for def types
+                       whose values are read according to their value type
+    @return: the `ValueAccessor` for the element
+    """
+    accessor = VALUE_ACCESSORS.get((def_type, None))
+    if accessor is None:
+        if callable(value_type):
+            value_type = value_type()
+        accessor = VALUE_ACCESSORS.get((def_type, value_type), CONTAINER)
+    return accessor
@@ -0,0 +1,189 @@
+from pyxedit.xelib import Xelib
+from pyxedit.xedit.misc import XEditError
+
+
+class XEditView:
+    """
+    A lightweight, read-only view of an element, produced instead of full
+    xedit objects when iterating with `fast=True`; see
+    `XEditBase.iter_child_elements`, `XEditBase.descendants` and
+    `XEditArray.iter_objects`.
+
+    A view holds only its handle, a reference to the full object it was
+    produced from, and its element, def and value types once they have been
+    looked up. It has no `__dict__` and no finalizer: its handle is not
+    released when the view goes out of scope, but along with the rest of the
+    handles of the `manage_handles` context it was created in, so fast
+    iteration should normally be done inside one:
+
+        with xedit.manage_handles():
+            for element in cell.descendants(fast=True):
+                if element.signature == "XCLW":
+                    print(element.value)
+
+    A view can be turned into the full xedit object for its element with
+    `upgrade`.
+    """
+
+    __slots__ = (
+        "handle",
+        "_handle_token",
+        "_source",
+        "_element_type",
+        "_def_type",
+        "_value_type",
+    )
+
+    ElementTypes = Xelib.ElementTypes
+    DefTypes = Xelib.DefTypes
+    ValueTypes = Xelib.ValueTypes
+
+    def __init__(self, source, handle):
+        """
+        @param source: the full xedit object the view is produced from; views
+                       of descendants share the source of their ancestor
+        @param handle: the handle of the viewed element
+        """
+        self.handle = handle
+        self._handle_token = source._xelib.handle_token(handle)
+        self._source = source
+        self._element_type = None
+        self._def_type = None
+        self._value_type = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name} {self.handle}>"
+
+    def __eq__(self, other):
+        return self.xelib.element_equals(self.handle, other.handle)
+
+    def __hash__(self):
+        return hash(self.path)
+
+    @property
+    def xelib(self):
+        """
+        Gates access to xelib on the handle still being valid, like
+        `XEditBase.xelib` does.
+        """
+        xelib = self._source._xelib
+        if xelib._handle_table.get(self.handle) != self._handle_token:
+            raise XEditError(
+                f"Accessing XEdit view of handle {self.handle} "
+                f"which has already been released from the "
+                f"xelib session"
+            )
+        return xelib
+
+    @property
+    def element_type(self):
+        if self._element_type is None:
+            self._element_type = self.xelib.element_type(self.handle, ex=False)
+        return self._element_type
+
+    @property
+    def def_type(self):
+        if self._def_type is None:
+            self._def_type = self.xelib.def_type(self.handle, ex=False)
+        return self._def_type
+
+    @property
+    def value_type(self):
+        """
+        Returns the value type, or None for File, Group, and Main element
+        types, which have none.
+        """
+        if self._value_type is None and self.element_type not in (
+            self.ElementTypes.File,
+            self.ElementTypes.GroupRecord,
+            self.ElementTypes.MainRecord,
+        ):
+            self._value_type = self.xelib.value_type(self.handle)
+        return self._value_type
+
+    @property
+    def name(self):
+        return self.xelib.name(self.handle, ex=False)
+
+    @property
+    def path(self):
+        return self.xelib.path(self.handle, ex=False)
+
+    @property
+    def long_path(self):
+        return self.xelib.long_path(self.handle, ex=False)
+
+    @property
+    def local_path(self):
+        return self.xelib.local_path(self.handle, ex=False)
+
+    @property
+    def signature(self):
+        if self.element_type in (
+            self.ElementTypes.MainRecord,
+            self.ElementTypes.GroupRecord,
+            self.ElementTypes.SubRecord,
+            self.ElementTypes.SubRecordStruct,
+            self.ElementTypes.SubRecordArray,
+            self.ElementTypes.SubRecordUnion,
+        ):
+            return self.xelib.signature(self.handle)
+
+    @property
+    def value(self):
+        """
+        Returns the value of the element as xEdit displays it, as a string;
+        for typed values, see `upgrade`.
+        """
+        return self.xelib.get_value(self.handle, ex=False)
+
+    @property
+    def num_child_elements(self):
+        return self.xelib.element_count(self.handle, ex=False)
+
+    @property
+    def child_elements(self):
+        """
+        Produces a view of each child element underneath this element
+        """
+        for handle in self.xelib.get_elements(self.handle, ex=False):
+            yield XEditView(self._source, handle)
+
+    def descendants(self, iter_groups=False):
+        """
+        Produces a view of each element underneath this element
+        """
+        if self.num_child_elements:
+            for child in self.child_elements:
+                yield child
+                yield from child.descendants(iter_groups=iter_groups)
+
+        if iter_groups:
+            handle = self.xelib.get_element(self.handle, "Child Group",
+                                            ex=False)
+            if handle:
+                child = XEditView(self._source, handle)
+                yield child
+                yield from child.descendants(iter_groups=iter_groups)
+
+    def upgrade(self):
+        """
+        Returns the full xedit object for the viewed element. The object takes
+        over the view's handle, and releases it when it goes out of scope, so
+        the view should not be used after upgrading it.
+        """
+        # raises if the handle has already been released
+        self.xelib
+        if self._handle_token[0] != self._source._xelib.current_layer:
+            raise XEditError(
+                f"Cannot upgrade XEdit view of handle {self.handle} outside "
+                f"of the manage_handles context it was created in"
+            )
+        return self._source.objectify(self.handle)
+
+    def release(self):
+        """
+        Releases the view's handle right away, rather than along with the rest
+        of its `manage_handles` context.
+        """
+        self._source._xelib.release_handle(self.handle)
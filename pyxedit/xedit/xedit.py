@@ -1,6 +1,15 @@
 from contextlib import contextmanager
+from pathlib import Path
+import time
 
 from pyxedit.xedit.base import XEditBase
+from pyxedit.xedit.conflicts import XEditConflictReport
+from pyxedit.xedit.flags import flags_enum, read_bitmask
+from pyxedit.xedit.load_order import XEditLoadOrder
+from pyxedit.xedit.misc import XEditError
+from pyxedit.xedit.schema import SCHEMA_VERSION, XEditSchema, default_schema_path
+from pyxedit.xedit.reference_index import XEditReferenceIndex
+from pyxedit.xedit.spans import trace_spans
 from pyxedit.xelib import Xelib
 
 
@@ -11,16 +20,45 @@ class XEdit(XEditBase):
         game_path=None,
         plugins=None,
         xeditlib_path=None,
+        backend=None,
     ):
-        self.import_all_object_classes()
         self._xelib = Xelib(
             game_mode=game_mode,
             game_path=game_path,
             plugins=plugins,
             xeditlib_path=xeditlib_path,
+            backend=backend,
         )
         self.handle = 0
         self.auto_release = False
+        self._root = self
+        # record definitions do not change from session to session, so the
+        # schema is kept across sessions, see `load_schema`
+        self.schema = None
+        self.reset_session_state()
+
+    def reset_session_state(self):
+        """
+        Forgets any state accumulated on this object during a session. This
+        is done on entering a new session, since nothing xEdit knew about in
+        the previous session carries over.
+        """
+        # names of plugins xEdit has built "referenced by" information for
+        self._plugins_with_references = set()
+
+        # FormID -> tuple of referencing FormIDs, for records that have been
+        # asked about via `get_referenced_by`
+        self._referenced_by_cache = {}
+
+        # python-side reverse reference index, see `build_reference_index`
+        self.reference_index = None
+
+        # values derived from the definitions xEdit has loaded, which hold
+        # for the whole session; see `XEditBase.session_cached`
+        self._session_cache = {}
+
+        # the model of the loaded files, see `load_order`
+        self._load_order = None
 
     @property
     def game_mode(self):
@@ -40,27 +78,319 @@ class XEdit(XEditBase):
 
     @property
     def plugins(self):
-        return [
-            self.objectify(self._xelib.file_by_index(i))
-            for i in range(self.plugin_count)
-        ]
+        return list(self.load_order.plugins)
 
     @property
     def plugin_count(self):
-        return int(self.xelib.get_global("FileCount"))
+        return len(self.load_order)
 
     @property
     def plugin_names(self):
-        return self.xelib.get_loaded_file_names()
+        return self.load_order.names
+
+    @property
+    def load_order(self):
+        """
+        The model of the files loaded in the session: their names, handles,
+        load order positions, masters, ESM and ESL flags and record counts,
+        as an `XEditLoadOrder` of `PluginInfo` tuples. It is read once, and
+        read again only after files have been added, loaded, unloaded,
+        renamed or nuked, or their masters or ESM and ESL flags have been
+        changed; `plugins`, `plugin_count` and `plugin_names` are answered
+        from it.
+        """
+        load_order = self._load_order
+        if load_order is None or not load_order.is_current:
+            if load_order is not None:
+                load_order.release()
+            load_order = self._load_order = XEditLoadOrder(self)
+        return load_order
 
     @contextmanager
     def session(self, load_plugins=True):
+        self.reset_session_state()
         with self.xelib.session():
             yield self
 
+    def load_schema(self, path=None, rebuild=False, sample=5):
+        """
+        Loads the record schema of the game mode, which describes how the
+        value of each known field of each record signature is read, so that
+        reading fields skips probing their types. See `XEditSchema`.
+
+        The schema is built from the loaded plugins and saved to `path` the
+        first time, or when `rebuild` is set; after that, it is loaded from
+        the file. Since it only describes the records of the plugins it was
+        built from, it is built again when loaded in a session with other
+        plugins loaded. Building it needs a session.
+
+        @param path: the schema file; defaults to a file per game mode and
+                     list of plugins to load under `~/.pyxedit/schemas`
+        @param rebuild: whether to build the schema even if the file exists
+        @param sample: see `XEditSchema.build`
+        @return: the loaded `XEditSchema`
+        """
+        path = (Path(path) if path else
+                default_schema_path(self.game_mode, self.xelib.plugins))
+        schema = None
+        if path.is_file() and not rebuild:
+            schema = XEditSchema.load(path)
+            if (schema.game_mode != self.game_mode or
+                    schema.version != SCHEMA_VERSION or
+                    (self._xelib.loaded and
+                     schema.plugins != self.xelib.get_loaded_file_names())):
+                schema = None
+        if schema is None:
+            if not self._xelib.loaded:
+                raise XEditError(f"No schema at {path}; building one needs an "
+                                 f"xedit session")
+            schema = XEditSchema.build(self, sample=sample)
+            schema.save(path)
+        self.schema = schema
+        return schema
+
+    def trace_spans(self, path=None):
+        """
+        A context manager that records how long calls to the XEdit object
+        methods and the Xelib wrapper methods take while it is active, and
+        writes them to a Chrome trace event file on exit, for viewing in
+        `chrome://tracing` or https://ui.perfetto.dev. See `SpanTracer`.
+
+            with xedit.trace_spans("copy.json"):
+                npc.copy_into(patch)
+
+        @param path: an optional file path to write the trace to
+        @return: the `SpanTracer` recording the spans
+        """
+        return trace_spans(path=path)
+
     def add_file(self, file_name):
         return self.objectify(self.xelib.add_file(file_name))
 
+    def build_references(self, plugins=None, sync=False, progress=None,
+                         poll_interval=0.1):
+        """
+        Builds xEdit's "referenced by" information for the given plugins,
+        skipping any plugin it has already been built for during this session.
+
+        Builds run one plugin at a time. With `sync=False`, each build runs on
+        xEdit's background thread and we poll the loader status until it is
+        done, which lets `progress` report in between plugins.
+
+        @param plugins: a list of plugin objects or plugin names to build
+                        references for; if not given, all loaded plugins
+        @param sync: whether to have xEdit build references synchronously
+        @param progress: an optional callable, invoked as
+                         `progress(num_done, num_total, plugin_name)` after
+                         each plugin is built
+        @param poll_interval: seconds to wait between loader status checks
+                              when building asynchronously
+        @return: the list of plugin names references were built for
+        """
+        if plugins is None:
+            names = self.plugin_names
+        else:
+            names = [plugin if isinstance(plugin, str) else plugin.name
+                     for plugin in plugins]
+
+        pending = [name for name in dict.fromkeys(names)
+                   if name not in self._plugins_with_references]
+
+        for num_done, name in enumerate(pending, start=1):
+            with self.xelib.manage_handles():
+                handle = self.xelib.file_by_name(name)
+                self.xelib.build_references(handle, sync=sync)
+                if not sync:
+                    while (self.xelib.get_loader_status() ==
+                               self.xelib.LoaderStates.Active):
+                        time.sleep(poll_interval)
+            self._plugins_with_references.add(name)
+            if progress:
+                progress(num_done, len(pending), name)
+
+        # newly built plugins may reference records we've already answered
+        # queries for, so those answers are now stale
+        if pending:
+            self._referenced_by_cache.clear()
+
+        return pending
+
+    def read_flags(self, records, path="Record Header\\Record Flags"):
+        """
+        Reads the flags at the given path of many records at once, with a
+        single api call per record, and without creating an object for the
+        flags element of each record. The flag names are looked up once per
+        record signature for the session.
+
+            for npc, flags in zip(npcs, xedit.read_flags(npcs, "ACBS\\Flags")):
+                if flags & flags.Essential:
+                    ...
+
+        @param records: the record objects to read flags of
+        @param path: the path of the flags element under each record
+        @return: a list with the flags of each record, as a value of its
+                 `enum.IntFlag` class (see `XEditFlags.bitmask`), or None for
+                 records that have no flags element at the path
+        """
+        values = []
+        for record in records:
+            key = ("flag_names", record.signature, path)
+            if key not in self._session_cache and not self.xelib.has_element(
+                record.handle, path
+            ):
+                values.append(None)
+                continue
+            flag_names = self.session_cached(
+                key, lambda: tuple(self.xelib.get_all_flags(record.handle, path))
+            )
+            bitmask = read_bitmask(self.xelib, record.handle, flag_names, path)
+            if bitmask is not None:
+                bitmask = flags_enum(flag_names)(bitmask)
+            values.append(bitmask)
+        return values
+
+    def plugins_referencing(self, record):
+        """
+        Returns the names of the plugins that could possibly contain
+        references to the given record; this is the plugin the record is
+        first defined in, plus every plugin that has it as a master. For an
+        override, that is the plugin of its master record, not the
+        override's own plugin.
+
+        @param record: the record object to consider
+        @return: a list of plugin names
+        """
+        with self.xelib.manage_handles():
+            master = self.xelib.get_master_record(record.handle)
+            file_ = self.xelib.get_element_file(master)
+            return [self.xelib.name(file_)] + [
+                self.xelib.name(dependent)
+                for dependent in self.xelib.get_required_by(file_)]
+
+    def get_referenced_by(self, record, progress=None):
+        """
+        Returns the FormIDs of all records referencing the given record.
+
+        References are built lazily; the first time a record is asked about,
+        references are built for only the plugins that could reference it
+        (see `plugins_referencing`) and have not been built yet. Answers are
+        cached for the rest of the session, so asking again is a dictionary
+        lookup.
+
+        @param record: the record object to find references to
+        @param progress: passed on to `build_references` if any plugin needs
+                         its references built
+        @return: a tuple of FormIDs of referencing records; a record whose
+                 master and overrides all reference the given record is only
+                 listed once
+        """
+        form_id = record.form_id
+        referenced_by = self._referenced_by_cache.get(form_id)
+        if referenced_by is None:
+            self.build_references(self.plugins_referencing(record),
+                                  progress=progress)
+            with self.xelib.manage_handles():
+                referenced_by = tuple(dict.fromkeys(
+                    self.xelib.get_form_id(handle)
+                    for handle in self.xelib.get_referenced_by(record.handle)))
+            self._referenced_by_cache[form_id] = referenced_by
+        return referenced_by
+
+    def referenced_by(self, record, progress=None):
+        """
+        Produces an object for each record referencing the given record.
+        See `get_referenced_by`.
+        """
+        for form_id in self.get_referenced_by(record, progress=progress):
+            handle = self.xelib.get_record(0, form_id, ex=False)
+            if handle:
+                yield self.objectify(handle)
+
+    def build_reference_index(self, plugins=None):
+        """
+        Builds a python-side reverse reference index (see
+        `XEditReferenceIndex`) with a single pass over the records of the
+        given plugins, using the same reference fields `XEditBase.references`
+        finds. Override records are included, so a record counts as
+        referencing whatever any of its versions reference.
+
+        Assigning a record to a reference element's `.value` updates the
+        index in place. Any other xelib call that can change references,
+        e.g. `set_links_to`, adding or removing array items or elements,
+        copying records or changing FormIDs, marks it stale, and it is
+        rebuilt from the same plugins the next time it is queried. Setting
+        a reference through `xelib.set_value` is not noticed.
+
+        @param plugins: a list of plugin objects or plugin names to scan; if
+                        not given, all loaded plugins
+        @return: the built index, also available as `self.reference_index`
+        """
+        if plugins is None:
+            plugins = self.plugin_names
+        names = [plugin if isinstance(plugin, str) else plugin.name
+                 for plugin in plugins]
+        index = XEditReferenceIndex.from_pairs(
+            self._iter_reference_pairs(names))
+        index.track(self.xelib, lambda: self._iter_reference_pairs(names))
+        self.reference_index = index
+        return index
+
+    def _iter_reference_pairs(self, plugin_names):
+        """
+        Produces a `(target, referrer)` FormID pair for every non-null
+        reference within the records of the named plugins.
+        """
+        xelib = self.xelib
+        for name in plugin_names:
+            with self.manage_handles():
+                plugin = xelib.file_by_name(name)
+                for handle in xelib.get_records(plugin, include_overrides=True):
+                    record = self.objectify(handle)
+                    referrer = record.form_id
+                    with self.manage_handles():
+                        for reference in record.references:
+                            target = xelib.get_links_to(reference.handle)
+                            if target:
+                                yield xelib.get_form_id(target), referrer
+                    del record
+
+    def iter_conflicts(self, plugins=None, signatures=None,
+                       min_conflict=XEditConflictReport.ConflictAll.Conflict):
+        """
+        Produces a report entry for every conflicting element in the records
+        of the given plugins; see `XEditConflictReport` for what an entry
+        contains.
+
+        @param plugins: a list of plugin objects or plugin names whose records
+                        to check; if not given, all loaded plugins
+        @param signatures: an optional list of record signatures to limit the
+                           check to
+        @param min_conflict: the least severe `ConflictAll` value to report
+        """
+        if plugins is None:
+            plugins = self.plugin_names
+        names = [plugin if isinstance(plugin, str) else plugin.name
+                 for plugin in plugins]
+        report = XEditConflictReport(self.xelib, min_conflict=min_conflict)
+        yield from report.iter_plugins(names, signatures=signatures)
+
+    def conflict_report(self, path, plugins=None, signatures=None,
+                        min_conflict=XEditConflictReport.ConflictAll.Conflict):
+        """
+        Writes a conflict report for the given plugins to disk as JSON lines,
+        one conflicting element per line. Entries are written as they are
+        found, so the report never has to fit in memory. See `iter_conflicts`
+        for the parameters.
+
+        @param path: the file path to write the report to
+        @return: the number of entries written
+        """
+        with open(path, "w", encoding="utf-8") as fp:
+            return XEditConflictReport.write(
+                self.iter_conflicts(plugins=plugins, signatures=signatures,
+                                    min_conflict=min_conflict),
+                fp)
+
     @classmethod
     def quickstart(cls, game=XEditBase.GameModes.SSE, plugins=None):
         """
@@ -0,0 +1,30 @@
+import importlib
+
+from pyxedit.xelib.backends.base import CallStats, InstrumentedAPI, XelibBackend
+from pyxedit.xelib.backends.dll import DLLBackend
+
+# the simulated and trace backends are for tests, benchmarks and debugging,
+# so they are only imported once one of their names is asked for
+LAZY_NAMES = {
+    'RecordingAPI': 'trace',
+    'RecordingBackend': 'trace',
+    'ReplayAPI': 'trace',
+    'ReplayBackend': 'trace',
+    'SimulatedAPI': 'simulated',
+    'SimulatedBackend': 'simulated',
+    'TraceError': 'trace',
+    'read_trace': 'trace',
+}
+
+__all__ = ['CallStats', 'DLLBackend', 'InstrumentedAPI', 'RecordingAPI',
+           'RecordingBackend', 'ReplayAPI', 'ReplayBackend', 'SimulatedAPI',
+           'SimulatedBackend', 'TraceError', 'XelibBackend', 'read_trace']
+
+
+def __getattr__(name):
+    module = LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'{__name__}.{module}'), name)
+    globals()[name] = value
+    return value
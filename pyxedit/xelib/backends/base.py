@@ -0,0 +1,155 @@
+from collections import Counter
+from contextlib import contextmanager
+import time
+
+
+class CallStats:
+    '''
+    Counts of the api calls made while measuring with
+    ``XelibBackend.measure``.
+
+    Attributes:
+        calls (``Counter``):
+            the number of calls made to each api function, by name
+        elapsed (``float``):
+            the wall clock time the measured block took, in seconds
+    '''
+    def __init__(self):
+        self.calls = Counter()
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} {self.total} calls '
+                f'in {self.elapsed:.6f}s>')
+
+    @property
+    def total(self):
+        '''
+        (``int``) the total number of api calls made
+        '''
+        return sum(self.calls.values())
+
+
+class InstrumentedAPI:
+    '''
+    Wraps around a raw api object, counting every call made to each of its
+    functions on the owning backend, and optionally sleeping or spinning for
+    the backend's ``latency`` on each call to simulate the cost of crossing
+    into ``XEditLib.dll``.
+
+    Wrapped functions are cached on the instance the first time they are
+    looked up, so that later lookups don't go through ``__getattr__``.
+    '''
+    def __init__(self, api, backend):
+        self.api = api
+        self.backend = backend
+
+    def __getattr__(self, name):
+        function = getattr(self.api, name)
+        if name.startswith('_') or not callable(function):
+            return function
+
+        counts = self.backend.call_counts
+        latency = self.backend.latency
+
+        if not latency:
+            def instrumented(*args):
+                counts[name] += 1
+                return function(*args)
+        elif latency >= 0.001:
+            def instrumented(*args):
+                counts[name] += 1
+                time.sleep(latency)
+                return function(*args)
+        else:
+            # sleeping is far too coarse for sub-millisecond latencies, so
+            # spin instead
+            def instrumented(*args):
+                counts[name] += 1
+                deadline = time.perf_counter() + latency
+                while time.perf_counter() < deadline:
+                    pass
+                return function(*args)
+
+        setattr(self, name, instrumented)
+        return instrumented
+
+
+class XelibBackend:
+    '''
+    Base class for the backends ``Xelib`` can load its raw api from; see
+    ``DLLBackend`` and ``SimulatedBackend``.
+
+    Subclasses implement ``load_api`` and ``unload_api``. If ``instrument``
+    is set, or a ``latency`` is given, the loaded api is wrapped in an
+    ``InstrumentedAPI`` that counts calls to each api function in
+    ``call_counts``.
+    '''
+    def __init__(self, latency=0.0, instrument=False):
+        '''
+        Args:
+            latency (``float``):
+                seconds to wait on every api call, in addition to the call
+                itself
+            instrument (``bool``):
+                whether to count api calls, even without any latency
+        '''
+        self.latency = latency
+        self.instrument = instrument or bool(latency)
+        self.call_counts = Counter()
+
+    def load(self, dll_path):
+        '''
+        Loads the raw api, wrapping it in an ``InstrumentedAPI`` if this
+        backend is instrumented.
+        '''
+        api = self.load_api(dll_path)
+        if self.instrument:
+            api = InstrumentedAPI(api, self)
+        return api
+
+    def unload(self, api):
+        '''
+        Unloads a raw api previously returned by ``load``.
+        '''
+        if isinstance(api, InstrumentedAPI):
+            api = api.api
+        self.unload_api(api)
+
+    def load_api(self, dll_path):
+        raise NotImplementedError
+
+    def unload_api(self, api):
+        raise NotImplementedError
+
+    @property
+    def total_calls(self):
+        '''
+        (``int``) the total number of api calls counted so far
+        '''
+        return sum(self.call_counts.values())
+
+    def reset_stats(self):
+        self.call_counts.clear()
+
+    @contextmanager
+    def measure(self):
+        '''
+        A context manager that measures the api calls made within it. The
+        backend must be instrumented for calls to be counted.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            with backend.measure() as stats:
+                npc.full_name
+            print(stats.total, stats.calls.most_common(3), stats.elapsed)
+        '''
+        stats = CallStats()
+        before = Counter(self.call_counts)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.elapsed = time.perf_counter() - start
+            stats.calls = self.call_counts - before
@@ -0,0 +1,84 @@
+import ctypes
+
+from pyxedit.xelib.backends.base import XelibBackend
+from pyxedit.xelib.definitions import DelphiTypes, XEditLibSignatures
+
+
+class DLLBackend(XelibBackend):
+    '''
+    The default backend, which loads the real ``XEditLib.dll`` with ctypes.
+    This only works on Windows.
+    '''
+    def load_api(self, dll_path):
+        return self.load_lib(dll_path)
+
+    def unload_api(self, api):
+        from ctypes import wintypes
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.FreeLibrary.argtypes = [wintypes.HMODULE]
+        kernel32.FreeLibrary(api._handle)
+
+    @staticmethod
+    def load_lib(dll_path):
+        '''
+        Loads ``XEditLib.dll`` into python, wrapped in a ``LazyLibrary``,
+        which gives each DLL function its ctypes definitions based on known
+        calling signatures the first time it is used.
+
+        Args:
+            dll_path (``str``):
+                Path to the ``XEditLib.dll`` file
+        Returns:
+            ``LazyLibrary``: handle to the loaded library
+        '''
+        return LazyLibrary(ctypes.CDLL(str(dll_path)))
+
+
+# ctypes prototypes of the XEditLib.dll functions, by name, as
+# (argtypes, restype); built on first use, and kept across sessions
+PROTOTYPES = {}
+
+
+def prototype(name):
+    '''
+    Returns the ctypes ``(argtypes, restype)`` of a ``XEditLib.dll``
+    function, based on its calling signature in ``XEditLibSignatures``.
+    '''
+    try:
+        return PROTOTYPES[name]
+    except KeyError:
+        pass
+    params, return_type = XEditLibSignatures[name].value
+    PROTOTYPES[name] = (
+        [DelphiTypes[type_].value for type_ in params.values()],
+        DelphiTypes[return_type].value if return_type else ctypes.c_int)
+    return PROTOTYPES[name]
+
+
+class LazyLibrary:
+    '''
+    Wraps around the ``ctypes.CDLL`` object for ``XEditLib.dll``, setting the
+    ``argtypes`` and ``restype`` of each of its functions the first time the
+    function is looked up, rather than of all of them when the DLL is loaded.
+    Set up functions are cached on the instance, so later lookups are plain
+    attribute lookups.
+    '''
+    def __init__(self, lib):
+        self.lib = lib
+
+    @property
+    def _handle(self):
+        return self.lib._handle
+
+    def __getattr__(self, name):
+        function = getattr(self.lib, name)
+        if name.startswith('_'):
+            return function
+        try:
+            function.argtypes, function.restype = prototype(name)
+        except KeyError:
+            # not a function we know the signature of; leave it to ctypes'
+            # defaults, as loading the whole library used to
+            pass
+        setattr(self, name, function)
+        return function
@@ -0,0 +1,1492 @@
+import copy
+import ctypes
+import functools
+import heapq
+import re
+
+from pyxedit.xelib.backends.base import XelibBackend
+from pyxedit.xelib.wrapper_methods.elements import (DefTypes,
+                                                    ElementTypes,
+                                                    SmashTypes,
+                                                    ValueTypes)
+from pyxedit.xelib.wrapper_methods.records import ConflictAll, ConflictThis
+from pyxedit.xelib.wrapper_methods.setup import LoaderStates
+
+SUBRECORD_NAME = re.compile(r'^([A-Z0-9_]{4}) - ')
+HEX_FORM_ID = re.compile(r'^[0-9A-Fa-f]{8}$')
+ARRAY_INDEX = re.compile(r'^\[(\d+)\]$')
+REFERENCE_VALUE = re.compile(r'([0-9A-Fa-f]{8})\]?$')
+
+# kind -> (def type, value type, smash type)
+KIND_TYPES = {
+    'file': (None, ValueTypes.Unknown, SmashTypes.Unknown),
+    'group': (None, ValueTypes.Unknown, SmashTypes.Unknown),
+    'record': (DefTypes.Record, ValueTypes.Unknown, SmashTypes.Record),
+    'struct': (DefTypes.Struct, ValueTypes.Struct, SmashTypes.Struct),
+    'union': (DefTypes.Union, ValueTypes.Unknown, SmashTypes.Union),
+    'array': (DefTypes.Array, ValueTypes.Array, SmashTypes.UnsortedArray),
+    'string': (DefTypes.String, ValueTypes.String, SmashTypes.String),
+    'integer': (DefTypes.Integer, ValueTypes.Number, SmashTypes.Integer),
+    'float': (DefTypes.Float, ValueTypes.Number, SmashTypes.Float),
+    'reference': (DefTypes.Integer, ValueTypes.Reference, SmashTypes.Integer),
+    'flags': (DefTypes.Integer, ValueTypes.Flags, SmashTypes.Integer),
+    'enum': (DefTypes.Integer, ValueTypes.Enum, SmashTypes.Integer),
+    'bytes': (DefTypes.ByteArray, ValueTypes.Bytes, SmashTypes.Unknown),
+}
+CONTAINER_KINDS = {'file', 'group', 'record', 'struct', 'union', 'array'}
+
+
+class SimulatedError(Exception):
+    '''
+    An exception raised inside ``SimulatedAPI``; like xedit-lib's own
+    exceptions, it is caught at the api boundary and turned into a failed
+    call with an exception message.
+    '''
+    pass
+
+
+class SimulatedElement:
+    '''
+    A node in the simulated element tree.
+    '''
+    __slots__ = ('name', 'signature', 'element_type', 'kind', 'value',
+                 'children', 'parent', 'modified')
+
+    def __init__(self, name, kind, element_type, value=None, signature='',
+                 parent=None):
+        self.name = name
+        self.kind = kind
+        self.element_type = element_type
+        self.value = value
+        self.signature = signature
+        self.children = [] if kind in CONTAINER_KINDS else None
+        self.parent = parent
+        self.modified = False
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.name}>'
+
+    def add(self, child):
+        child.parent = self
+        self.children.append(child)
+        return child
+
+    def child(self, segment):
+        for child in self.children:
+            if (child.name == segment or child.signature == segment or
+                    child.name.partition(' - ')[2] == segment):
+                return child
+
+    @property
+    def record(self):
+        node = self
+        while node is not None and node.kind != 'record':
+            node = node.parent
+        return node
+
+    @property
+    def file(self):
+        node = self
+        while node is not None and node.kind != 'file':
+            node = node.parent
+        return node
+
+    def local_path(self):
+        names = []
+        node = self
+        while node.parent is not None and node.kind != 'record':
+            if node.parent.kind == 'array':
+                names.append(f'[{node.parent.children.index(node)}]')
+            else:
+                names.append(node.name)
+            node = node.parent
+        return '\\'.join(reversed(names))
+
+
+class SimulatedRecord(SimulatedElement):
+    __slots__ = ('form_id',)
+
+    @property
+    def editor_id(self):
+        edid = self.child('EDID')
+        return edid.value if edid is not None else ''
+
+
+class SimulatedFile(SimulatedElement):
+    __slots__ = ('masters', 'records', 'load_order')
+
+    @property
+    def next_object_id(self):
+        return self.next_object_id_element.value
+
+    @next_object_id.setter
+    def next_object_id(self, value):
+        self.next_object_id_element.value = value
+
+    @property
+    def next_object_id_element(self):
+        return self.children[0].child('HEDR - Header').child('Next Object ID')
+
+
+def exported(function):
+    '''
+    Marks a ``SimulatedAPI`` method as an api function. Like the functions
+    exported by xedit-lib, any exception is turned into a ``False`` result,
+    with its message available through ``GetExceptionMessage``. Functions
+    returning nothing succeed with ``True``.
+    '''
+    @functools.wraps(function)
+    def wrapper(self, *args):
+        try:
+            result = function(self, *args)
+        except Exception as e:
+            self._exception_message = f'{e.__class__.__name__}: {e}'
+            return False
+        return True if result is None else result
+    return wrapper
+
+
+def out(ref, value):
+    '''
+    Writes a value to an output parameter passed in with ``ctypes.byref``.
+    '''
+    ref._obj.value = value
+
+
+def arg(value):
+    '''
+    Returns the python value of an argument that may have been passed as a
+    ctypes instance.
+    '''
+    return getattr(value, 'value', value)
+
+
+class SimulatedAPI:
+    '''
+    A pure python, in-memory stand-in for ``XEditLib.dll``, implementing its
+    core functions over a tree of ``SimulatedElement`` objects built from a
+    fixture description (see ``SimulatedBackend``). Functions follow the
+    dll's calling conventions exactly, including output parameters and the
+    result string, array and bytes protocol, so that the ``Xelib`` wrapper
+    methods run against it unchanged.
+
+    Functions that are not simulated raise ``NotImplementedError`` when
+    called, rather than silently succeeding.
+    '''
+    def __init__(self, fixture):
+        self.fixture = fixture
+        self.root = SimulatedElement('', 'root', None)
+        self.root.children = []
+        self.handles = {}
+        self.next_handle = 1
+        # like XEditLib.dll, reissue the ids of released handles, lowest
+        # first, before handing out new ones
+        self.free_handles = []
+        self.nodes = {}
+        self.records = {}  # global FormID -> versions, in load order
+        self.globals = {'AppName': 'XEdit', 'Version': 'simulated',
+                        'GameName': 'Skyrim', 'DataPath': '',
+                        'ProgramPath': ''}
+        self.game_mode = None
+        self.game_path = ''
+        self.loader_status = LoaderStates.Inactive
+        self.messages = []
+        self._exception_message = ''
+        self._result_string = ''
+        self._result_array = []
+        self._result_bytes = b''
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def not_implemented(*args):
+            raise NotImplementedError(f'{name} is not simulated')
+        return not_implemented
+
+    # handles and the result protocol
+    def handle_for(self, node):
+        if node is self.root:
+            return 0
+        if self.free_handles:
+            handle = heapq.heappop(self.free_handles)
+        else:
+            handle = self.next_handle
+            self.next_handle += 1
+        self.handles[handle] = node
+        return handle
+
+    def free_handle(self, handle):
+        del self.handles[handle]
+        heapq.heappush(self.free_handles, handle)
+
+    def free_all_handles(self):
+        for handle in list(self.handles):
+            self.free_handle(handle)
+
+    def node(self, id_):
+        id_ = arg(id_)
+        if id_ == 0:
+            return self.root
+        try:
+            return self.handles[id_]
+        except KeyError:
+            raise SimulatedError(f'Failed to resolve handle {id_}') from None
+
+    def resolve(self, id_, path=''):
+        node = self.node(id_)
+        return self.resolve_path(node, path) if path else node
+
+    def resolve_path(self, node, path):
+        for segment in path.split('\\'):
+            if not segment:
+                continue
+            node = self.resolve_segment(node, segment)
+            if node is None:
+                raise SimulatedError(f'Failed to resolve path {path}')
+        return node
+
+    def resolve_segment(self, node, segment):
+        if node.children is None:
+            return None
+        if node is self.root:
+            lowered = segment.lower()
+            return next((f for f in node.children
+                         if f.name.lower() == lowered), None)
+        match = ARRAY_INDEX.match(segment)
+        if match:
+            index = int(match.group(1))
+            return node.children[index] if index < len(node.children) else None
+        if node.kind in ('file', 'group') and HEX_FORM_ID.match(segment):
+            file_ = node.file
+            record = file_.records.get(int(segment, 16))
+            if record is not None and (node.kind == 'file' or
+                                       record.parent is node):
+                return record
+            return None
+        child = node.child(segment)
+        if child is None and node.kind == 'group':
+            child = next((r for r in node.children
+                          if r.editor_id == segment), None)
+        return child
+
+    def string_result(self, len_, value):
+        self._result_string = value
+        out(len_, len(value))
+
+    def array_result(self, len_, nodes):
+        self._result_array = [self.handle_for(node) for node in nodes]
+        out(len_, len(self._result_array))
+
+    def bytes_result(self, value):
+        self._result_bytes = value
+
+    def GetResultString(self, buffer, max_len):
+        buffer.value = self._result_string[:arg(max_len)]
+        return True
+
+    def GetResultArray(self, buffer, max_len):
+        for i, handle in enumerate(self._result_array[:arg(max_len)]):
+            buffer[i] = handle
+        return True
+
+    def GetResultBytes(self, buffer, max_len):
+        data = self._result_bytes[:arg(max_len)]
+        ctypes.memmove(buffer, data, len(data))
+        return True
+
+    # messages
+    @exported
+    def GetMessagesLength(self, len_):
+        self.string_result(len_, '\n'.join(self.messages))
+
+    def GetMessages(self, buffer, max_len):
+        self.messages.clear()
+        return self.GetResultString(buffer, max_len)
+
+    def ClearMessages(self):
+        self.messages.clear()
+
+    @exported
+    def GetExceptionMessageLength(self, len_):
+        self.string_result(len_, self._exception_message)
+
+    def GetExceptionMessage(self, buffer, max_len):
+        self._exception_message = ''
+        return self.GetResultString(buffer, max_len)
+
+    @exported
+    def GetExceptionStackLength(self, len_):
+        self.string_result(len_, '')
+
+    def GetExceptionStack(self, buffer, max_len):
+        return self.GetResultString(buffer, max_len)
+
+    # meta
+    @exported
+    def InitXEdit(self):
+        self.messages.append('XEditLib (simulated) initialized')
+
+    @exported
+    def CloseXEdit(self):
+        self.free_all_handles()
+        self.nodes.clear()
+
+    @exported
+    def GetGlobal(self, key, len_):
+        if key == 'FileCount':
+            value = str(len(self.root.children))
+        else:
+            value = self.globals[key]
+        self.string_result(len_, value)
+
+    @exported
+    def GetGlobals(self, len_):
+        values = dict(self.globals, FileCount=str(len(self.root.children)))
+        self.string_result(len_, '\r\n'.join(f'{key}={value}'
+                                             for key, value in values.items()))
+
+    @exported
+    def Release(self, id_):
+        if arg(id_) not in self.handles:
+            raise SimulatedError(f'Failed to release handle {id_}')
+        self.free_handle(arg(id_))
+
+    @exported
+    def ReleaseNodes(self, id_):
+        if self.nodes.pop(arg(id_), None) is None:
+            raise SimulatedError(f'Failed to release nodes {id_}')
+
+    @exported
+    def ResetStore(self):
+        self.free_all_handles()
+
+    @exported
+    def CleanStore(self):
+        pass
+
+    @exported
+    def SetSortMode(self, mode, reverse):
+        pass
+
+    # setup
+    @exported
+    def SetGameMode(self, mode):
+        self.game_mode = mode
+
+    @exported
+    def SetGamePath(self, path):
+        self.game_path = path
+
+    @exported
+    def GetGamePath(self, mode, len_):
+        self.string_result(len_, self.game_path)
+
+    @exported
+    def GetLoadOrder(self, len_):
+        self.string_result(len_, '\r\n'.join(f['name'] for f in
+                                             self.fixture.get('files', [])))
+
+    @exported
+    def GetActivePlugins(self, len_):
+        self.GetLoadOrder(len_)
+
+    @exported
+    def LoadPlugins(self, load_order, smart_load, use_dummies):
+        names = [name for name in load_order.splitlines() if name]
+        fixtures = {f['name'].lower(): f for f in self.fixture.get('files', [])}
+
+        # masters are loaded first, and smart loading adds missing ones
+        ordered = []
+
+        def visit(name):
+            spec = fixtures.get(name.lower())
+            if spec is None:
+                raise SimulatedError(f'{name} is not in the fixture')
+            if spec in ordered or self.file_by_name(name) is not None:
+                return
+            for master in spec.get('masters', []):
+                if smart_load or master.lower() in map(str.lower, names):
+                    visit(master)
+            ordered.append(spec)
+
+        for name in names:
+            visit(name)
+        for spec in ordered:
+            self.load_file(spec)
+        self.loader_status = LoaderStates.Done
+
+    @exported
+    def LoadPlugin(self, file_name):
+        self.LoadPlugins(file_name, True, False)
+
+    @exported
+    def GetLoaderStatus(self, status):
+        out(status, self.loader_status.value)
+
+    @exported
+    def UnloadPlugin(self, id_):
+        file_ = self.node(id_)
+        self.root.children.remove(file_)
+        for records in self.records.values():
+            records[:] = [r for r in records if r.file is not file_]
+        self.reindex_load_order()
+
+    @exported
+    def BuildReferences(self, id_, sync):
+        pass
+
+    # building the element tree
+    def load_file(self, spec):
+        file_ = self.new_file(spec['name'], spec.get('masters', []),
+                              spec.get('author', ''))
+        for record_spec in spec.get('records', []):
+            self.add_record(file_, record_spec)
+
+    def new_file(self, name, masters=(), author=''):
+        file_ = SimulatedFile(name, 'file', ElementTypes.File, signature='TES4')
+        file_.masters = []
+        for master in masters:
+            master_file = self.file_by_name(master)
+            if master_file is None:
+                raise SimulatedError(f'Master {master} of {name} is not loaded')
+            file_.masters.append(master_file)
+        file_.records = {}
+        file_.load_order = len(self.root.children)
+
+        header = file_.add(SimulatedRecord(
+            'File Header', 'record', ElementTypes.MainRecord,
+            signature='TES4'))
+        header.form_id = 0
+        self.add_elements(header, {
+            'Record Header': {'Record Flags': {'$flags': {
+                'ESM': name.lower().endswith('.esm'),
+                'Localized': False,
+                'ESL': name.lower().endswith('.esl')}}},
+            'HEDR - Header': {'Version': 1.71,
+                              'Number of Records': 0,
+                              'Next Object ID': 0x800},
+            'CNAM - Author': author,
+            'Master Files': [{'MAST - Filename': m} for m in masters],
+        })
+        self.root.add(file_)
+        return file_
+
+    def file_by_name(self, name):
+        lowered = name.lower()
+        return next((f for f in self.root.children
+                     if f.name.lower() == lowered), None)
+
+    def reindex_load_order(self):
+        for index, file_ in enumerate(self.root.children):
+            file_.load_order = index
+
+    def global_form_id(self, file_, native_form_id):
+        index = native_form_id >> 24
+        origin = file_.masters[index] if index < len(file_.masters) else file_
+        return (origin.load_order << 24) | (native_form_id & 0xFFFFFF)
+
+    def native_form_id(self, file_, form_id):
+        origin = self.root.children[form_id >> 24]
+        index = (file_.masters.index(origin) if origin in file_.masters
+                 else len(file_.masters))
+        return (index << 24) | (form_id & 0xFFFFFF)
+
+    def group(self, file_, signature, create=True):
+        for child in file_.children:
+            if child.kind == 'group' and child.signature == signature:
+                return child
+        if create:
+            return file_.add(SimulatedElement(
+                f'GRUP Top "{signature}"', 'group', ElementTypes.GroupRecord,
+                signature=signature))
+
+    def add_record(self, file_, spec):
+        spec = dict(spec)
+        signature = spec.pop('$signature')
+        form_id = self.global_form_id(file_, spec.pop('$form_id'))
+        record = SimulatedRecord(spec.get('EDID - Editor ID', ''), 'record',
+                                 ElementTypes.MainRecord, signature=signature)
+        record.form_id = form_id
+        self.add_elements(record, {
+            'Record Header': {
+                'Signature': signature,
+                'Data Size': 0,
+                'Record Flags': {'$flags': spec.pop('$record_flags', {})},
+                'FormID': {'$ref': form_id, '$global': True},
+                'Form Version': 44,
+            },
+        })
+        self.add_elements(record, spec, file_)
+        self.insert_record(file_, record)
+        return record
+
+    def insert_record(self, file_, record):
+        self.group(file_, record.signature).add(record)
+        file_.records[record.form_id] = record
+        versions = self.records.setdefault(record.form_id, [])
+        versions.append(record)
+        versions.sort(key=lambda r: r.file.load_order)
+
+    def add_elements(self, parent, specs, file_=None):
+        for name, spec in specs.items():
+            self.add_element(parent, name, spec, file_)
+
+    def add_element(self, parent, name, spec, file_=None):
+        match = SUBRECORD_NAME.match(name)
+        signature = match.group(1) if match else ''
+        subrecord = bool(match) and parent.kind == 'record'
+
+        if isinstance(spec, dict) and '$ref' in spec:
+            form_id = spec['$ref']
+            if form_id and file_ is not None and not spec.get('$global'):
+                form_id = self.global_form_id(file_, form_id)
+            kind, value = 'reference', form_id
+        elif isinstance(spec, dict) and '$flags' in spec:
+            flags = spec['$flags']
+            if not isinstance(flags, dict):
+                flags = {flag: True for flag in flags}
+            kind, value = 'flags', dict(flags)
+        elif isinstance(spec, dict) and '$enum' in spec:
+            options = spec['$options']
+            if not isinstance(options, dict):
+                options = dict(enumerate(options))
+            value = next(value for value, name in options.items()
+                         if name == spec['$enum'])
+            kind, value = 'enum', (options, value)
+        elif isinstance(spec, dict) and '$union' in spec:
+            kind, value = 'union', None
+        elif isinstance(spec, dict):
+            kind, value = 'struct', None
+        elif isinstance(spec, (list, tuple)):
+            kind, value = 'array', None
+        elif isinstance(spec, bytes):
+            kind, value = 'bytes', spec
+        elif isinstance(spec, float):
+            kind, value = 'float', spec
+        elif isinstance(spec, int):
+            kind, value = 'integer', int(spec)
+        else:
+            kind, value = 'string', str(spec)
+
+        if kind == 'struct':
+            element_type = (ElementTypes.SubRecordStruct if subrecord
+                            else ElementTypes.Struct)
+        elif kind == 'array':
+            element_type = (ElementTypes.SubRecordArray if subrecord
+                            else ElementTypes.Array)
+        elif kind == 'union':
+            element_type = (ElementTypes.SubRecordUnion if subrecord
+                            else ElementTypes.Union)
+        else:
+            element_type = (ElementTypes.SubRecord if subrecord
+                            else ElementTypes.Value)
+
+        element = parent.add(SimulatedElement(name, kind, element_type,
+                                              value=value, signature=signature))
+        if kind == 'struct':
+            self.add_elements(element, spec, file_)
+        elif kind == 'union':
+            self.add_elements(element, spec['$union'], file_)
+        elif kind == 'array':
+            item_name = name.partition(' - ')[2] or name
+            for item in spec:
+                self.add_element(element, item_name, item, file_)
+        return element
+
+    # files
+    @exported
+    def FileByName(self, file_name, res):
+        file_ = self.file_by_name(file_name)
+        if file_ is None:
+            raise SimulatedError(f'Failed to find file {file_name}')
+        out(res, self.handle_for(file_))
+
+    @exported
+    def FileByIndex(self, index, res):
+        out(res, self.handle_for(self.root.children[index]))
+
+    @exported
+    def FileByLoadOrder(self, load_order, res):
+        self.FileByIndex(load_order, res)
+
+    @exported
+    def GetFileLoadOrder(self, id_, res):
+        out(res, self.node(id_).load_order)
+
+    @exported
+    def AddFile(self, file_name, ignore_exists, res):
+        file_ = self.file_by_name(file_name)
+        if file_ is None:
+            file_ = self.new_file(file_name)
+        elif not ignore_exists:
+            raise SimulatedError(f'File {file_name} already exists')
+        out(res, self.handle_for(file_))
+
+    @exported
+    def NukeFile(self, id_):
+        file_ = self.node(id_)
+        for record in list(file_.records.values()):
+            self.remove_record(record)
+        file_.children[1:] = []
+
+    @exported
+    def RenameFile(self, id_, new_file_name):
+        self.node(id_).name = new_file_name
+
+    @exported
+    def GetRecordCount(self, id_, res):
+        out(res, len(self.node(id_).records))
+
+    @exported
+    def GetOverrideRecordCount(self, id_, res):
+        file_ = self.node(id_)
+        out(res, sum(1 for r in file_.records.values()
+                     if self.records[r.form_id][0] is not r))
+
+    # masters
+    @exported
+    def AddMaster(self, id_, file_name):
+        file_ = self.node(id_)
+        master = self.file_by_name(file_name)
+        if master is None:
+            raise SimulatedError(f'{file_name} is not loaded')
+        if master is not file_ and master not in file_.masters:
+            file_.masters.append(master)
+            masters = file_.children[0].child('Master Files')
+            self.add_element(masters, 'Master File',
+                             {'MAST - Filename': master.name})
+
+    @exported
+    def AddMasters(self, id_, masters):
+        for file_name in masters.splitlines():
+            if file_name:
+                self.AddMaster(id_, file_name)
+
+    @exported
+    def AddRequiredMasters(self, id_, id2, as_new):
+        file_ = self.node(id2)
+        required = set()
+        for node in self.walk(self.node(id_)):
+            if node.kind == 'record':
+                required.add(self.records[node.form_id][0].file)
+            elif node.kind == 'reference' and node.value:
+                required.add(self.root.children[node.value >> 24])
+        for master in sorted(required, key=lambda f: f.load_order):
+            if master is not file_:
+                self.AddMaster(id2, master.name)
+
+    @exported
+    def CleanMasters(self, id_):
+        file_ = self.node(id_)
+        required = set()
+        for record in file_.records.values():
+            required.add(self.records[record.form_id][0].file)
+            for node in self.walk(record):
+                if node.kind == 'reference' and node.value:
+                    required.add(self.root.children[node.value >> 24])
+        unused = [m for m in file_.masters if m not in required]
+        if not unused:
+            return
+        file_.masters[:] = [m for m in file_.masters if m in required]
+        names = {m.name for m in unused}
+        masters = file_.children[0].child('Master Files')
+        masters.children[:] = [
+            c for c in masters.children
+            if c.child('MAST - Filename').value not in names]
+        self.mark_modified(masters)
+
+    @exported
+    def GetMasters(self, id_, len_):
+        self.array_result(len_, self.node(id_).masters)
+
+    @exported
+    def GetRequiredBy(self, id_, len_):
+        file_ = self.node(id_)
+        self.array_result(len_, [f for f in self.root.children
+                                 if file_ in f.masters])
+
+    @exported
+    def GetMasterNames(self, id_, len_):
+        self.string_result(len_, '\r\n'.join(m.name for m in
+                                             self.node(id_).masters))
+
+    # elements
+    def walk(self, node):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.children:
+                stack.extend(reversed(node.children))
+
+    @exported
+    def HasElement(self, id_, path, res):
+        try:
+            self.resolve(id_, path)
+        except SimulatedError:
+            out(res, False)
+        else:
+            out(res, True)
+
+    @exported
+    def GetElement(self, id_, path, res):
+        out(res, self.handle_for(self.resolve(id_, path)))
+
+    @exported
+    def AddElement(self, id_, path, res):
+        node = self.node(id_)
+        for segment in path.split('\\'):
+            if not segment:
+                continue
+            child = self.resolve_segment(node, segment)
+            if child is None:
+                if node.kind == 'array' and segment == '.':
+                    template = node.children[0] if node.children else None
+                    child = (copy_element(template) if template is not None
+                             else SimulatedElement(node.name, 'string',
+                                                   ElementTypes.Value, ''))
+                    node.add(child)
+                else:
+                    child = self.add_element(node, segment, '', node.file)
+                self.mark_modified(child)
+            node = child
+        out(res, self.handle_for(node))
+
+    @exported
+    def AddElementValue(self, id_, path, value, res):
+        handle = ctypes.c_uint()
+        if not self.AddElement(id_, path, ctypes.byref(handle)):
+            raise SimulatedError(self._exception_message)
+        self.set_value(self.handles[handle.value], value)
+        out(res, handle.value)
+
+    @exported
+    def RemoveElement(self, id_, path):
+        node = self.resolve(id_, path)
+        if node.kind == 'record':
+            self.remove_record(node)
+        else:
+            self.mark_modified(node.parent)
+            node.parent.children.remove(node)
+
+    @exported
+    def RemoveElementOrParent(self, id_):
+        self.RemoveElement(id_, '')
+
+    def remove_record(self, record):
+        record.parent.children.remove(record)
+        record.file.records.pop(record.form_id, None)
+        versions = self.records.get(record.form_id, [])
+        if record in versions:
+            versions.remove(record)
+
+    @exported
+    def GetElements(self, id_, path, sort, filter, sparse, len_):
+        self.array_result(len_, self.resolve(id_, path).children or [])
+
+    @exported
+    def GetLinksTo(self, id_, path, res):
+        node = self.resolve(id_, path)
+        if node.kind != 'reference':
+            raise SimulatedError(f'{node.name} is not a reference')
+        versions = self.records.get(node.value)
+        if not versions:
+            raise SimulatedError(f'Failed to resolve [{node.value:08X}]')
+        out(res, self.handle_for(versions[0]))
+
+    @exported
+    def SetLinksTo(self, id_, path, id2):
+        node = self.resolve(id_, path)
+        if node.kind != 'reference':
+            raise SimulatedError(f'{node.name} is not a reference')
+        node.value = self.node(id2).form_id
+        self.mark_modified(node)
+
+    @exported
+    def GetContainer(self, id_, res):
+        node = self.node(id_)
+        if node.parent is None:
+            raise SimulatedError(f'{node.name} has no container')
+        out(res, self.handle_for(node.parent))
+
+    @exported
+    def GetElementFile(self, id_, res):
+        out(res, self.handle_for(self.node(id_).file))
+
+    @exported
+    def GetElementGroup(self, id_, res):
+        out(res, self.handle_for(self.node(id_).record.parent))
+
+    @exported
+    def GetElementRecord(self, id_, res):
+        record = self.node(id_).record
+        if record is None:
+            raise SimulatedError('Element is not in a record')
+        out(res, self.handle_for(record))
+
+    @exported
+    def ElementCount(self, id_, res):
+        out(res, len(self.node(id_).children or ()))
+
+    @exported
+    def ElementEquals(self, id_, id2, res):
+        out(res, self.node(id_) is self.node(id2))
+
+    @exported
+    def CopyElement(self, id_, id2, as_new, res):
+        source = self.node(id_)
+        file_ = self.node(id2)
+        if source.kind != 'record':
+            raise SimulatedError('Only records can be copied')
+        record = copy_element(source)
+        if as_new:
+            record.form_id = (file_.load_order << 24) | file_.next_object_id
+            file_.next_object_id += 1
+            record.child('Record Header').child('FormID').value = record.form_id
+        elif record.form_id in file_.records:
+            raise SimulatedError(f'{file_.name} already has {record.form_id:08X}')
+        self.insert_record(file_, record)
+        self.mark_modified(record)
+        out(res, self.handle_for(record))
+
+    @exported
+    def GetIsModified(self, id_, res):
+        out(res, self.node(id_).modified)
+
+    @exported
+    def GetIsEditable(self, id_, res):
+        out(res, True)
+
+    @exported
+    def GetIsRemoveable(self, id_, res):
+        out(res, self.node(id_).name != 'Record Header')
+
+    @exported
+    def GetCanAdd(self, id_, res):
+        out(res, self.node(id_).kind in ('array', 'struct', 'record'))
+
+    @exported
+    def IsSorted(self, id_, res):
+        out(res, False)
+
+    @exported
+    def IsFixed(self, id_, res):
+        out(res, False)
+
+    def mark_modified(self, node):
+        while node is not None:
+            node.modified = True
+            node = node.parent
+
+    # arrays
+    def find_array_item(self, id_, path, subpath, value):
+        array = self.resolve(id_, path)
+        for item in array.children:
+            node = self.resolve_path(item, subpath) if subpath else item
+            if self.value_matches(node, value):
+                return item
+
+    def value_matches(self, node, value):
+        if node.kind == 'reference':
+            match = REFERENCE_VALUE.search(value)
+            return bool(match) and int(match.group(1), 16) == node.value
+        return self.get_value(node) == value
+
+    @exported
+    def HasArrayItem(self, id_, path, subpath, value, res):
+        out(res, self.find_array_item(id_, path, subpath, value) is not None)
+
+    @exported
+    def GetArrayItem(self, id_, path, subpath, value, res):
+        item = self.find_array_item(id_, path, subpath, value)
+        if item is None:
+            raise SimulatedError(f'Failed to find array item {value}')
+        out(res, self.handle_for(item))
+
+    @exported
+    def AddArrayItem(self, id_, path, subpath, value, res):
+        array = self.resolve(id_, path)
+        if array.kind != 'array':
+            raise SimulatedError(f'{array.name} is not an array')
+        if array.children:
+            item = copy_element(array.children[-1])
+        else:
+            item = SimulatedElement(array.name.partition(' - ')[2] or array.name,
+                                    'string', ElementTypes.Value, '')
+        array.add(item)
+        if value:
+            self.set_value(self.resolve_path(item, subpath) if subpath
+                           else item, value)
+        self.mark_modified(item)
+        out(res, self.handle_for(item))
+
+    @exported
+    def RemoveArrayItem(self, id_, path, subpath, value):
+        item = self.find_array_item(id_, path, subpath, value)
+        if item is not None:
+            self.mark_modified(item.parent)
+            item.parent.children.remove(item)
+
+    @exported
+    def MoveArrayItem(self, id_, index):
+        node = self.node(id_)
+        siblings = node.parent.children
+        siblings.remove(node)
+        siblings.insert(index, node)
+
+    # element types
+    @exported
+    def ElementType(self, id_, res):
+        out(res, self.node(id_).element_type.value)
+
+    @exported
+    def DefType(self, id_, res):
+        def_type = KIND_TYPES[self.node(id_).kind][0]
+        if def_type is None:
+            raise SimulatedError('Element has no def')
+        out(res, def_type.value)
+
+    @exported
+    def SmashType(self, id_, res):
+        out(res, KIND_TYPES[self.node(id_).kind][2].value)
+
+    @exported
+    def ValueType(self, id_, res):
+        out(res, KIND_TYPES[self.node(id_).kind][1].value)
+
+    # names and paths
+    def display_name(self, node):
+        if node.kind == 'record':
+            full = node.child('FULL')
+            name = node.editor_id
+            if full is not None:
+                name = f'{name} "{full.value}"'
+            return f'{name} [{node.signature}:{node.form_id:08X}]'
+        return node.name
+
+    @exported
+    def Name(self, id_, len_):
+        node = self.node(id_)
+        if node.kind == 'record':
+            full = node.child('FULL')
+            name = full.value if full is not None else node.editor_id
+        else:
+            name = node.name
+        self.string_result(len_, name)
+
+    @exported
+    def LongName(self, id_, len_):
+        self.string_result(len_, self.display_name(self.node(id_)))
+
+    @exported
+    def DisplayName(self, id_, len_):
+        self.string_result(len_, self.display_name(self.node(id_)))
+
+    @exported
+    def Path(self, id_, short, local, sort, len_):
+        node = self.node(id_)
+        record = node.record
+        if local:
+            if record is None:
+                raise SimulatedError('Element is not in a record')
+            path = node.local_path()
+        elif node.kind == 'file':
+            path = node.name
+        elif node.kind == 'group':
+            path = f'{node.parent.name}\\{node.signature}'
+        elif record is None:
+            path = f'{node.file.name}\\{node.local_path()}'
+        elif not record.form_id:
+            path = f'{record.file.name}\\{node.local_path() or record.name}'
+        else:
+            if short:
+                record_path = f'{record.file.name}\\{record.form_id:08X}'
+            else:
+                record_path = (f'{record.file.name}\\{record.signature}\\'
+                               f'{record.form_id:08X}')
+            local_path = node.local_path()
+            path = f'{record_path}\\{local_path}' if local_path else record_path
+        self.string_result(len_, path)
+
+    @exported
+    def PathName(self, id_, sort, len_):
+        self.string_result(len_, self.node(id_).name)
+
+    @exported
+    def Signature(self, id_, len_):
+        node = self.node(id_)
+        if not node.signature:
+            raise SimulatedError(f'{node.name} does not have a signature')
+        self.string_result(len_, node.signature)
+
+    @exported
+    def NameFromSignature(self, sig, len_):
+        self.string_result(len_, self.signature_names()[sig])
+
+    @exported
+    def SignatureFromName(self, name, len_):
+        names = {value: key for key, value in self.signature_names().items()}
+        self.string_result(len_, names[name])
+
+    @exported
+    def GetSignatureNameMap(self, len_):
+        self.string_result(len_, '\r\n'.join(
+            f'{key}={value}' for key, value in self.signature_names().items()))
+
+    def signature_names(self):
+        return self.fixture.get('signature_names', {})
+
+    # values
+    def get_value(self, node):
+        kind = node.kind
+        if kind in ('string', 'integer'):
+            return str(node.value)
+        if kind == 'float':
+            return f'{node.value:.6f}'
+        if kind == 'reference':
+            versions = self.records.get(node.value)
+            if not versions:
+                return f'NULL - Null Reference [{node.value:08X}]'
+            return self.display_name(versions[0])
+        if kind == 'flags':
+            return ''.join('1' if state else '0'
+                           for state in node.value.values())
+        if kind == 'enum':
+            options, value = node.value
+            return options.get(value, f'<Unknown: {value}>')
+        if kind == 'bytes':
+            return ' '.join(f'{byte:02X}' for byte in node.value)
+        return ''
+
+    def set_value(self, node, value):
+        kind = node.kind
+        if kind == 'string':
+            node.value = value
+        elif kind == 'integer':
+            node.value = int(value)
+        elif kind == 'float':
+            node.value = float(value)
+        elif kind == 'reference':
+            match = REFERENCE_VALUE.search(value)
+            node.value = int(match.group(1), 16) if match else 0
+        elif kind == 'flags':
+            for flag, bit in zip(node.value, value.ljust(len(node.value), '0')):
+                node.value[flag] = bit == '1'
+        elif kind == 'enum':
+            options = node.value[0]
+            value = next((option for option, name in options.items()
+                          if name == value), value)
+            if value not in options:
+                raise SimulatedError(f'{value} is not an option of {node.name}')
+            node.value = (options, value)
+        elif kind == 'bytes':
+            node.value = bytes.fromhex(value)
+        else:
+            raise SimulatedError(f'Cannot set the value of {node.name}')
+        self.mark_modified(node)
+
+    def get_int(self, node):
+        if node.kind == 'integer':
+            return node.value
+        if node.kind == 'reference':
+            # like xEdit, references read their FormID as stored in the file
+            return node.value and self.native_form_id(node.file, node.value)
+        if node.kind == 'float':
+            return int(node.value)
+        if node.kind == 'flags':
+            return sum(1 << bit for bit, state in enumerate(node.value.values())
+                       if state)
+        if node.kind == 'enum':
+            return node.value[1]
+        if node.kind == 'string':
+            return int(node.value)
+        raise SimulatedError(f'{node.name} does not have a numeric value')
+
+    def set_int(self, node, value):
+        if node.kind == 'flags':
+            for bit, flag in enumerate(node.value):
+                node.value[flag] = bool(value & (1 << bit))
+        elif node.kind == 'enum':
+            node.value = (node.value[0], value)
+        elif node.kind == 'float':
+            node.value = float(value)
+        elif node.kind == 'string':
+            node.value = str(value)
+        elif node.kind == 'integer':
+            node.value = value
+        elif node.kind == 'reference':
+            node.value = value and self.global_form_id(node.file, value)
+        else:
+            raise SimulatedError(f'{node.name} does not have a numeric value')
+        self.mark_modified(node)
+
+    @exported
+    def GetValue(self, id_, path, len_):
+        self.string_result(len_, self.get_value(self.resolve(id_, path)))
+
+    @exported
+    def SetValue(self, id_, path, value):
+        self.set_value(self.resolve(id_, path), value)
+
+    @exported
+    def GetIntValue(self, id_, path, res):
+        out(res, self.get_int(self.resolve(id_, path)))
+
+    @exported
+    def SetIntValue(self, id_, path, value):
+        self.set_int(self.resolve(id_, path), value)
+
+    @exported
+    def GetUIntValue(self, id_, path, res):
+        out(res, self.get_int(self.resolve(id_, path)) & 0xFFFFFFFF)
+
+    @exported
+    def SetUIntValue(self, id_, path, value):
+        self.set_int(self.resolve(id_, path), value)
+
+    @exported
+    def GetFloatValue(self, id_, path, res):
+        node = self.resolve(id_, path)
+        if node.kind not in ('float', 'integer'):
+            raise SimulatedError(f'{node.name} does not have a numeric value')
+        out(res, float(node.value))
+
+    @exported
+    def SetFloatValue(self, id_, path, value):
+        node = self.resolve(id_, path)
+        if node.kind not in ('float', 'integer'):
+            raise SimulatedError(f'{node.name} does not have a numeric value')
+        node.value = float(value) if node.kind == 'float' else int(value)
+        self.mark_modified(node)
+
+    def flags(self, id_, path):
+        node = self.resolve(id_, path)
+        if node.kind != 'flags':
+            raise SimulatedError(f'{node.name} is not a flags element')
+        return node
+
+    @exported
+    def GetFlag(self, id_, path, name, res):
+        node = self.flags(id_, path)
+        if name not in node.value:
+            raise SimulatedError(f'{node.name} has no flag {name}')
+        out(res, node.value[name])
+
+    @exported
+    def SetFlag(self, id_, path, name, state):
+        node = self.flags(id_, path)
+        if name not in node.value:
+            raise SimulatedError(f'{node.name} has no flag {name}')
+        node.value[name] = bool(state)
+        self.mark_modified(node)
+
+    @exported
+    def GetAllFlags(self, id_, path, len_):
+        self.string_result(len_, ','.join(self.flags(id_, path).value))
+
+    @exported
+    def GetEnabledFlags(self, id_, path, len_):
+        node = self.flags(id_, path)
+        self.string_result(len_, ','.join(flag for flag, state
+                                          in node.value.items() if state))
+
+    @exported
+    def SetEnabledFlags(self, id_, path, flags):
+        node = self.flags(id_, path)
+        enabled = set(flags.split(',')) if flags else set()
+        for flag in node.value:
+            node.value[flag] = flag in enabled
+        self.mark_modified(node)
+
+    @exported
+    def GetEnumOptions(self, id_, path, len_):
+        node = self.resolve(id_, path)
+        self.string_result(len_, ','.join(name for _, name in
+                                          sorted(node.value[0].items()))
+                           if node.kind == 'enum' else '')
+
+    # records
+    def record(self, id_):
+        record = self.node(id_)
+        if record.kind != 'record' or not hasattr(record, 'form_id'):
+            raise SimulatedError(f'{record.name} is not a record')
+        return record
+
+    @exported
+    def GetFormID(self, id_, res, native):
+        record = self.record(id_)
+        form_id = record.form_id
+        if native:
+            form_id = self.native_form_id(record.file, form_id)
+        out(res, form_id)
+
+    @exported
+    def SetFormID(self, id_, form_id, native, fix_references):
+        record = self.record(id_)
+        file_ = record.file
+        if native:
+            form_id = self.global_form_id(file_, form_id)
+        old_form_id = record.form_id
+        if form_id == old_form_id:
+            return
+        if form_id in file_.records:
+            raise SimulatedError(f'{file_.name} already has {form_id:08X}')
+
+        del file_.records[old_form_id]
+        versions = self.records[old_form_id]
+        versions.remove(record)
+        if not versions:
+            del self.records[old_form_id]
+        record.form_id = form_id
+        record.child('Record Header').child('FormID').value = form_id
+        file_.records[form_id] = record
+        versions = self.records.setdefault(form_id, [])
+        versions.append(record)
+        versions.sort(key=lambda r: r.file.load_order)
+        self.mark_modified(record)
+
+        if fix_references and old_form_id not in self.records:
+            for node in self.walk(self.root):
+                if node.kind == 'reference' and node.value == old_form_id:
+                    node.value = form_id
+
+    @exported
+    def GetRecord(self, id_, form_id, search_masters, res):
+        if arg(id_) == 0:
+            versions = self.records.get(form_id)
+            if not versions:
+                raise SimulatedError(f'Failed to find record {form_id:08X}')
+            record = versions[0]
+        else:
+            file_ = self.node(id_)
+            form_id = self.global_form_id(file_, form_id)
+            record = file_.records.get(form_id)
+            if record is None and search_masters:
+                versions = self.records.get(form_id, [])
+                record = next((r for r in versions
+                               if r.file in file_.masters), None)
+            if record is None:
+                raise SimulatedError(f'Failed to find record {form_id:08X}')
+        out(res, self.handle_for(record))
+
+    @exported
+    def GetRecords(self, id_, search, include_overrides, len_):
+        signatures = set(search.split(',')) if search else None
+        node = self.node(id_)
+        if node is self.root:
+            candidates = [r for f in node.children for r in self.file_records(f)]
+        elif node.kind == 'file':
+            candidates = self.file_records(node)
+        else:
+            candidates = [r for r in self.walk(node)
+                          if r.kind == 'record' and r is not node]
+        records = [r for r in candidates
+                   if (signatures is None or r.signature in signatures) and
+                   (include_overrides or self.records[r.form_id][0] is r)]
+        self.array_result(len_, records)
+
+    def file_records(self, file_):
+        return [record for group in file_.children[1:]
+                for record in group.children]
+
+    @exported
+    def GetOverrides(self, id_, len_):
+        record = self.record(id_)
+        self.array_result(len_, self.records[record.form_id][1:])
+
+    @exported
+    def GetMasterRecord(self, id_, res):
+        record = self.record(id_)
+        out(res, self.handle_for(self.records[record.form_id][0]))
+
+    @exported
+    def GetWinningOverride(self, id_, res):
+        record = self.record(id_)
+        out(res, self.handle_for(self.records[record.form_id][-1]))
+
+    @exported
+    def GetPreviousOverride(self, id_, id2, res):
+        record = self.record(id_)
+        file_ = self.node(id2)
+        previous = [r for r in self.records[record.form_id]
+                    if r.file.load_order < file_.load_order]
+        if not previous:
+            raise SimulatedError('No previous override')
+        out(res, self.handle_for(previous[-1]))
+
+    @exported
+    def IsMaster(self, id_, res):
+        record = self.record(id_)
+        out(res, self.records[record.form_id][0] is record)
+
+    @exported
+    def IsOverride(self, id_, res):
+        record = self.record(id_)
+        out(res, self.records[record.form_id][0] is not record)
+
+    @exported
+    def IsWinningOverride(self, id_, res):
+        record = self.record(id_)
+        out(res, self.records[record.form_id][-1] is record)
+
+    @exported
+    def IsInjected(self, id_, res):
+        self.record(id_)
+        out(res, False)
+
+    @exported
+    def GetReferencedBy(self, id_, len_):
+        form_id = self.record(id_).form_id
+        referrers = []
+        for file_ in self.root.children:
+            for record in self.file_records(file_):
+                if record.form_id == form_id:
+                    continue
+                if any(n.kind == 'reference' and n.value == form_id
+                       for n in self.walk(record)):
+                    referrers.append(record)
+        self.array_result(len_, referrers)
+
+    # node trees and conflict data
+    @exported
+    def GetNodes(self, id_, res):
+        record = self.record(id_)
+        handle = self.next_handle
+        self.next_handle += 1
+        self.nodes[handle] = record.form_id
+        out(res, handle)
+
+    @exported
+    def GetNodeElements(self, nodes, element, len_):
+        if arg(nodes) not in self.nodes:
+            raise SimulatedError(f'Failed to resolve nodes {nodes}')
+        self.array_result(len_, self.node(element).children or [])
+
+    @exported
+    def GetConflictData(self, nodes, element, conflict_all, conflict_this):
+        form_id = self.nodes[arg(nodes)]
+        node = self.node(element)
+        path = node.local_path()
+        versions = self.records[form_id]
+        values = []
+        for version in versions:
+            try:
+                values.append(self.fingerprint(self.resolve_path(version, path)
+                                               if path else version))
+            except SimulatedError:
+                values.append(None)
+        this = values[versions.index(node.record)]
+        master, winner = values[0], values[-1]
+
+        if len(values) == 1:
+            overall, own = ConflictAll.OnlyOne, ConflictThis.OnlyOne
+        elif all(value == master for value in values):
+            overall = ConflictAll.NoConflict
+            own = (ConflictThis.Master if node.record is versions[0]
+                   else ConflictThis.IdenticalToMaster)
+        else:
+            if all(value == master for value in values[:-1]):
+                overall = ConflictAll.Override
+            else:
+                overall = ConflictAll.Conflict
+            if node.record is versions[0]:
+                own = ConflictThis.Master
+            elif this == winner:
+                own = (ConflictThis.Override if overall == ConflictAll.Override
+                       else ConflictThis.ConflictWins)
+            elif this == master:
+                own = ConflictThis.IdenticalToMaster
+            else:
+                own = ConflictThis.ConflictLoses
+        out(conflict_all, overall.value)
+        out(conflict_this, own.value)
+
+    def fingerprint(self, node):
+        if node.children is None:
+            return self.get_value(node)
+        return tuple((child.name, self.fingerprint(child))
+                     for child in node.children
+                     if child.name != 'Record Header')
+
+
+def copy_element(element):
+    '''
+    Returns a deep copy of an element, detached from its parent.
+    '''
+    parent = element.parent
+    element.parent = None
+    try:
+        duplicate = copy.deepcopy(element)
+    finally:
+        element.parent = parent
+    return duplicate
+
+
+class SimulatedBackend(XelibBackend):
+    '''
+    A backend that runs ``Xelib`` against a ``SimulatedAPI`` instead of
+    ``XEditLib.dll``, so that pyxedit can be exercised, benchmarked and
+    regression tested on any platform, without game data.
+
+    The simulated plugins are described by a fixture dict:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        fixture = {
+            'files': [
+                {'name': 'Skyrim.esm',
+                 'records': [
+                     {'$signature': 'KYWD',
+                      '$form_id': 0x00000800,
+                      'EDID - Editor ID': 'ArmorHeavy'},
+                     {'$signature': 'ARMO',
+                      '$form_id': 0x00000801,
+                      'EDID - Editor ID': 'IronHelmet',
+                      'FULL - Name': 'Iron Helmet',
+                      'KWDA - Keywords': [{'$ref': 0x00000800}],
+                      'DATA - Data': {'Value': 60, 'Weight': 5.0}}]},
+                {'name': 'Patch.esp',
+                 'masters': ['Skyrim.esm'],
+                 'records': [
+                     {'$signature': 'ARMO',
+                      '$form_id': 0x00000801,
+                      'EDID - Editor ID': 'IronHelmet',
+                      'FULL - Name': 'Rusty Iron Helmet'}]},
+            ],
+            'signature_names': {'ARMO': 'Armor', 'KYWD': 'Keyword'},
+        }
+
+    FormIDs, including those of references, are written as they are stored
+    in the plugin, with the top byte indexing the plugin's masters. Element
+    kinds follow from their values; strings, ints, floats and ``bytes`` (byte
+    arrays) are values, dicts are structs and lists are arrays, while dicts with a ``'$ref'`` key
+    are references and dicts with a ``'$flags'`` key are flags, given as a
+    ``{name: state}`` dict or a list of enabled names. Enums are dicts with
+    the ``'$enum'`` option set out of their ``'$options'``, a list of the
+    options valued 0 and up, or a ``{value: name}`` dict for enums whose
+    values are sparse or do not start at 0. Unions are dicts with a
+    ``'$union'`` key, holding a ``{name: spec}`` dict of the member the union
+    resolves to in the record. Names starting with a
+    signature, like ``'FULL - Name'``, are subrecords when directly under a
+    record. Records also take optional ``'$record_flags'``.
+
+    Args:
+        fixture (``dict``):
+            the fixture describing the simulated plugins
+        latency (``float``):
+            seconds to wait on every api call, to simulate the cost of calls
+            into ``XEditLib.dll``
+        instrument (``bool``):
+            whether to count api calls, even without any latency
+    '''
+    def __init__(self, fixture, latency=0.0, instrument=False):
+        super().__init__(latency=latency, instrument=instrument)
+        self.fixture = fixture
+
+    def load_api(self, dll_path):
+        return SimulatedAPI(self.fixture)
+
+    def unload_api(self, api):
+        pass
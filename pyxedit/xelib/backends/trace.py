@@ -0,0 +1,379 @@
+from collections import namedtuple
+import ctypes
+import struct
+
+from pyxedit.xelib.backends.base import XelibBackend
+
+MAGIC = b'PXTRACE\x01'
+
+# record types
+DEFINE_FUNCTION = b'F'
+DEFINE_STRING = b'S'
+CALL = b'C'
+
+# value tags
+NONE, FALSE, TRUE, INT, FLOAT, STRING, BYTES, UINTS, OUTPUT = range(9)
+
+U8 = struct.Struct('<B')
+U16 = struct.Struct('<H')
+U32 = struct.Struct('<I')
+I64 = struct.Struct('<q')
+F64 = struct.Struct('<d')
+CALL_HEADER = struct.Struct('<HB')
+
+TraceCall = namedtuple('TraceCall', ['name', 'args', 'result', 'outputs'])
+TraceCall.__doc__ = '''
+A single recorded api call. ``args`` holds the python values of the
+arguments, with ``OUTPUT`` in place of output parameters and buffers, whose
+values after the call are in ``outputs``, as ``{argument index: value}``.
+'''
+
+
+class TraceError(Exception):
+    '''
+    An exception raised for unreadable traces, and for replayed calls that
+    diverge from the recorded ones.
+    '''
+    pass
+
+
+def is_output(value):
+    '''
+    Whether an api call argument is an output parameter (passed with
+    ``ctypes.byref``) or a buffer the api writes into.
+    '''
+    return hasattr(value, '_obj') or isinstance(value, ctypes.Array)
+
+
+def output_value(value):
+    '''
+    Returns the python value written to an output parameter or buffer.
+    '''
+    if hasattr(value, '_obj'):
+        return value._obj.value
+    if value._type_ is ctypes.c_wchar:
+        return value.value
+    if value._type_ is ctypes.c_ubyte:
+        return bytes(value)
+    return list(value)
+
+
+def write_output(target, value):
+    '''
+    Writes a recorded value back into an output parameter or buffer.
+    '''
+    if hasattr(target, '_obj'):
+        target._obj.value = value
+    elif isinstance(value, str):
+        target.value = value
+    elif isinstance(value, bytes):
+        ctypes.memmove(target, value, min(len(value), len(target)))
+    else:
+        for i, item in enumerate(value[:len(target)]):
+            target[i] = item
+
+
+class TraceWriter:
+    '''
+    Writes api calls to a compact binary trace file.
+
+    Function names and strings are interned; each is written once, in a
+    definition record ahead of the first call using it, and referred to by
+    index from then on. Calls are written as a function index, followed by
+    tagged argument values, the tagged result, and the tagged values of any
+    output parameters.
+    '''
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+        self._functions = {}
+        self._strings = {}
+        self.count = 0
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def _function_id(self, name):
+        function_id = self._functions.get(name)
+        if function_id is None:
+            function_id = self._functions[name] = len(self._functions)
+            data = name.encode('utf-8')
+            self._file.write(DEFINE_FUNCTION + U16.pack(function_id) +
+                             U16.pack(len(data)) + data)
+        return function_id
+
+    def _string_id(self, value):
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = self._strings[value] = len(self._strings)
+            data = value.encode('utf-8', 'surrogatepass')
+            self._file.write(DEFINE_STRING + U32.pack(string_id) +
+                             U32.pack(len(data)) + data)
+        return string_id
+
+    def _encode(self, value):
+        if value is None:
+            return U8.pack(NONE)
+        if value is True or value is False:
+            return U8.pack(TRUE if value else FALSE)
+        if isinstance(value, int):
+            return U8.pack(INT) + I64.pack(value)
+        if isinstance(value, float):
+            return U8.pack(FLOAT) + F64.pack(value)
+        if isinstance(value, str):
+            return U8.pack(STRING) + U32.pack(self._string_id(value))
+        if isinstance(value, bytes):
+            return U8.pack(BYTES) + U32.pack(len(value)) + value
+        if isinstance(value, list):
+            return (U8.pack(UINTS) + U32.pack(len(value)) +
+                    struct.pack(f'<{len(value)}I', *value))
+        raise TraceError(f'Cannot record value {value!r}')
+
+    def write_call(self, name, args, result):
+        '''
+        Records a call that has just been made, reading the values of its
+        output parameters as they are now.
+        '''
+        function_id = self._function_id(name)
+        encoded = []
+        outputs = []
+        for index, value in enumerate(args):
+            if is_output(value):
+                encoded.append(U8.pack(OUTPUT))
+                outputs.append((index, output_value(value)))
+            else:
+                encoded.append(self._encode(getattr(value, 'value', value)))
+        encoded.append(self._encode(result))
+        encoded.append(U8.pack(len(outputs)))
+        for index, value in outputs:
+            encoded.append(U8.pack(index) + self._encode(value))
+        self._file.write(CALL + CALL_HEADER.pack(function_id, len(args)) +
+                         b''.join(encoded))
+        self.count += 1
+
+
+def read_trace(path):
+    '''
+    Reads a trace written by ``TraceWriter``.
+
+    Args:
+        path (``str``):
+            path to the trace file
+
+    Returns:
+        (``List[TraceCall]``) the recorded calls, in order
+    '''
+    with open(path, 'rb') as fp:
+        data = fp.read()
+    if not data.startswith(MAGIC):
+        raise TraceError(f'{path} is not a pyxedit trace')
+
+    functions = {}
+    strings = {}
+    calls = []
+    position = len(MAGIC)
+
+    def read(struct_):
+        nonlocal position
+        (value,) = struct_.unpack_from(data, position)
+        position += struct_.size
+        return value
+
+    def read_value():
+        nonlocal position
+        tag = read(U8)
+        if tag == NONE:
+            return None
+        if tag in (FALSE, TRUE):
+            return tag == TRUE
+        if tag == INT:
+            return read(I64)
+        if tag == FLOAT:
+            return read(F64)
+        if tag == STRING:
+            return strings[read(U32)]
+        if tag == BYTES:
+            length = read(U32)
+            position += length
+            return data[position - length:position]
+        if tag == UINTS:
+            count = read(U32)
+            values = struct.unpack_from(f'<{count}I', data, position)
+            position += 4 * count
+            return list(values)
+        if tag == OUTPUT:
+            return OUTPUT
+        raise TraceError(f'Unknown value tag {tag} at {position - 1}')
+
+    try:
+        while position < len(data):
+            kind = data[position:position + 1]
+            position += 1
+            if kind == DEFINE_FUNCTION:
+                function_id, length = read(U16), read(U16)
+                functions[function_id] = data[position:position + length].decode(
+                    'utf-8')
+                position += length
+            elif kind == DEFINE_STRING:
+                string_id, length = read(U32), read(U32)
+                strings[string_id] = data[position:position + length].decode(
+                    'utf-8', 'surrogatepass')
+                position += length
+            elif kind == CALL:
+                function_id, argc = CALL_HEADER.unpack_from(data, position)
+                position += CALL_HEADER.size
+                args = tuple(read_value() for _ in range(argc))
+                result = read_value()
+                outputs = {}
+                for _ in range(read(U8)):
+                    index = read(U8)
+                    outputs[index] = read_value()
+                calls.append(TraceCall(functions[function_id], args, result,
+                                       outputs))
+            else:
+                raise TraceError(f'Unknown record type {kind!r} at '
+                                 f'{position - 1}')
+    except (struct.error, KeyError) as e:
+        raise TraceError(f'{path} is truncated or corrupt: {e}') from None
+    return calls
+
+
+class RecordingAPI:
+    '''
+    Wraps around a raw api object, like ``XelibWrapperAPI`` does, passing
+    every call through to it and recording the call, its arguments, result
+    and output values to a ``TraceWriter``.
+    '''
+    def __init__(self, api, writer):
+        self.api = api
+        self.writer = writer
+
+    def __getattr__(self, name):
+        function = getattr(self.api, name)
+        if name.startswith('_') or not callable(function):
+            return function
+        write_call = self.writer.write_call
+
+        def recorded(*args):
+            result = function(*args)
+            write_call(name, args, result)
+            return result
+
+        setattr(self, name, recorded)
+        return recorded
+
+
+class ReplayAPI:
+    '''
+    Serves the calls of a recorded trace back in order, writing the recorded
+    output values into the caller's output parameters and buffers, and
+    returning the recorded results. Calls must be made in the same order, to
+    the same functions, as they were recorded; with ``strict`` set, their
+    input arguments must match as well. A ``TraceError`` is raised as soon as
+    the replayed calls diverge from the trace.
+    '''
+    def __init__(self, calls, strict=True):
+        self.calls = calls
+        self.strict = strict
+        self.position = 0
+
+    @property
+    def remaining(self):
+        return len(self.calls) - self.position
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def replayed(*args):
+            return self.replay(name, args)
+
+        setattr(self, name, replayed)
+        return replayed
+
+    def replay(self, name, args):
+        if self.position >= len(self.calls):
+            raise TraceError(f'Trace ended before call to {name}')
+        call = self.calls[self.position]
+        if call.name != name:
+            raise TraceError(f'Call {self.position} to {name} diverges from '
+                             f'the trace, which has a call to {call.name}')
+        if self.strict:
+            for index, (recorded, value) in enumerate(zip(call.args, args)):
+                if recorded is OUTPUT:
+                    continue
+                value = getattr(value, 'value', value)
+                if recorded != value:
+                    raise TraceError(
+                        f'Call {self.position} to {name} diverges from the '
+                        f'trace at argument {index}: expected {recorded!r}, '
+                        f'got {value!r}')
+        self.position += 1
+        for index, value in call.outputs.items():
+            write_output(args[index], value)
+        return call.result
+
+
+class RecordingBackend(XelibBackend):
+    '''
+    A backend that records all traffic with the api of another backend to a
+    trace file, which ``ReplayBackend`` can later serve back on any platform.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        backend = RecordingBackend(DLLBackend(), 'copy_into.trace')
+        with XEdit(plugins=['Patch.esp'], backend=backend).session() as xedit:
+            ...
+    '''
+    def __init__(self, backend, path, **kwargs):
+        '''
+        Args:
+            backend (``XelibBackend``):
+                the backend to record the api traffic of
+            path (``str``):
+                path to write the trace to
+        '''
+        super().__init__(**kwargs)
+        self.backend = backend
+        self.path = path
+        self.writer = None
+
+    def load_api(self, dll_path):
+        self.writer = TraceWriter(self.path)
+        return RecordingAPI(self.backend.load(dll_path), self.writer)
+
+    def unload_api(self, api):
+        self.writer.close()
+        self.backend.unload(api.api)
+
+
+class ReplayBackend(XelibBackend):
+    '''
+    A backend that serves back a trace recorded with ``RecordingBackend``,
+    without needing ``XEditLib.dll``. The code run against it must make the
+    same api calls as the recorded code did; see ``ReplayAPI``.
+    '''
+    def __init__(self, path, strict=True, **kwargs):
+        '''
+        Args:
+            path (``str``):
+                path to the trace to replay
+            strict (``bool``):
+                whether replayed calls must pass the same input arguments as
+                the recorded ones
+        '''
+        super().__init__(**kwargs)
+        self.path = path
+        self.strict = strict
+        self.calls = None
+
+    def load_api(self, dll_path):
+        if self.calls is None:
+            self.calls = read_trace(self.path)
+        return ReplayAPI(self.calls, strict=self.strict)
+
+    def unload_api(self, api):
+        pass
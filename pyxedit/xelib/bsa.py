@@ -0,0 +1,279 @@
+from concurrent.futures import ThreadPoolExecutor
+import mmap
+import os
+import struct
+import zlib
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+
+class BSAError(Exception):
+    '''
+    An exception object for use by ``BSAArchive``
+    '''
+    pass
+
+
+# archive flags
+ARCHIVE_INCLUDE_DIRECTORY_NAMES = 0x1
+ARCHIVE_INCLUDE_FILE_NAMES = 0x2
+ARCHIVE_COMPRESSED = 0x4
+ARCHIVE_EMBED_FILE_NAMES = 0x100
+
+# set on a file record's size to invert the archive's compression default for
+# that one file
+FILE_SIZE_COMPRESSION_TOGGLE = 0x40000000
+FILE_SIZE_MASK = 0x3FFFFFFF
+
+HEADER = struct.Struct('<4s8I')
+FOLDER_RECORDS = {104: struct.Struct('<QII'),    # hash, count, offset
+                  105: struct.Struct('<QIIQ')}   # hash, count, pad, offset
+FILE_RECORD = struct.Struct('<QII')              # hash, size, offset
+
+# extensions that get bits set in the low half of a file name hash
+HASH_EXTENSION_BITS = {'.kf': 0x80,
+                       '.nif': 0x8000,
+                       '.dds': 0x8080,
+                       '.wav': 0x80000000}
+
+
+def normalize_path(path):
+    '''
+    Returns the form paths are hashed and looked up in; lowercase, with
+    backslash separators and no leading or trailing separators.
+    '''
+    return path.replace('/', '\\').strip('\\').lower()
+
+
+def tes4_hash(name, ext=''):
+    '''
+    Returns the 64 bit hash Bethesda archives use to index folders and files.
+
+    Args:
+        name (``str``):
+            a normalized folder path, or a file name without its extension
+        ext (``str``):
+            the file extension including the dot, if hashing a file name
+
+    Returns:
+        (``int``) the hash
+    '''
+    name_bytes = name.encode('cp1252')
+    ext_bytes = ext.encode('cp1252')
+    if not name_bytes:
+        return 0
+
+    hash1 = (name_bytes[-1]
+             | (name_bytes[-2] if len(name_bytes) > 2 else 0) << 8
+             | len(name_bytes) << 16
+             | name_bytes[0] << 24)
+    hash1 |= HASH_EXTENSION_BITS.get(ext, 0)
+
+    hash2 = 0
+    for char in name_bytes[1:-2]:
+        hash2 = (hash2 * 0x1003F + char) & 0xFFFFFFFF
+    hash3 = 0
+    for char in ext_bytes:
+        hash3 = (hash3 * 0x1003F + char) & 0xFFFFFFFF
+
+    return (((hash2 + hash3) & 0xFFFFFFFF) << 32) | hash1
+
+
+def path_hashes(path):
+    '''
+    Returns the ``(folder hash, file hash)`` pair a file path is indexed by.
+    '''
+    folder, _, file_name = normalize_path(path).rpartition('\\')
+    stem, dot, ext = file_name.rpartition('.')
+    if not dot:
+        stem, ext = file_name, ''
+    else:
+        ext = f'.{ext}'
+    return tes4_hash(folder), tes4_hash(stem, ext)
+
+
+class BSAArchive:
+    '''
+    A pure python reader for ``.bsa`` archives, versions 104 (Fallout 3, New
+    Vegas, Skyrim) and 105 (Skyrim Special Edition), which does not need
+    ``XEditLib.dll``.
+
+    The archive is memory mapped and its folder and file records are read
+    once, into an index keyed by the same ``(folder hash, file hash)`` pairs
+    the game uses, so looking up a file does not depend on the archive
+    storing names. Individual files are then read straight out of the
+    mapping into memory, decompressing them with zlib (v104) or LZ4 (v105)
+    as needed. Reads don't share any state, so files can be extracted from
+    many threads at once.
+
+    LZ4 decompression needs the optional ``lz4`` package.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        with BSAArchive('Skyrim - Textures.bsa') as archive:
+            data = archive.read('textures\\\\sky\\\\skyrimclouds01.dds')
+    '''
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = None
+        try:
+            if os.fstat(self._file.fileno()).st_size < HEADER.size:
+                raise BSAError(f'{path} is too small to be a BSA archive')
+            self._mmap = mmap.mmap(self._file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+            self._read_index()
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} {self.path} '
+                f'v{self.version} {len(self._index)} files>')
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def _read_index(self):
+        data = self._mmap
+        (magic, self.version, folder_records_offset, self.archive_flags,
+         folder_count, file_count, _, total_file_name_length,
+         self.file_flags) = HEADER.unpack_from(data, 0)
+        if magic != b'BSA\0':
+            raise BSAError(f'{self.path} is not a BSA archive')
+        if self.version not in FOLDER_RECORDS:
+            raise BSAError(f'{self.path} is a version {self.version} BSA '
+                           f'archive; only versions 104 and 105 are supported')
+
+        # (folder hash, file hash) -> (size, offset)
+        self._index = {}
+        # normalized path -> (folder hash, file hash), if names are stored
+        self._names = {}
+
+        folder_record = FOLDER_RECORDS[self.version]
+        folders = [folder_record.unpack_from(
+                       data, folder_records_offset + i * folder_record.size)
+                   for i in range(folder_count)]
+
+        has_folder_names = self.archive_flags & ARCHIVE_INCLUDE_DIRECTORY_NAMES
+        has_file_names = self.archive_flags & ARCHIVE_INCLUDE_FILE_NAMES
+
+        file_records = []
+        position = folder_records_offset + folder_count * folder_record.size
+        for folder in folders:
+            folder_hash, count = folder[0], folder[1]
+
+            folder_name = ''
+            if has_folder_names:
+                # a byte length, including the terminating null
+                length = data[position]
+                folder_name = data[position + 1:position + length].decode(
+                    'cp1252')
+                position += 1 + length
+
+            for _ in range(count):
+                file_hash, size, offset = FILE_RECORD.unpack_from(data, position)
+                position += FILE_RECORD.size
+                self._index[folder_hash, file_hash] = (size, offset)
+                file_records.append((folder_name, folder_hash, file_hash))
+
+        if has_folder_names and has_file_names:
+            names = bytes(data[position:position + total_file_name_length])
+            names = names.split(b'\0')[:file_count]
+            for (folder_name, folder_hash, file_hash), name in zip(file_records,
+                                                                   names):
+                path = normalize_path(f'{folder_name}\\{name.decode("cp1252")}')
+                self._names[path] = (folder_hash, file_hash)
+
+    @property
+    def compressed(self):
+        return bool(self.archive_flags & ARCHIVE_COMPRESSED)
+
+    @property
+    def file_paths(self):
+        '''
+        The normalized paths of every file in the archive. This is empty for
+        archives that don't store folder and file names.
+        '''
+        return list(self._names)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, path):
+        return path_hashes(path) in self._index
+
+    def read(self, path):
+        '''
+        Returns the contents of a file in the archive.
+
+        Args:
+            path (``str``):
+                the path of the file within the archive, in any case and with
+                either kind of separator
+
+        Returns:
+            (``bytes``) the uncompressed file contents
+        '''
+        record = self._index.get(path_hashes(path))
+        if record is None:
+            raise BSAError(f'{path} is not in {self.path}')
+
+        size, offset = record
+        compressed = self.compressed
+        if size & FILE_SIZE_COMPRESSION_TOGGLE:
+            compressed = not compressed
+        size &= FILE_SIZE_MASK
+
+        data = self._mmap
+        if self.archive_flags & ARCHIVE_EMBED_FILE_NAMES:
+            # the full path is embedded in front of the data, with a byte length
+            name_length = data[offset] + 1
+            offset += name_length
+            size -= name_length
+
+        if not compressed:
+            return data[offset:offset + size]
+
+        (original_size,) = struct.unpack_from('<I', data, offset)
+        packed = data[offset + 4:offset + size]
+        if self.version == 105:
+            if lz4 is None:
+                raise BSAError(f'Reading {path} from {self.path} needs LZ4 '
+                               f'decompression; install the lz4 package')
+            unpacked = lz4.frame.decompress(packed)
+        else:
+            unpacked = zlib.decompress(packed)
+
+        if len(unpacked) != original_size:
+            raise BSAError(f'{path} in {self.path} decompressed to '
+                           f'{len(unpacked)} bytes, expected {original_size}')
+        return unpacked
+
+    def read_many(self, paths, max_workers=4):
+        '''
+        Reads many files from the archive concurrently, producing
+        ``(path, data)`` pairs in the order the paths were given.
+
+        Args:
+            paths (``Iterable[str]``):
+                the paths of the files within the archive
+            max_workers (``int``):
+                the number of threads to read with
+        '''
+        paths = list(paths)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            yield from zip(paths, pool.map(self.read, paths))
@@ -0,0 +1,274 @@
+from collections import Counter, deque, namedtuple
+import ctypes
+import os
+import sys
+
+PACKAGE_DIR = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+# modules whose frames are skipped over when looking for the user code that
+# called into pyxedit, since pyxedit calls itself through them
+PASSTHROUGH_MODULES = {'cached_property', 'contextlib', 'functools'}
+
+# api functions that are part of the calling protocol of other functions, or
+# that are expected to be polled, and so are never reported as repeated
+PROTOCOL_FUNCTIONS = {
+    'GetResultString', 'GetResultArray', 'GetResultBytes',
+    'GetExceptionMessageLength', 'GetExceptionMessage',
+    'GetMessagesLength', 'GetMessages', 'GetLoaderStatus',
+}
+
+# api functions whose names start with these may change what other calls
+# return, so identical calls on either side of them are not repeats
+MUTATING_PREFIXES = (
+    'Add', 'Build', 'Clean', 'Copy', 'Load', 'Move', 'Nuke', 'Remove',
+    'Rename', 'Set', 'Sort', 'Swap', 'Toggle', 'Translate', 'Unload',
+)
+
+REPEATED = 'repeated'
+PER_ITEM = 'per-item'
+
+CallPattern = namedtuple('CallPattern', ['kind', 'calls', 'count', 'wasted',
+                                         'stack', 'site'])
+CallPattern.__doc__ = '''
+A call pattern found by ``CallPatternDetector``.
+
+``kind`` is ``REPEATED`` for an api call repeated with identical arguments
+within the detector's window, in which case ``calls`` is the name of the api
+function, ``count`` is the number of repeats and ``wasted`` equals it.
+
+``kind`` is ``PER_ITEM`` for a sequence of api calls made each time a line of
+user code called into pyxedit, typically once per item of a loop, in which
+case ``calls`` is the tuple of api function names in the sequence, ``count``
+is the number of times it was made, and ``wasted`` is the total number of api
+calls made by it.
+
+``stack`` is the chain of pyxedit methods from the one the user code called
+to the one that called the api, and ``site`` is the ``file:line`` of the user
+code.
+'''
+
+
+def frame_name(frame):
+    '''
+    Returns a readable ``Class.method`` name for the function running in a
+    frame.
+    '''
+    name = frame.f_code.co_name
+    instance = frame.f_locals.get('self')
+    if instance is not None:
+        return f'{type(instance).__name__}.{name}'
+    return name
+
+
+def input_key(value):
+    '''
+    Returns a hashable key for an api call argument; output parameters and
+    buffers, whose identity differs from call to call, all map to ``'?'``.
+    '''
+    if hasattr(value, '_obj') or isinstance(value, ctypes.Array):
+        return '?'
+    value = getattr(value, 'value', value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def summarize_calls(calls):
+    '''
+    Joins a sequence of api function names, collapsing runs of the same
+    function, as in ``GetAllFlags, GetFlag x19``.
+    '''
+    runs = []
+    for name in calls:
+        if runs and runs[-1][0] == name:
+            runs[-1][1] += 1
+        else:
+            runs.append([name, 1])
+    return ', '.join(name if count == 1 else f'{name} x{count}'
+                     for name, count in runs)
+
+
+class CallPatternDetector:
+    '''
+    Watches the stream of api calls made through ``Xelib`` for the patterns
+    that make scripts slow: the same call being made with the same arguments
+    over and over, typically because different properties look up the same
+    element, and the same sequence of calls being made for each item of a
+    loop, the N+1 problem, where a single bulk call or a cached value could do.
+
+    Each call is attributed to the pyxedit method that made it, and to the
+    line of user code that called into pyxedit, so that findings point at
+    what to fix. Walking the stack on every call is slow; use the detector
+    while investigating, not in production runs. See
+    ``Xelib.detect_call_patterns``.
+    '''
+    def __init__(self, window=64, threshold=3, loop_threshold=5):
+        '''
+        Args:
+            window (``int``):
+                how many of the most recent calls to look for identical calls
+                in
+            threshold (``int``):
+                how many times an identical call must be repeated from the same
+                place to be reported
+            loop_threshold (``int``):
+                how many times a line of user code must make the same sequence
+                of calls to be reported
+        '''
+        self.window = window
+        self.threshold = threshold
+        self.loop_threshold = loop_threshold
+        self.total_calls = 0
+        self.repeats = Counter()
+        self.sequences = Counter()
+        self._recent = deque()
+        self._recent_counts = Counter()
+        self._entry_frame = None
+        self._entry = None
+        self._sequence = []
+
+    def reset(self):
+        self.flush()
+        self.total_calls = 0
+        self.repeats.clear()
+        self.sequences.clear()
+        self._recent.clear()
+        self._recent_counts.clear()
+
+    def locate(self, frame):
+        '''
+        Walks up from the frame of the pyxedit code making an api call to the
+        first frame of user code.
+
+        Returns:
+            (``Tuple[frame, Tuple[str], str]``) the outermost pyxedit frame,
+            the names of the pyxedit methods from outermost to innermost, and
+            the ``file:line`` of the user code
+        '''
+        stack = []
+        entry = None
+        while frame is not None:
+            if frame.f_code.co_filename.startswith(PACKAGE_DIR):
+                stack.append(frame_name(frame))
+                entry = frame
+            elif frame.f_globals.get('__name__') not in PASSTHROUGH_MODULES:
+                break
+            frame = frame.f_back
+        if frame is None:
+            site = '<pyxedit>'
+        else:
+            site = f'{frame.f_code.co_filename}:{frame.f_lineno}'
+        return entry, tuple(reversed(stack)), site
+
+    def observe(self, name, args, frame):
+        '''
+        Records an api call; ``frame`` is the frame of the pyxedit code that
+        made it.
+        '''
+        self.total_calls += 1
+        entry_frame, stack, site = self.locate(frame)
+
+        # a new entry into pyxedit from user code starts a new call sequence
+        if entry_frame is not self._entry_frame:
+            self.flush()
+            self._entry_frame = entry_frame
+            self._entry = (stack[:1], site)
+        self._sequence.append(name)
+
+        if name in PROTOCOL_FUNCTIONS:
+            return
+        if name.startswith(MUTATING_PREFIXES):
+            self._recent.clear()
+            self._recent_counts.clear()
+            return
+
+        key = (name, tuple(input_key(arg) for arg in args))
+        if self._recent_counts[key]:
+            self.repeats[(name, stack, site)] += 1
+        self._recent.append(key)
+        self._recent_counts[key] += 1
+        if len(self._recent) > self.window:
+            oldest = self._recent.popleft()
+            self._recent_counts[oldest] -= 1
+            if not self._recent_counts[oldest]:
+                del self._recent_counts[oldest]
+
+    def flush(self):
+        '''
+        Ends the current call sequence, counting it towards per item
+        patterns. This also drops the reference kept to the frame of the
+        pyxedit code that made it.
+        '''
+        if self._sequence:
+            stack, site = self._entry
+            self.sequences[(tuple(self._sequence), stack, site)] += 1
+        self._sequence = []
+        self._entry_frame = None
+        self._entry = None
+
+    def report(self):
+        '''
+        Returns:
+            (``List[CallPattern]``) the patterns found so far, the ones
+            costing the most api calls first
+        '''
+        self.flush()
+        patterns = [
+            CallPattern(REPEATED, name, count, count, stack, site)
+            for (name, stack, site), count in self.repeats.items()
+            if count >= self.threshold]
+        patterns.extend(
+            CallPattern(PER_ITEM, calls, count, count * len(calls), stack,
+                        site)
+            for (calls, stack, site), count in self.sequences.items()
+            if count >= self.loop_threshold)
+        return sorted(patterns, key=lambda pattern: -pattern.wasted)
+
+    def format_report(self, limit=20):
+        '''
+        Returns the patterns found so far as readable text.
+
+        Args:
+            limit (``int``):
+                the maximum number of patterns to include
+        '''
+        patterns = self.report()
+        lines = [f'{self.total_calls} api calls, {len(patterns)} patterns '
+                 f'found']
+        for pattern in patterns[:limit]:
+            if pattern.kind == REPEATED:
+                lines.append(f'{pattern.calls} repeated {pattern.count} times '
+                             f'with identical arguments')
+            else:
+                lines.append(f'{len(pattern.calls)} calls made {pattern.count} '
+                             f'times, {pattern.wasted} in total: '
+                             f'{summarize_calls(pattern.calls)}')
+            lines.append(f'    at {pattern.site}')
+            lines.append(f'    in {" > ".join(pattern.stack)}')
+        return '\n'.join(lines)
+
+
+class DetectingAPI:
+    '''
+    Wraps around a raw api object, like ``InstrumentedAPI`` does, passing
+    every call through to it after reporting it to a ``CallPatternDetector``.
+    '''
+    def __init__(self, api, detector):
+        self.api = api
+        self.detector = detector
+
+    def __getattr__(self, name):
+        function = getattr(self.api, name)
+        if name.startswith('_') or not callable(function):
+            return function
+        observe = self.detector.observe
+
+        def detected(*args):
+            observe(name, args, sys._getframe(1))
+            return function(*args)
+
+        setattr(self, name, detected)
+        return detected
@@ -183,8 +183,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.get_string(
             lambda len_: self.raw_api.GetValue(id_, path, len_),
-            error_msg=f'Failed to get element value at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to get element value at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def get_ref_value(self, id_, path='', ex=False):
@@ -193,8 +193,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.get_string(
             lambda len_: self.raw_api.GetRefValue(id_, path, len_),
-            error_msg=f'Failed to get element ref value at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to get element ref value at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def set_value(self, id_, value, path='', ex=True):
@@ -212,8 +212,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.verify_execution(
             self.raw_api.SetValue(id_, path, value),
-            error_msg=f'Failed to set element value at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to set element value at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def get_int_value(self, id_, path='', ex=False):
@@ -232,8 +232,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.get_integer(
             lambda res: self.raw_api.GetIntValue(id_, path, res),
-            error_msg=f'Failed to get int value at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to get int value at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def set_int_value(self, id_, value, path='', ex=True):
@@ -251,8 +251,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.verify_execution(
             self.raw_api.SetIntValue(id_, path, value),
-            error_msg=f'Failed to set int value at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to set int value at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def get_uint_value(self, id_, path='', ex=False):
@@ -271,8 +271,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.get_unsigned_integer(
             lambda res: self.raw_api.GetUIntValue(id_, path, res),
-            error_msg=f'Failed to get uint value at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to get uint value at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def set_uint_value(self, id_, value, path='', ex=True):
@@ -290,8 +290,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.verify_execution(
             self.raw_api.SetUIntValue(id_, path, value),
-            error_msg=f'Failed to set uint value at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to set uint value at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def get_float_value(self, id_, path='', ex=False):
@@ -310,8 +310,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.get_double(
             lambda res: self.raw_api.GetFloatValue(id_, path, res),
-            error_msg=f'Failed to get float value at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to get float value at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def set_float_value(self, id_, value, path='', ex=True):
@@ -329,8 +329,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.verify_execution(
             self.raw_api.SetFloatValue(id_, path, value),
-            error_msg=f'Failed to set uint value at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to set uint value at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def set_flag(self, id_, name, state, path='', ex=True):
@@ -349,8 +349,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.verify_execution(
             self.raw_api.SetFlag(id_, path, name, state),
-            error_msg=f'Failed to set flag value at '
-                      f'{self.flag_context(id_, path, name)} to {state}',
+            error_msg=lambda: f'Failed to set flag value at '
+                              f'{self.flag_context(id_, path, name)} to {state}',
             ex=ex)
 
     def get_flag(self, id_, name, path='', ex=True):
@@ -370,8 +370,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.get_bool(
             lambda res: self.raw_api.GetFlag(id_, path, name, res),
-            error_msg=f'Failed to get flag value at: '
-                      f'{self.flag_context(id_, path, name)}',
+            error_msg=lambda: f'Failed to get flag value at: '
+                              f'{self.flag_context(id_, path, name)}',
             ex=ex)
 
     def get_enabled_flags(self, id_, path='', ex=True):
@@ -389,8 +389,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         comma_separated_flags = self.get_string(
             lambda len_: self.raw_api.GetEnabledFlags(id_, path, len_),
-            error_msg=f'Failed to get enabled flags at: '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to get enabled flags at: '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
         return comma_separated_flags.split(',') if comma_separated_flags else []
 
@@ -410,8 +410,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.verify_execution(
             self.raw_api.SetEnabledFlags(id_, path, ','.join(flags)),
-            error_msg=f'Failed to set enabled flags at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to set enabled flags at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def get_all_flags(self, id_, path='', ex=True):
@@ -429,8 +429,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         comma_separated_flags = self.get_string(
             lambda len_: self.raw_api.GetAllFlags(id_, path, len_),
-            error_msg=f'Failed to get all flags at: '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to get all flags at: '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
         return comma_separated_flags.split(',') if comma_separated_flags else []
 
@@ -449,8 +449,8 @@ class ElementValuesMethods(WrapperMethodsBase):
         '''
         return self.get_string(
             lambda len_: self.raw_api.GetEnumOptions(id_, path, len_),
-            error_msg=f'Failed to get all enum options at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to get all enum options at '
+                              f'{self.element_context(id_, path)}',
             ex=ex).split(',')
 
     def signature_from_name(self, name, ex=True):
@@ -246,8 +246,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_bool(
             lambda res: self.raw_api.HasElement(id_, path, res),
-            error_msg=f'Failed to check if element exists at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to check if element exists at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def get_element(self, id_, path='', ex=False):
@@ -267,8 +267,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_handle(
             lambda res: self.raw_api.GetElement(id_, path, res),
-            error_msg=f'Failed to get element at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to get element at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def add_element(self, id_, path='', ex=True):
@@ -290,8 +290,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_handle(
             lambda res: self.raw_api.AddElement(id_, path, res),
-            error_msg=f'Failed to create new element at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to create new element at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def add_element_value(self, id_, path, value, ex=True):
@@ -313,10 +313,11 @@ class ElementsMethods(WrapperMethodsBase):
         Returns:
             (``int``) handle to the created element at the end of the path
         '''
+        self.references_generation += 1
         return self.get_handle(
             lambda res: self.raw_api.AddElementValue(id_, path, value, res),
-            error_msg=f'Failed to create new element at '
-                      f'{self.element_context(id_, path)}, with value: {value}',
+            error_msg=lambda: f'Failed to create new element at '
+                              f'{self.element_context(id_, path)}, with value: {value}',
             ex=ex)
 
     def remove_element(self, id_, path='', ex=True):
@@ -332,10 +333,11 @@ class ElementsMethods(WrapperMethodsBase):
                 the subpath relative to the root element to remove an element
                 at; if empty, this should resolve to the starting element itself
         '''
+        self.references_generation += 1
         return self.verify_execution(
             self.raw_api.RemoveElement(id_, path),
-            error_msg=f'Failed to remove element at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to remove element at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def remove_element_or_parent(self, id_, ex=True):
@@ -350,10 +352,11 @@ class ElementsMethods(WrapperMethodsBase):
                 the id of the element to try to remove, together with any
                 parent containers if necessary
         '''
+        self.references_generation += 1
         return self.verify_execution(
             self.raw_api.RemoveElementOrParent(id_),
-            error_msg=f'Failed to remove element '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to remove element '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def set_element(self, id1, id2, ex=True):
@@ -369,11 +372,12 @@ class ElementsMethods(WrapperMethodsBase):
             id2 (``int``)
                 The id to assign to ``id1``.
         '''
+        self.references_generation += 1
         return self.verify_execution(
             self.raw_api.SetElement(id1, id2),
-            error_msg=f'Failed to set element at '
-                      f'{self.element_context(id2)} to '
-                      f'{self.element_context(id1)}',
+            error_msg=lambda: f'Failed to set element at '
+                              f'{self.element_context(id2)} to '
+                              f'{self.element_context(id1)}',
             ex=ex)
 
     def get_elements(self, id_=0, path='', sort=False, filter=False, sparse=False, ex=True):
@@ -399,8 +403,8 @@ class ElementsMethods(WrapperMethodsBase):
         return self.get_array(
             lambda len_:
                 self.raw_api.GetElements(id_, path, sort, filter, sparse, len_),
-            error_msg=f'Failed to get child elements at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to get child elements at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def get_def_names(self, id_, ex=True):
@@ -417,8 +421,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_string_array(
             lambda len_: self.raw_api.GetDefNames(id_, len_),
-            error_msg=f'Failed to get def names for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get def names for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_add_list(self, id_, ex=True):
@@ -437,7 +441,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_string_array(
             lambda len_: self.raw_api.GetAddList(id_, len_),
-            error_msg=f'Failed to get add list for {self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get add list for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_links_to(self, id_, path='', ex=False):
@@ -456,8 +461,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_handle(
             lambda res: self.raw_api.GetLinksTo(id_, path, res),
-            error_msg=f'Failed to get reference at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to get reference at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def set_links_to(self, id_, id2, path='', ex=True):
@@ -473,10 +478,11 @@ class ElementsMethods(WrapperMethodsBase):
                 The subpath from the element where the reference is at, this
                 reference will be set to the target pointed by ``id2``
         '''
+        self.references_generation += 1
         return self.verify_execution(
             self.raw_api.SetLinksTo(id_, path, id2),
-            error_msg=f'Failed to set reference at '
-                      f'{self.element_context(id_, path)}',
+            error_msg=lambda: f'Failed to set reference at '
+                              f'{self.element_context(id_, path)}',
             ex=ex)
 
     def get_container(self, id_, ex=False):
@@ -489,8 +495,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_handle(
             lambda res: self.raw_api.GetContainer(id_, res),
-            error_msg=f'Failed to get container for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get container for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_element_file(self, id_, ex=True):
@@ -506,8 +512,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_handle(
             lambda res: self.raw_api.GetElementFile(id_, res),
-            error_msg=f'Failed to get element file for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get element file for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_element_group(self, id_, ex=True):
@@ -524,8 +530,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_handle(
             lambda res: self.raw_api.GetElementGroup(id_, res),
-            error_msg=f'Failed to get element group for: '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get element group for: '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_element_record(self, id_, ex=True):
@@ -542,8 +548,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_handle(
             lambda res: self.raw_api.GetElementRecord(id_, res),
-            error_msg=f'Failed to get element record for: '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get element record for: '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def element_count(self, id_, ex=True):
@@ -559,8 +565,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_integer(
             lambda res: self.raw_api.ElementCount(id_, res),
-            error_msg=f'Failed to get element count for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get element count for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def element_equals(self, id_, id2, ex=True):
@@ -578,9 +584,9 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_bool(
             lambda res: self.raw_api.ElementEquals(id_, id2, res),
-            error_msg=f'Failed to check element equality for '
-                      f'{self.element_context(id_)} and '
-                      f'{self.element_context(id2)}',
+            error_msg=lambda: f'Failed to check element equality for '
+                              f'{self.element_context(id_)} and '
+                              f'{self.element_context(id2)}',
             ex=ex)
 
     def element_matches(self, id_, path, value, ex=True):
@@ -604,8 +610,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_bool(
             lambda res: self.raw_api.ElementMatches(id_, path, value, res),
-            error_msg=f'Failed to check element matches for '
-                      f'{self.element_context(id_, path)},{value}',
+            error_msg=lambda: f'Failed to check element matches for '
+                              f'{self.element_context(id_, path)},{value}',
             ex=ex)
 
     def has_array_item(self, id_, path, subpath, value, ex=True):
@@ -630,8 +636,8 @@ class ElementsMethods(WrapperMethodsBase):
         return self.get_bool(
             lambda res:
                 self.raw_api.HasArrayItem(id_, path, subpath, value, res),
-            error_msg=f'Failed to check if array has item for '
-                      f'{self.array_item_context(id_, path, subpath, value)}',
+            error_msg=lambda: f'Failed to check if array has item for '
+                              f'{self.array_item_context(id_, path, subpath, value)}',
             ex=ex)
 
     def get_array_item(self, id_, path, subpath, value, ex=True):
@@ -657,8 +663,8 @@ class ElementsMethods(WrapperMethodsBase):
         return self.get_handle(
             lambda res:
                 self.raw_api.GetArrayItem(id_, path, subpath, value, res),
-            error_msg=f'Failed to get array item for '
-                      f'{self.array_item_context(id_, path, subpath, value)}',
+            error_msg=lambda: f'Failed to get array item for '
+                              f'{self.array_item_context(id_, path, subpath, value)}',
             ex=ex)
 
     def add_array_item(self, id_, path, subpath, value, ex=True):
@@ -681,11 +687,12 @@ class ElementsMethods(WrapperMethodsBase):
         Returns:
             (``int``) handle to the added array item
         '''
+        self.references_generation += 1
         return self.get_handle(
             lambda res:
                 self.raw_api.AddArrayItem(id_, path, subpath, value, res),
-            error_msg=f'Failed to add array item to '
-                      f'{self.array_item_context(id_, path, subpath, value)}',
+            error_msg=lambda: f'Failed to add array item to '
+                              f'{self.array_item_context(id_, path, subpath, value)}',
             ex=ex)
 
     def remove_array_item(self, id_, path, subpath, value, ex=True):
@@ -706,10 +713,11 @@ class ElementsMethods(WrapperMethodsBase):
                 look for an element with the given subpath with this value to
                 remove
         '''
+        self.references_generation += 1
         return self.verify_execution(
             self.raw_api.RemoveArrayItem(id_, path, subpath, value),
-            error_msg=f'Failed to remove array item '
-                      f'{self.array_item_context(id_, path, subpath, value)}',
+            error_msg=lambda: f'Failed to remove array item '
+                              f'{self.array_item_context(id_, path, subpath, value)}',
             ex=ex)
 
     def move_array_item(self, id_, index, ex=True):
@@ -724,8 +732,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.verify_execution(
             self.raw_api.MoveArrayItem(id_, index),
-            error_msg=f'Failed to move array item {self.element_context(id_)} '
-                      f'to {index}',
+            error_msg=lambda: f'Failed to move array item {self.element_context(id_)} '
+                              f'to {index}',
             ex=ex)
 
     def copy_element(self, id_, id2, as_new=False, ex=True):
@@ -744,10 +752,11 @@ class ElementsMethods(WrapperMethodsBase):
         Returns:
             (``int``) handle to the copied element
         '''
+        self.references_generation += 1
         return self.get_handle(
             lambda res: self.raw_api.CopyElement(id_, id2, as_new, res),
-            error_msg=f'Failed to copy element {self.element_context(id_)} to '
-                      f'{id2}',
+            error_msg=lambda: f'Failed to copy element {self.element_context(id_)} to '
+                              f'{id2}',
             ex=ex)
 
     def find_next_element(self, id_, search, by_path, by_value, ex=True):
@@ -796,8 +805,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_bool(
             lambda res: self.raw_api.GetSignatureAllowed(id_, signature, res),
-            error_msg=f'Failed to check if signature {signature} is allowed on '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to check if signature {signature} is allowed on '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_allowed_signatures(self, id_, ex=True):
@@ -814,8 +823,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_string_array(
             lambda len_: self.raw_api.GetAllowedSignatures(id_, len_),
-            error_msg=f'Failed to get allowed signatures for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get allowed signatures for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_is_modified(self, id_, ex=True):
@@ -831,8 +840,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_bool(
             lambda res: self.raw_api.GetIsModified(id_, res),
-            error_msg=f'Failed to get is modified for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get is modified for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_is_editable(self, id_, ex=True):
@@ -848,8 +857,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_bool(
             lambda res: self.raw_api.GetIsEditable(id_, res),
-            error_msg=f'Failed to get is editable for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get is editable for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def set_is_editable(self, id_, bool_, ex=True):
@@ -858,8 +867,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.verify_execution(
             self.raw_api.SetIsEditable(id_, bool_),
-            error_msg=f'Failed to set is editable for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to set is editable for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_is_removable(self, id_, ex=True):
@@ -875,8 +884,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_bool(
             lambda res: self.raw_api.GetIsRemoveable(id_, res),
-            error_msg=f'Failed to get is removable for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get is removable for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_can_add(self, id_, ex=True):
@@ -892,8 +901,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_bool(
             lambda res: self.raw_api.GetCanAdd(id_, res),
-            error_msg=f'Failed to get can add for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get can add for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def element_type(self, id_, ex=True):
@@ -909,8 +918,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         result = self.get_byte(
             lambda res: self.raw_api.ElementType(id_, res),
-            error_msg=f'Failed to get element type for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get element type for '
+                              f'{self.element_context(id_)}',
             ex=ex)
         return result if result is None else ElementTypes(result)
 
@@ -927,8 +936,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         result = self.get_byte(
             lambda res: self.raw_api.DefType(id_, res),
-            error_msg=f'Failed to get def type for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get def type for '
+                              f'{self.element_context(id_)}',
             ex=ex)
         return result if result is None else DefTypes(result)
 
@@ -945,8 +954,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         result = self.get_byte(
             lambda res: self.raw_api.SmashType(id_, res),
-            error_msg=f'Failed to get smash type for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get smash type for '
+                              f'{self.element_context(id_)}',
             ex=ex)
         return result if result is None else SmashTypes(result)
 
@@ -963,8 +972,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         result = self.get_byte(
             lambda res: self.raw_api.ValueType(id_, res),
-            error_msg=f'Failed to get value type for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get value type for '
+                              f'{self.element_context(id_)}',
             ex=ex)
         return result if result is None else ValueTypes(result)
 
@@ -981,8 +990,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_bool(
             lambda res: self.raw_api.IsSorted(id_, res),
-            error_msg=f'Failed to get is sorted for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get is sorted for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def is_fixed(self, id_, ex=True):
@@ -991,8 +1000,8 @@ class ElementsMethods(WrapperMethodsBase):
         '''
         return self.get_bool(
             lambda res: self.raw_api.IsFixed(id_, res),
-            error_msg=f'Failed to get is fixed for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get is fixed for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def is_flags(self, id_, ex=True):
@@ -14,7 +14,8 @@ class ErrorsMethods(WrapperMethodsBase):
         '''
         self.verify_execution(
             self.raw_api.CheckForErrors(id_),
-            error_msg=f'Failed to check {self.element_context(id_)} for errors',
+            error_msg=lambda: f'Failed to check {self.element_context(id_)} '
+                              f'for errors',
             ex=ex)
 
     def get_error_thread_done(self):
@@ -44,6 +45,6 @@ class ErrorsMethods(WrapperMethodsBase):
         '''
         self.verify_execution(
             self.raw_api.RemoveIdenticalRecords(id_, remove_itms, remove_itpos),
-            error_msg=f'Failed to remove identical errors from '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to remove identical errors from '
+                              f'{self.element_context(id_)}',
             ex=ex)
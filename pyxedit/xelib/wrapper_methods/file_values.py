@@ -29,8 +29,8 @@ class FileValuesMethods(WrapperMethodsBase):
                 next object id to set under ``File Header\\HEDR\\Next Object ID``
         '''
         self.set_uint_value(id_,
-                            'File Header\\HEDR\\Next Object ID',
                             next_object_id,
+                            'File Header\\HEDR\\Next Object ID',
                             ex=ex)
 
     def get_file_name(self, id_, ex=True):
@@ -110,8 +110,8 @@ class FileValuesMethods(WrapperMethodsBase):
             (``bool``) whether file is esm
         '''
         return self.get_flag(id_,
-                             'File Header\\Record Header\\Record Flags',
                              'ESM',
+                             path='File Header\\Record Header\\Record Flags',
                              ex=ex)
 
     def set_is_esm(self, id_, state, ex=True):
@@ -124,8 +124,42 @@ class FileValuesMethods(WrapperMethodsBase):
             state (``bool``)
                 whether to enable or disable the esm flag for the file
         '''
+        self.load_order_generation += 1
         return self.set_flag(id_,
-                             'File Header\\Record Header\\Record Flags',
                              'ESM',
                              state,
+                             path='File Header\\Record Header\\Record Flags',
+                             ex=ex)
+
+    def get_is_esl(self, id_, ex=True):
+        '''
+        Returns whether the file is flagged as an ESL
+
+        Args:
+            id\\_ (``int``)
+                id handle of file
+
+        Returns:
+            (``bool``) whether file is esl
+        '''
+        return self.get_flag(id_,
+                             'ESL',
+                             path='File Header\\Record Header\\Record Flags',
+                             ex=ex)
+
+    def set_is_esl(self, id_, state, ex=True):
+        '''
+        Set the ESL flag state for a file
+
+        Args:
+            id\\_ (``int``)
+                id handle of file
+            state (``bool``)
+                whether to enable or disable the esl flag for the file
+        '''
+        self.load_order_generation += 1
+        return self.set_flag(id_,
+                             'ESL',
+                             state,
+                             path='File Header\\Record Header\\Record Flags',
                              ex=ex)
@@ -13,6 +13,7 @@ class FilesMethods(WrapperMethodsBase):
         Returns:
             (``int``) id handle to newly added file
         '''
+        self.load_order_generation += 1
         return self.get_handle(
             lambda res: self.raw_api.AddFile(file_name, ignore_exists, res),
             error_msg=f'Failed to add new file {file_name}',
@@ -88,6 +89,7 @@ class FilesMethods(WrapperMethodsBase):
             id\\_ (``int``)
                 id handle of file
         '''
+        self.load_order_generation += 1
         return self.verify_execution(
             self.raw_api.NukeFile(id_),
             error_msg=f'Failed to nuke file: {id_}',
@@ -103,10 +105,11 @@ class FilesMethods(WrapperMethodsBase):
             new_file_name (``str``)
                 new name to rename to
         '''
+        self.load_order_generation += 1
         return self.verify_execution(
             self.raw_api.RenameFile(id_, new_file_name),
-            error_msg=f'Failed to rename file {self.element_context(id_)} to '
-                      f'{new_file_name}',
+            error_msg=lambda: f'Failed to rename file {self.element_context(id_)} to '
+                              f'{new_file_name}',
             ex=ex)
 
     def save_file(self, id_, file_path='', ex=True):
@@ -124,7 +127,8 @@ class FilesMethods(WrapperMethodsBase):
         '''
         return self.verify_execution(
             self.raw_api.SaveFile(id_, file_path),
-            error_msg=f'Failed to save file {self.element_context(id_)}',
+            error_msg=lambda: f'Failed to save file '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_record_count(self, id_, ex=True):
@@ -140,8 +144,8 @@ class FilesMethods(WrapperMethodsBase):
         '''
         return self.get_integer(
             lambda res: self.raw_api.GetRecordCount(id_, res),
-            error_msg=f'Failed to get record count for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get record count for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_override_record_count(self, id_, ex=True):
@@ -157,8 +161,8 @@ class FilesMethods(WrapperMethodsBase):
         '''
         return self.get_integer(
             lambda res: self.raw_api.GetOverrideRecordCount(id_, res),
-            error_msg=f'Failed to get override record count for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get override record count for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def md5_hash(self, id_, ex=True):
@@ -174,7 +178,8 @@ class FilesMethods(WrapperMethodsBase):
         '''
         return self.get_string(
             lambda len_: self.raw_api.MD5Hash(id_, len_),
-            error_msg=f'Failed to get MD5 Hash for {self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get MD5 Hash for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def crc_hash(self, id_, ex=True):
@@ -190,7 +195,8 @@ class FilesMethods(WrapperMethodsBase):
         '''
         return self.get_string(
             lambda len_: self.raw_api.CRCHash(id_, len_),
-            error_msg=f'Failed to get CRC Hash for {self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get CRC Hash for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_file_load_order(self, id_, ex=True):
@@ -206,7 +212,8 @@ class FilesMethods(WrapperMethodsBase):
         '''
         return self.get_integer(
             lambda res: self.raw_api.GetFileLoadOrder(id_, res),
-            error_msg=f'Failed to load order for ${self.element_context(id_)}',
+            error_msg=lambda: f'Failed to load order for '
+                              f'${self.element_context(id_)}',
             ex=ex)
 
     def get_file_header(self, id_, ex=True):
@@ -228,8 +235,8 @@ class FilesMethods(WrapperMethodsBase):
         '''
         return self.verify_execution(
             self.raw_api.SortEditorIDs(id_, sig),
-            error_msg=f'Failed to sort {sig} EditorIDs for: '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to sort {sig} EditorIDs for: '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def sort_names(self, id_, sig, ex=True):
@@ -238,6 +245,6 @@ class FilesMethods(WrapperMethodsBase):
         '''
         return self.verify_execution(
             self.raw_api.SortNames(id_, sig),
-            error_msg=f'Failed to sort {sig} Names for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to sort {sig} Names for '
+                              f'{self.element_context(id_)}',
             ex=ex)
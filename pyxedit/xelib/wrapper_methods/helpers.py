@@ -10,15 +10,67 @@ class XelibError(Exception):
     pass
 
 
+class ImageData:
+    '''
+    Pixel data of an image retrieved from xedit-lib, such as by
+    ``xelib.get_texture_data``.
+
+    Attributes:
+        width (``int``):
+            the width of the image, in pixels
+        height (``int``):
+            the height of the image, in pixels
+        format (``str``):
+            the order of the channels of each pixel; xedit-lib provides 8 bit
+            ``BGRA`` pixels
+        data (``memoryview``):
+            the pixel data, shaped ``(height, width, 4)``; NumPy can wrap it
+            without copying with ``numpy.asarray(image.data)``
+    '''
+    CHANNELS = 4
+
+    def __init__(self, width, height, data, format='BGRA'):
+        self.width = width
+        self.height = height
+        self.data = data
+        self.format = format
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} {self.width}x{self.height} '
+                f'{self.format}>')
+
+    def tobytes(self):
+        return self.data.tobytes()
+
+
 class HelpersMethods(WrapperMethodsBase):
     def verify_execution(self, result, error_msg='', ex=True):
         '''
         If result is false, raise XelibError with given message
         '''
         if not result and ex:
-            raise XelibError(f'{error_msg}: {self.get_xelib_error_str()}')
+            raise self.xelib_error(error_msg)
         return bool(result)
 
+    def xelib_error(self, error_msg, details=''):
+        '''
+        Builds the ``XelibError`` to raise for a failed api call.
+
+        ``error_msg`` can be a string, or a callable returning one. Error
+        messages typically describe the elements involved, which takes further
+        api calls (see ``element_context``); passing a callable defers those
+        calls to here, so that they are only made once a call has actually
+        failed, and not on every successful one.
+
+        The xedit-lib exception message is retrieved before the error message
+        is built, so that api calls made while building it cannot replace it.
+        '''
+        xelib_error_str = self.get_xelib_error_str()
+        if callable(error_msg):
+            error_msg = error_msg()
+        message = ': '.join(part for part in (error_msg, details) if part)
+        return XelibError(f'{message}: {xelib_error_str}')
+
     def get_string(self, callback, method=None, error_msg='', ex=True):
         '''
         Helper for retrieving the string result of a callback function.
@@ -36,7 +88,6 @@ class HelpersMethods(WrapperMethodsBase):
         whole process for you.
         '''
         method = method or self.raw_api.GetResultString
-        error_prefix = f'{error_msg}: ' if error_msg else ''
 
         # need a c_int to pass by reference to the given callback
         len_ = ctypes.c_int()
@@ -44,9 +95,9 @@ class HelpersMethods(WrapperMethodsBase):
         # run the callback, pass len_ into it by reference
         result = callback(ctypes.byref(len_))
         if not result and ex:
-            raise XelibError(f'{error_prefix}Call to {repr(callback)} with '
-                             f'parameter {repr(len_)} failed: '
-                             f'{self.get_xelib_error_str()}')
+            raise self.xelib_error(error_msg,
+                                   f'Call to {repr(callback)} with '
+                                   f'parameter {repr(len_)} failed')
 
         # len_ should now contain the string length; if it does not look like
         # the length of a nonempty string, just return an empty string
@@ -63,10 +114,10 @@ class HelpersMethods(WrapperMethodsBase):
         if method(buffer, len_):
             return buffer.value
         else:
-            raise XelibError(f'{error_prefix}Failed to retrieve string via '
-                             f'method {repr(method)}, buffer `{repr(buffer)}`, '
-                             f'and length `{repr(len_)}`: '
-                             f'{self.get_xelib_error_str()}')
+            raise self.xelib_error(error_msg,
+                                   f'Failed to retrieve string via '
+                                   f'method {repr(method)}, buffer `{repr(buffer)}`, '
+                                   f'and length `{repr(len_)}`')
 
     def get_handle(self, callback, error_msg='', ex=True):
         '''
@@ -74,63 +125,53 @@ class HelpersMethods(WrapperMethodsBase):
         'gets a handle' tend to want us to pass a c_uint by reference for it to
         put the handle there. This helper function takes care of this pattern.
         '''
-        error_prefix = f'{error_msg}: ' if error_msg else ''
-
         res = ctypes.c_uint()
         if not callback(ctypes.byref(res)):
             if ex:
-                raise XelibError(f'{error_prefix}Call to {repr(callback)} with '
-                                 f'parameter {repr(res)} failed: '
-                                 f'{self.get_xelib_error_str()}')
+                raise self.xelib_error(error_msg,
+                                       f'Call to {repr(callback)} with '
+                                       f'parameter {repr(res)} failed')
         if res.value:
             self.track_handle(res.value)
         return res.value
 
     def get_integer(self, callback, error_msg='', ex=True):
-        error_prefix = f'{error_msg}: ' if error_msg else ''
-
         res = ctypes.c_int()
         if not callback(ctypes.byref(res)):
             if ex:
-                raise XelibError(f'{error_prefix}Call to {repr(callback)} with '
-                                 f'parameter {repr(res)} failed: '
-                                 f'{self.get_xelib_error_str()}')
+                raise self.xelib_error(error_msg,
+                                       f'Call to {repr(callback)} with '
+                                       f'parameter {repr(res)} failed')
             return None
         return res.value
 
     def get_unsigned_integer(self, callback, error_msg='', ex=True):
-        error_prefix = f'{error_msg}: ' if error_msg else ''
-
         res = ctypes.c_uint()
         if not callback(ctypes.byref(res)):
             if ex:
-                raise XelibError(f'{error_prefix}Call to {repr(callback)} with '
-                                 f'parameter {repr(res)} failed: '
-                                 f'{self.get_xelib_error_str()}')
+                raise self.xelib_error(error_msg,
+                                       f'Call to {repr(callback)} with '
+                                       f'parameter {repr(res)} failed')
             return None
         return res.value
 
     def get_bool(self, callback, error_msg='', ex=True):
-        error_prefix = f'{error_msg}: ' if error_msg else ''
-
         res = ctypes.c_ushort()
         if not callback(ctypes.byref(res)):
             if ex:
-                raise XelibError(f'{error_prefix}Call to {repr(callback)} with '
-                                 f'parameter {repr(res)} failed: '
-                                 f'{self.get_xelib_error_str()}')
+                raise self.xelib_error(error_msg,
+                                       f'Call to {repr(callback)} with '
+                                       f'parameter {repr(res)} failed')
             return None
         return bool(res.value)
 
     def get_double(self, callback, error_msg='', ex=True):
-        error_prefix = f'{error_msg}: ' if error_msg else ''
-
         res = ctypes.c_double()
         if not callback(ctypes.byref(res)):
             if ex:
-                raise XelibError(f'{error_prefix}Call to {repr(callback)} with '
-                                 f'parameter {repr(res)} failed: '
-                                 f'{self.get_xelib_error_str()}')
+                raise self.xelib_error(error_msg,
+                                       f'Call to {repr(callback)} with '
+                                       f'parameter {repr(res)} failed')
             return None
         return res.value
 
@@ -140,27 +181,23 @@ class HelpersMethods(WrapperMethodsBase):
         pass a c_ubyte by reference for it to put the byte data there. This
         helper function takes care of this pattern.
         '''
-        error_prefix = f'{error_msg}: ' if error_msg else ''
-
         res = ctypes.c_ubyte()
         if not callback(ctypes.byref(res)):
             if ex:
-                raise XelibError(f'{error_prefix}Call to {repr(callback)} with '
-                                 f'parameter {repr(res)} failed: '
-                                 f'{self.get_xelib_error_str()}')
+                raise self.xelib_error(error_msg,
+                                       f'Call to {repr(callback)} with '
+                                       f'parameter {repr(res)} failed')
             return None
         return res.value
 
     def get_two_bytes(self, callback, error_msg='', ex=True):
-        error_prefix = f'{error_msg}: ' if error_msg else ''
-
         res1 = ctypes.c_ubyte()
         res2 = ctypes.c_ubyte()
         if not callback(ctypes.byref(res1), ctypes.byref(res2)):
             if ex:
-                raise XelibError(f'{error_prefix}Call to {repr(callback)} with '
-                                 f'parameters {repr(res1)}, {repr(res2)} failed: '
-                                 f'{self.get_xelib_error_str()}')
+                raise self.xelib_error(error_msg,
+                                       f'Call to {repr(callback)} with '
+                                       f'parameters {repr(res1)}, {repr(res2)} failed')
             return None, None
         return res1.value, res2.value
 
@@ -169,7 +206,6 @@ class HelpersMethods(WrapperMethodsBase):
         Gets an array, similar pattern to how strings are gotten
         '''
         method = method or self.raw_api.GetResultArray
-        error_prefix = f'{error_msg}: ' if error_msg else ''
 
         # need a c_int to pass by reference to the given callback
         len_ = ctypes.c_int()
@@ -177,9 +213,9 @@ class HelpersMethods(WrapperMethodsBase):
         # run the callback, pass len_ into it by reference
         result = callback(ctypes.byref(len_))
         if not result and ex:
-            raise XelibError(f'{error_prefix}Call to {repr(callback)} with '
-                             f'parameter {repr(len_)} failed: '
-                             f'{self.get_xelib_error_str()}')
+            raise self.xelib_error(error_msg,
+                                   f'Call to {repr(callback)} with '
+                                   f'parameter {repr(len_)} failed')
 
         # len_ should now contain the array length; if it does not look like the
         # length of a nonempty array, just return an empty array
@@ -200,10 +236,10 @@ class HelpersMethods(WrapperMethodsBase):
                 self.track_handle(item)
             return items
         else:
-            raise XelibError(f'{error_prefix}Failed to retrieve array via '
-                             f'method {repr(method)}, buffer `{repr(buffer)}`, '
-                             f'and length `{repr(len_)}`: '
-                             f'{self.get_xelib_error_str()}')
+            raise self.xelib_error(error_msg,
+                                   f'Failed to retrieve array via '
+                                   f'method {repr(method)}, buffer `{repr(buffer)}`, '
+                                   f'and length `{repr(len_)}`')
 
     def get_string_array(self, callback, method=None, error_msg='', ex=True):
         method = method or self.raw_api.GetResultString
@@ -212,8 +248,46 @@ class HelpersMethods(WrapperMethodsBase):
                                error_msg=error_msg,
                                ex=ex).splitlines()
 
-    def get_image_data(self, callback, error_msg=''):
-        raise NotImplementedError('Implement Me!')
+    def get_image_data(self, callback, buffer=None, error_msg='', ex=True):
+        '''
+        Gets image data. The callback is passed a width and a height integer by
+        reference to put the image dimensions on, after which the pixels are
+        copied out of xedit-lib's result bytes with ``GetResultBytes``.
+
+        Pixels are copied straight into ``buffer`` (a ``bytearray``) if it is
+        given and large enough, otherwise into a newly allocated one, and the
+        returned ``ImageData`` is a view over that buffer, with no further
+        copies made.
+        '''
+        width = ctypes.c_int()
+        height = ctypes.c_int()
+        if not callback(ctypes.byref(width), ctypes.byref(height)):
+            if ex:
+                raise self.xelib_error(error_msg,
+                                       f'Call to {repr(callback)} with '
+                                       f'parameters {repr(width)}, '
+                                       f'{repr(height)} failed')
+            return None
+
+        size = width.value * height.value * ImageData.CHANNELS
+        if size < 1:
+            return ImageData(width.value, height.value, memoryview(b''))
+
+        if buffer is None or len(buffer) < size:
+            buffer = bytearray(size)
+
+        # have xedit-lib write into the python buffer directly
+        result_bytes = (ctypes.c_ubyte * size).from_buffer(buffer)
+        succeeded = self.raw_api.GetResultBytes(result_bytes, size)
+        del result_bytes
+        if not succeeded:
+            raise self.xelib_error(error_msg,
+                                   f'Failed to retrieve {size} result bytes '
+                                   f'for {width.value}x{height.value} image')
+
+        data = memoryview(buffer)[:size].cast(
+            'B', (height.value, width.value, ImageData.CHANNELS))
+        return ImageData(width.value, height.value, data)
 
     def get_dictionary(self, callback, method=None, error_msg='', ex=True):
         method = method or self.raw_api.GetResultString
@@ -10,10 +10,11 @@ class MastersMethods(WrapperMethodsBase):
             id\\_ (``int``)
                 id handle of file
         '''
+        self.load_order_generation += 1
         return self.verify_execution(
             self.raw_api.CleanMasters(id_),
-            error_msg=f'Failed to clean masters in: '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to clean masters in: '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def sort_masters(self, id_, ex=True):
@@ -25,10 +26,11 @@ class MastersMethods(WrapperMethodsBase):
             id\\_ (``int``)
                 id handle of file
         '''
+        self.load_order_generation += 1
         return self.verify_execution(
             self.raw_api.SortMasters(id_),
-            error_msg=f'Failed to sort masters in: '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to sort masters in: '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def add_master(self, id_, file_name, ex=True):
@@ -41,10 +43,28 @@ class MastersMethods(WrapperMethodsBase):
             file_name (``str``)
                 name of master to add
         '''
+        self.load_order_generation += 1
         return self.verify_execution(
             self.raw_api.AddMaster(id_, file_name),
-            error_msg=f'Failed to add master {file_name} to file: '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to add master {file_name} to file: '
+                              f'{self.element_context(id_)}',
+            ex=ex)
+
+    def add_masters(self, id_, file_names, ex=True):
+        '''
+        Add several masters to a file at once
+
+        Args:
+            id\\_ (``int``)
+                id handle of file
+            file_names (``List[str]``)
+                names of masters to add, in the order to add them in
+        '''
+        self.load_order_generation += 1
+        return self.verify_execution(
+            self.raw_api.AddMasters(id_, '\r\n'.join(file_names)),
+            error_msg=lambda: f'Failed to add masters {file_names} to file: '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def add_required_masters(self, id_, id2, as_new=False, ex=True):
@@ -61,11 +81,12 @@ class MastersMethods(WrapperMethodsBase):
                 whether the copy is intended to be copied as new record instead
                 of copied as override
         '''
+        self.load_order_generation += 1
         return self.verify_execution(
             self.raw_api.AddRequiredMasters(id_, id2, as_new),
-            error_msg=f'Failed to add required masters for '
-                      f'{self.element_context(id_)} to file: '
-                      f'{self.element_context(id2)}',
+            error_msg=lambda: f'Failed to add required masters for '
+                              f'{self.element_context(id_)} to file: '
+                              f'{self.element_context(id2)}',
             ex=ex)
 
     def get_masters(self, id_, ex=True):
@@ -81,7 +102,8 @@ class MastersMethods(WrapperMethodsBase):
         '''
         return self.get_array(
             lambda len_: self.raw_api.GetMasters(id_, len_),
-            error_msg=f'Failed to get masters for {self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get masters for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_required_by(self, id_, ex=True):
@@ -98,8 +120,8 @@ class MastersMethods(WrapperMethodsBase):
         '''
         return self.get_array(
             lambda len_: self.raw_api.GetRequiredBy(id_, len_),
-            error_msg=f'Failed to get required by for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get required by for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_master_names(self, id_, ex=True):
@@ -115,8 +137,8 @@ class MastersMethods(WrapperMethodsBase):
         '''
         return self.get_string_array(
             lambda len_: self.raw_api.GetMasterNames(id_, len_),
-            error_msg=f'Failed to get master names for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to get master names for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def add_all_masters(self, id_, ex=True):
@@ -1,6 +1,15 @@
+from collections import deque
 from enum import Enum, unique
+import hashlib
+from itertools import islice
+import json
+import os
+from pathlib import Path
+import shutil
+import time
 
 from pyxedit.xelib.wrapper_methods.base import WrapperMethodsBase
+from pyxedit.xelib.wrapper_methods.helpers import ImageData
 
 
 @unique
@@ -34,8 +43,95 @@ class ArchiveTypes(Enum):
     FO4dds = 5
 
 
+# file extensions each archive group is made up of when packing; anything
+# that doesn't fall in one of these groups goes in the main archive
+ARCHIVE_GROUPS = {
+    'Textures': ('.dds', '.png', '.tga'),
+    'Sounds': ('.wav', '.xwm', '.fuz', '.lip'),
+}
+
+# archive groups whose files should never be compressed, as the game streams
+# them directly out of the archive
+UNCOMPRESSED_ARCHIVE_GROUPS = ('Sounds',)
+
+# name of the manifest file ``xelib.extract_files`` keeps in its destination
+# folder, recording what has been extracted there
+EXTRACT_MANIFEST = '.pyxedit-extract.json'
+
+
+class ResourceStats:
+    '''
+    Throughput metrics for a batch of resource operations, as returned by
+    ``xelib.extract_files`` and ``xelib.pack_archives``.
+
+    Attributes:
+        files (``int``):
+            number of files processed
+        bytes (``int``):
+            total size of the files processed
+        skipped (``int``):
+            number of files skipped, since they were already up to date
+        failed (``List[str]``):
+            paths of the files that could not be processed
+        elapsed (``float``):
+            wall time taken, in seconds
+    '''
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.skipped = 0
+        self.failed = []
+        self.elapsed = 0.0
+        self._started = time.perf_counter()
+
+    def stop(self):
+        self.elapsed = time.perf_counter() - self._started
+        return self
+
+    @property
+    def files_per_second(self):
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self):
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} files={self.files} '
+                f'bytes={self.bytes} skipped={self.skipped} '
+                f'failed={len(self.failed)} elapsed={self.elapsed:.2f}s '
+                f'({self.files_per_second:.1f} files/s, '
+                f'{self.bytes_per_second / 2 ** 20:.1f} MiB/s)>')
+
+
+def file_digest(path, chunk_size=2 ** 20):
+    '''
+    Returns the sha1 hex digest of the file at ``path``, reading it in chunks
+    so that large files are never held in memory whole.
+    '''
+    digest = hashlib.sha1()
+    with open(path, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def archive_group(file_path):
+    '''
+    Returns the name of the archive group a file is packed into, or ``''``
+    for the main archive. See ``ARCHIVE_GROUPS``.
+    '''
+    suffix = Path(file_path).suffix.lower()
+    for group, suffixes in ARCHIVE_GROUPS.items():
+        if suffix in suffixes:
+            return group
+    return ''
+
+
 class ResourcesMethods(WrapperMethodsBase):
     ArchiveTypes = ArchiveTypes
+    ImageData = ImageData
+    ResourceStats = ResourceStats
 
     def extract_container(self, name, dst, replace):
         '''
@@ -56,8 +152,8 @@ class ResourcesMethods(WrapperMethodsBase):
 
     def extract_file(self, name, src, dst):
         '''
-        Extracts the file ``src`` from a ``.bsa`` container to the
-        destination folder ``dst``.
+        Extracts the file ``src`` from a ``.bsa`` container to the file path
+        ``dst``.
 
         Args:
             name (``str``):
@@ -65,7 +161,7 @@ class ResourcesMethods(WrapperMethodsBase):
             src (``str``):
                 a file path within ``.bsa`` to extract
             dst (``str``):
-                the path to the destination folder to extract file to
+                the full path of the file to extract to
 
         Returns:
             (``bool``) whether file extraction is successful
@@ -170,6 +266,10 @@ class ResourcesMethods(WrapperMethodsBase):
             ff (``str``):
                 a hex integer in string form, used to set custom file flags
         '''
+        # xedit-lib takes the file paths as a single newline separated string
+        if not isinstance(file_paths, str):
+            file_paths = '\n'.join(file_paths)
+
         return self.verify_execution(
             self.raw_api.BuildArchive(name,
                                       folder,
@@ -182,16 +282,297 @@ class ResourcesMethods(WrapperMethodsBase):
             error_msg=f'Failed to build archive {name}',
             ex=ex)
 
-    def get_texture_data(self, resource_name, ex=True):
+    def extract_files(self,
+                      name,
+                      dst,
+                      file_paths=None,
+                      folder='',
+                      max_workers=4,
+                      window=64,
+                      verify_hash=True,
+                      progress=None):
+        '''
+        Extracts many files out of a ``.bsa`` container, into the destination
+        folder ``dst``, keeping their paths within the container.
+
+        Files are extracted one at a time on the calling thread, since
+        ``XEditLib.dll`` is not thread-safe; checking whether files are
+        already extracted and hashing the extracted files is handed out to a
+        pool of ``max_workers`` threads, with at most ``window`` files queued
+        for each at a time, so memory use stays flat regardless of how many
+        files are extracted.
+
+        A manifest of the files extracted (their size and sha1 hash, and the
+        container they came from) is kept in ``dst``. Files that are already
+        present with the recorded size and hash, extracted from the same
+        unchanged container, are skipped.
+
+        Args:
+            name (``str``):
+                the path to the ``.bsa`` container file; it must be loaded
+            dst (``str``):
+                the path to the destination folder to extract files to
+            file_paths (``List[str]``):
+                the file paths within the container to extract; if not given,
+                every file within ``folder`` is extracted
+            folder (``str``):
+                a subfolder within the container to limit extraction to, when
+                ``file_paths`` is not given
+            max_workers (``int``):
+                the number of threads to check and hash files with
+            window (``int``):
+                the maximum number of files queued for checking, and for
+                hashing, at a time
+            verify_hash (``bool``):
+                whether to compare hashes, and not only sizes, when deciding
+                whether a file can be skipped
+            progress (``Callable[[int, int, str], None]``):
+                an optional callable, invoked as
+                ``progress(num_done, num_total, file_path)`` as files finish
+
+        Returns:
+            (``ResourceStats``) throughput metrics for the extraction
+        '''
+        # imported here rather than with pyxedit, to keep startup lean
+        from concurrent.futures import ThreadPoolExecutor
+
+        stats = ResourceStats()
+        if file_paths is None:
+            file_paths = self.get_container_files(name, folder)
+
+        dst = Path(dst)
+        dst.mkdir(parents=True, exist_ok=True)
+        manifest_path = dst / EXTRACT_MANIFEST
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            manifest = {}
+
+        # entries are only good for the exact container they were made from
+        container_stat = Path(name).stat()
+        container = [str(Path(name).resolve()),
+                     container_stat.st_size,
+                     container_stat.st_mtime_ns]
+        if manifest.get('container') != container:
+            manifest = {'container': container, 'files': {}}
+        entries = manifest['files']
+
+        def is_current(file_path):
+            entry = entries.get(file_path)
+            target = dst / file_path
+            if not entry or not target.is_file():
+                return False
+            if target.stat().st_size != entry['size']:
+                return False
+            return not verify_hash or file_digest(target) == entry['sha1']
+
+        def entry_for(target):
+            return {'size': target.stat().st_size,
+                    'sha1': file_digest(target)}
+
+        def report(file_path):
+            if progress:
+                progress(stats.files + stats.skipped + len(stats.failed),
+                         len(file_paths),
+                         file_path)
+
+        def finish(file_path, future):
+            entry = future.result()
+            entries[file_path] = entry
+            stats.files += 1
+            stats.bytes += entry['size']
+            report(file_path)
+
+        # xedit-lib keeps global result and exception state, so it is only
+        # ever called from this thread; the workers check whether files are
+        # current and hash extracted files, which is python-side IO only
+        checks = deque()
+        hashing = deque()
+        pending = iter(file_paths)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                def check_ahead():
+                    for file_path in islice(pending, window - len(checks)):
+                        checks.append((file_path,
+                                       pool.submit(is_current, file_path)))
+
+                check_ahead()
+                while checks:
+                    file_path, current = checks.popleft()
+                    check_ahead()
+                    if current.result():
+                        stats.skipped += 1
+                        report(file_path)
+                        continue
+
+                    target = dst / file_path
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    if not self.extract_file(name, file_path, str(target)):
+                        entries.pop(file_path, None)
+                        stats.failed.append(file_path)
+                        report(file_path)
+                        continue
+
+                    if len(hashing) >= window:
+                        finish(*hashing.popleft())
+                    hashing.append((file_path, pool.submit(entry_for, target)))
+                while hashing:
+                    finish(*hashing.popleft())
+        finally:
+            manifest_path.write_text(json.dumps(manifest), encoding='utf-8')
+
+        return stats.stop()
+
+    def pack_archives(self,
+                      name,
+                      folder,
+                      files,
+                      archive_type,
+                      compress=True,
+                      share=False,
+                      staging_folder=None,
+                      max_workers=4):
+        '''
+        Packs files into archives, grouped by type the way the games expect;
+        textures go in a ``<name> - Textures`` archive, sounds in an
+        uncompressed ``<name> - Sounds`` archive, and everything else in the
+        main ``<name>`` archive. For ``ArchiveTypes.FO4``, textures are packed
+        with ``ArchiveTypes.FO4dds``.
+
+        Files are first staged, concurrently, into one staging folder per group
+        (hard linked where possible, copied otherwise), so that each archive is
+        built with a single ``xelib.build_archive`` call, and then moved into
+        ``folder``. Staging is python-side IO only; ``XEditLib.dll``, which is
+        not thread-safe, is only called from the calling thread.
+
+        Args:
+            name (``str``):
+                name of the main archive, e.g. ``MyMod.bsa``
+            folder (``str``):
+                folder to create the archives in
+            files (``Dict[str, str]``):
+                a mapping of file paths within the archive to the paths of the
+                source files on disk
+            archive_type (``Xelib.ArchiveTypes``):
+                enum representing the type of archive to use
+            compress (``bool``):
+                whether to compress the archives, except for sound archives
+            share (``bool``):
+                whether to pack the data
+            staging_folder (``str``):
+                folder to stage files in; defaults to a ``.staging`` folder
+                within ``folder``, which is removed afterwards
+            max_workers (``int``):
+                the number of threads to stage files with
+
+        Returns:
+            (``ResourceStats``) throughput metrics for the packing
+        '''
+        from concurrent.futures import ThreadPoolExecutor
+
+        stats = ResourceStats()
+        folder = Path(folder)
+        remove_staging = staging_folder is None
+        staging = Path(staging_folder or folder / '.staging')
+
+        groups = {}
+        for archive_path, source in files.items():
+            groups.setdefault(archive_group(archive_path), {})[archive_path] = source
+
+        def stage(group_folder, archive_path, source):
+            target = group_folder / archive_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.exists():
+                target.unlink()
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copy2(source, target)
+            return target.stat().st_size
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                staged = [
+                    pool.submit(stage, staging / (group or 'Main'), archive_path,
+                                source)
+                    for group, group_files in groups.items()
+                    for archive_path, source in group_files.items()]
+                stats.bytes = sum(future.result() for future in staged)
+
+            stem, suffix = Path(name).stem, Path(name).suffix
+            for group, group_files in groups.items():
+                group_folder = staging / (group or 'Main')
+                group_name = f'{stem} - {group}{suffix}' if group else name
+                group_type = archive_type
+                if group == 'Textures' and archive_type == ArchiveTypes.FO4:
+                    group_type = ArchiveTypes.FO4dds
+
+                built = self.build_archive(
+                    group_name,
+                    str(group_folder),
+                    list(group_files),
+                    group_type,
+                    compress=compress and group not in UNCOMPRESSED_ARCHIVE_GROUPS,
+                    share=share,
+                    ex=False)
+                if built:
+                    folder.mkdir(parents=True, exist_ok=True)
+                    shutil.move(str(group_folder / group_name),
+                                str(folder / group_name))
+                    stats.files += len(group_files)
+                else:
+                    stats.failed.append(group_name)
+        finally:
+            if remove_staging:
+                shutil.rmtree(staging, ignore_errors=True)
+
+        return stats.stop()
+
+    def get_texture_data(self, resource_name, buffer=None, ex=True):
         '''
         Return the pixel image data for the texture resource ``resource_name``
 
-        .. note::
-            This is currently not implemented in ``pyxedit``. Invoking this
-            function will raise ``NotImplementedError``.
+        Args:
+            resource_name (``str``):
+                the path of the texture resource, e.g.
+                ``textures\\sky\\skyrimclouds01.dds``
+            buffer (``bytearray``):
+                an optional buffer to copy the pixels into, if large enough;
+                otherwise a new buffer is allocated
+
+        Returns:
+            (``ImageData``) the texture's dimensions and pixel data
         '''
         return self.get_image_data(
             lambda width, height:
                 self.raw_api.GetTextureData(resource_name, width, height),
+            buffer=buffer,
             error_msg=f'Failed to get texture data for {resource_name}',
             ex=ex)
+
+    def get_texture_data_many(self, resource_names, copy=False, ex=True):
+        '''
+        Produces ``(resource_name, image_data)`` pairs for many texture
+        resources, reusing a single buffer across all of them; the buffer is
+        only reallocated when a texture larger than any before it comes up.
+
+        As the buffer is reused, each ``ImageData`` produced is only valid
+        until the next one is produced, unless ``copy`` is set.
+
+        Args:
+            resource_names (``Iterable[str]``):
+                the paths of the texture resources
+            copy (``bool``):
+                if set to true, each ``ImageData`` gets its own copy of the
+                pixels, so that it stays valid
+        '''
+        buffer = bytearray()
+        for resource_name in resource_names:
+            image = self.get_texture_data(resource_name, buffer=buffer, ex=ex)
+            if image is not None:
+                if image.data.obj is not buffer and image.data.nbytes:
+                    buffer = image.data.obj
+                if copy:
+                    image.data = memoryview(bytearray(image.data)).cast(
+                        'B', image.data.shape)
+            yield resource_name, image
@@ -215,6 +215,7 @@ class SetupMethods(WrapperMethodsBase):
             use_dummies (``bool``):
                 TODO: to be written
         '''
+        self.load_order_generation += 1
         return self.verify_execution(
             self.raw_api.LoadPlugins(load_order, smart_load, use_dummies),
             error_msg=f'Failed to LoadPlugins given load_order '
@@ -233,6 +234,7 @@ class SetupMethods(WrapperMethodsBase):
             file_name (``str``):
                 the name of the plugin to further load into the current session
         '''
+        self.load_order_generation += 1
         return self.verify_execution(
             self.raw_api.LoadPlugin(file_name),
             error_msg=f'Failed to load {file_name}',
@@ -253,6 +255,7 @@ class SetupMethods(WrapperMethodsBase):
         Returns:
             (``int``) a handle to the loaded plugin header
         '''
+        self.load_order_generation += 1
         return self.get_handle(
             lambda res: self.raw_api.LoadPluginHeader(file_name, res),
             error_msg=f'Failed to load plugin header for {file_name}',
@@ -273,8 +276,8 @@ class SetupMethods(WrapperMethodsBase):
         '''
         return self.verify_execution(
             self.raw_api.BuildReferences(id_, sync),
-            error_msg=f'Failed to build references for '
-                      f'{self.element_context(id_)}',
+            error_msg=lambda: f'Failed to build references for '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def unload_plugin(self, id_, ex=True):
@@ -287,9 +290,11 @@ class SetupMethods(WrapperMethodsBase):
             id\\_ (``int``):
                 the handle to the plugin file to unload
         '''
+        self.load_order_generation += 1
         return self.verify_execution(
             self.raw_api.UnloadPlugin(id_),
-            error_msg=f'Failed to unload plugin {self.element_context(id_)}',
+            error_msg=lambda: f'Failed to unload plugin '
+                              f'{self.element_context(id_)}',
             ex=ex)
 
     def get_loader_status(self, ex=True):
@@ -1,12 +1,10 @@
-import ctypes
 from contextlib import contextmanager
-from ctypes import wintypes
-from itertools import tee
 from pathlib import Path
 import os
 import time
 
-from pyxedit.xelib.definitions import DelphiTypes, XEditLibSignatures
+from pyxedit.xelib.backends import DLLBackend
+from pyxedit.xelib.call_patterns import CallPatternDetector, DetectingAPI
 from pyxedit.xelib.wrapper_methods.element_values import ElementValuesMethods
 from pyxedit.xelib.wrapper_methods.elements import ElementsMethods
 from pyxedit.xelib.wrapper_methods.errors import ErrorsMethods
@@ -29,16 +27,6 @@ __all__ = ['DLL_PATH', 'Xelib', 'XelibError']
 DLL_PATH = Path(__file__).parent / '../xedit-lib/XEditLib.dll'
 
 
-def pairwise(iterable):
-    '''
-    A pairwise iterator, copied from:
-        https://docs.python.org/3/library/itertools.html
-    '''
-    a, b = tee(iterable)
-    next(b, None)
-    return zip(a, b)
-
-
 def with_debug_log(method=False):
     '''
     A decorator for debugging purposes. It can be used to wrap around a
@@ -94,6 +82,9 @@ class XelibWrapperAPI:
     something on the CDLL object will be interjected and given a `with_log_debug`
     wrapper around that same call. This way, all calls to XEditLib.dll can have
     its calling signature and return values logged for inspection.
+
+    To capture the calls in a form that can be replayed later, see
+    ``RecordingBackend`` and ``ReplayBackend`` in ``pyxedit.xelib.backends``.
     '''
     def __init__(self, raw_api):
         # keeps a reference to CDLL object
@@ -129,11 +120,15 @@ class Xelib(ElementValuesMethods,
             ResourcesMethods,
             SerializationMethods,
             SetupMethods):
+    # how many handles queued with `defer_release` are released together
+    release_batch_size = 256
+
     def __init__(self,
                  game_mode=SetupMethods.GameModes.SSE,
                  game_path=None,
                  plugins=None,
-                 xeditlib_path=None):
+                 xeditlib_path=None,
+                 backend=None):
         '''
         ``Xelib`` class initializer.
 
@@ -161,6 +156,12 @@ class Xelib(ElementValuesMethods,
                 functions exist in ``XEditLib.dll`` and what their signatures
                 are. If your provided ``XEditLib.dll`` does not have a perfectly
                 matching API, there will likely be all kinds of errors.
+
+            backend (``XelibBackend``):
+                Where to load the raw API from. Defaults to a ``DLLBackend``,
+                which loads ``XEditLib.dll``; a ``SimulatedBackend`` runs
+                against an in-memory simulation of it instead, which also
+                works on platforms other than Windows.
         '''
         # Initialization attributes
         self._game_mode = game_mode
@@ -169,12 +170,45 @@ class Xelib(ElementValuesMethods,
 
         # XEditLib.dll entry points
         self.dll_path = xeditlib_path or DLL_PATH
+        self.backend = backend or DLLBackend()
         self._raw_api = None
         self._wrapper_api = None  # point `raw_api` to this to log debug calls
+        self._detecting_api = None  # see `detect_call_patterns`
+
+        # Attributes for handle management; every tracked handle has an entry
+        # in the handle table, mapping it to the id of the handle management
+        # stack layer tracking it and the generation it was tracked in, and
+        # each layer keeps the set of its handles for releasing them all at
+        # once. XEditLib.dll reuses the ids of released handles, so the
+        # generation, which goes up every time a handle is tracked, tells a
+        # reissued handle apart from the one released before it
+        self._handle_table = {}
+        self._handle_generation = 0
+        self._layer_stack = [0]
+        self._layer_handles = {0: set()}
+        self._layer_parents = {}
+        self._next_layer = 1
+        self._release_queue = []
+
+        # bumped whenever files are added, loaded, unloaded, renamed or
+        # nuked, or their masters or ESM and ESL flags change, so that
+        # anything derived from the load order can tell whether it is still
+        # current
+        self.load_order_generation = 0
+
+        # bumped whenever references may have changed through a call that
+        # can add, remove or re-point them, such as setting a reference,
+        # adding or removing array items or elements, copying elements or
+        # changing FormIDs; see `XEditReferenceIndex`
+        self.references_generation = 0
 
-        # Attribute for handle management
-        self._handles_stack = []
-        self._current_handles = set()
+    @property
+    def plugins(self):
+        '''
+        (``List[str]``) The plugins ``Xelib`` was asked to load when starting a
+        session, not including the masters loaded along with them.
+        '''
+        return list(self._plugins)
 
     @property
     def game_path(self):
@@ -192,7 +226,7 @@ class Xelib(ElementValuesMethods,
             raise XelibError('Api already loaded')
 
         # load XEditLib.dll
-        self._raw_api = self.load_lib(self.dll_path)
+        self._raw_api = self.backend.load(self.dll_path)
         self._wrapper_api = XelibWrapperAPI(self._raw_api)
 
         # initialize the xEdit context
@@ -221,11 +255,10 @@ class Xelib(ElementValuesMethods,
         # unload the API
         self.release_all_handles()
         self.finalize()
-        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
-        kernel32.FreeLibrary.argtypes = [wintypes.HMODULE]
-        kernel32.FreeLibrary(self._raw_api._handle)
+        self.backend.unload(self._raw_api)
         self._raw_api = None
         self._wrapper_api = None
+        self._detecting_api = None
 
     @contextmanager
     def session(self, load_plugins=True):
@@ -268,18 +301,63 @@ class Xelib(ElementValuesMethods,
         '''
         return bool(self._raw_api)
 
+    @property
+    def current_layer(self):
+        '''
+        (``int``) The id of the current handle management stack layer. Layer
+        ids are never reused within the lifetime of a ``Xelib`` object; see
+        ``handle_token`` for telling whether a handle is still the one it
+        was.
+        '''
+        return self._layer_stack[-1]
+
+    @property
+    def _current_handles(self):
+        return self._layer_handles[self._layer_stack[-1]]
+
     @property
     def full_handles_stack(self):
-        return self._handles_stack + [self._current_handles]
+        return [self._layer_handles[layer] for layer in self._layer_stack]
 
     @property
     def all_opened_handles(self):
-        opened_handles = set()
-        for handles in self.full_handles_stack:
-            opened_handles.update(handles)
-        return opened_handles
+        return set(self._handle_table)
 
-    def track_handle(self, handle):
+    def handle_layer(self, handle):
+        '''
+        Returns the id of the handle management stack layer tracking the
+        given handle, or ``None`` if it is not tracked.
+
+        Args:
+            handle (``int``)
+                The handle to look up
+        '''
+        token = self._handle_table.get(handle)
+        return token[0] if token else None
+
+    def handle_token(self, handle):
+        '''
+        Returns the ``(layer, generation)`` pair the given handle is tracked
+        with, or ``None`` if it is not tracked. The pair only changes when the
+        handle is released and its id reissued, or when it is moved to another
+        layer, so holders of a handle can keep it to check that the handle is
+        still theirs.
+
+        Args:
+            handle (``int``)
+                The handle to look up
+        '''
+        return self._handle_table.get(handle)
+
+    @property
+    def session_layer(self):
+        '''
+        (``int``) The id of the bottom handle management stack layer, whose
+        handles are only released at the end of the session.
+        '''
+        return self._layer_stack[0]
+
+    def track_handle(self, handle, layer=None):
         '''
         Add the given handle to the current handle management stack layer
         for tracking purposes.
@@ -287,8 +365,15 @@ class Xelib(ElementValuesMethods,
         Args:
             handle (``int``)
                 The handle to track
+            layer (``int``)
+                The id of the layer to track the handle in instead of the
+                current one, e.g. ``session_layer``
         '''
-        self._current_handles.add(handle)
+        if layer is None:
+            layer = self._layer_stack[-1]
+        self._handle_generation += 1
+        self._handle_table[handle] = (layer, self._handle_generation)
+        self._layer_handles[layer].add(handle)
 
     def release_handle(self, handle):
         '''
@@ -303,9 +388,21 @@ class Xelib(ElementValuesMethods,
         except XelibError:
             pass
         finally:
-            for layer in self.full_handles_stack:
-                if handle in layer:
-                    layer.remove(handle)
+            self.untrack_handle(handle)
+
+    def untrack_handle(self, handle):
+        '''
+        Removes a handle from the handle management stack without releasing
+        it. This is for handles that have been freed some other way, such as
+        node tree handles freed with ``xelib.release_nodes``.
+
+        Args:
+            handle (``int``)
+                The handle to stop tracking
+        '''
+        token = self._handle_table.pop(handle, None)
+        if token is not None:
+            self._layer_handles[token[0]].discard(handle)
 
     def release_handles(self, handles):
         '''
@@ -318,11 +415,125 @@ class Xelib(ElementValuesMethods,
         for handle in handles:
             self.release_handle(handle)
 
+    def defer_release(self, handle, token):
+        '''
+        Stops tracking a handle right away, but queues releasing it in
+        ``XEditLib.dll`` until a batch of ``release_batch_size`` handles has
+        built up, or the handle management context it belongs to is exited,
+        or the session ends; see ``flush_releases``. This is what
+        ``XEditBase`` objects do when they go out of scope, which keeps
+        garbage collection from making api calls at unpredictable moments.
+
+        Handles that are no longer tracked with the given token have already
+        been released, possibly with their ids reissued since, and are
+        ignored.
+
+        Args:
+            handle (``int``)
+                The handle to release
+            token (``Tuple[int, int]``)
+                The ``(layer, generation)`` pair the handle was tracked with,
+                see ``handle_token``
+        '''
+        if self._handle_table.get(handle) != token:
+            return
+        del self._handle_table[handle]
+        self._layer_handles[token[0]].discard(handle)
+        self._release_queue.append(handle)
+        if len(self._release_queue) >= self.release_batch_size:
+            self.flush_releases()
+
+    def flush_releases(self):
+        '''
+        Releases all of the handles queued with ``defer_release``.
+        '''
+        # swap the queue out first, since objects collected while we release
+        # may queue more handles
+        queue, self._release_queue = self._release_queue, []
+        if not queue or not self._raw_api:
+            return
+        release = self.raw_api.Release
+        for handle in queue:
+            release(handle)
+
+    def release_layers(self, layers):
+        '''
+        Releases every handle tracked in the given handle management stack
+        layers, along with any handles queued with ``defer_release``, and
+        empties the layers.
+
+        Args:
+            layers (``List[int]``)
+                The ids of the layers to release
+        '''
+        table = self._handle_table
+        for layer in layers:
+            handles = self._layer_handles[layer]
+            self._layer_handles[layer] = set()
+            for handle in handles:
+                del table[handle]
+            self._release_queue.extend(handles)
+        self.flush_releases()
+
     def release_current_handles(self):
-        self.release_handles(list(self._current_handles))
+        self.release_layers([self._layer_stack[-1]])
 
     def release_all_handles(self):
-        self.release_handles(list(self.all_opened_handles))
+        self.release_layers(list(self._layer_handles))
+
+    def open_layer(self):
+        '''
+        Opens a handle management layer outside of the handle management
+        stack, for handles that have to outlive the contexts they are used
+        in, such as those of a generator that is suspended and resumed in
+        different ``manage_handles`` contexts. Handles are tracked in it with
+        ``use_layer``, or ``track_handle``, and released with ``close_layer``,
+        or at the end of the session. Handles promoted out of it (see
+        ``promote_handle``) go to the current layer at the time it was
+        opened, or to the current layer at the time of promotion if that one
+        has been released by then.
+
+        Returns:
+            (``int``) the id of the new layer
+        '''
+        layer = self._next_layer
+        self._next_layer += 1
+        self._layer_parents[layer] = self._layer_stack[-1]
+        self._layer_handles[layer] = set()
+        return layer
+
+    @contextmanager
+    def use_layer(self, layer):
+        '''
+        A context manager tracking the new handles returned by ``Xelib`` API
+        methods within it in a layer opened with ``open_layer``, rather than
+        the current one. Unlike ``manage_handles``, nothing is released on
+        exit.
+
+        Args:
+            layer (``int``)
+                The id of the layer
+        '''
+        self._layer_stack.append(layer)
+        try:
+            yield
+        finally:
+            self._layer_stack.remove(layer)
+
+    def close_layer(self, layer):
+        '''
+        Releases the handles of a layer opened with ``open_layer``, and
+        forgets the layer. Layers already closed are ignored.
+
+        Args:
+            layer (``int``)
+                The id of the layer
+        '''
+        if layer not in self._layer_handles:
+            return
+        self.release_layers([layer])
+        del self._layer_handles[layer]
+        del self._layer_parents[layer]
 
     @contextmanager
     def manage_handles(self):
@@ -351,22 +562,26 @@ class Xelib(ElementValuesMethods,
                 # on context exit, handle 2 gets released
             # at the end of session, handle 1 gets released
         '''
+        layer = self._next_layer
+        self._next_layer += 1
+        self._layer_parents[layer] = self._layer_stack[-1]
+        self._layer_handles[layer] = set()
+        self._layer_stack.append(layer)
         try:
-            self._handles_stack.append(self._current_handles)
-            self._current_handles = set()
             yield
         finally:
             self.release_current_handles()
-            self._current_handles = self._handles_stack.pop()
+            self._layer_stack.pop()
+            del self._layer_handles[layer]
+            del self._layer_parents[layer]
 
     def print_handle_management_stack(self):
         '''
         Prints the entire handle management stack to stdout. Useful for
         debugging.
         '''
-        for i, handles in enumerate(self._handles_stack):
-            print(f'{i}: {handles}')
-        print(f'{len(self._handles_stack)}: {self._current_handles}')
+        for i, layer in enumerate(self._layer_stack):
+            print(f'{i}: {self._layer_handles[layer]}')
 
     def promote_handle(self, handle):
         '''
@@ -377,14 +592,23 @@ class Xelib(ElementValuesMethods,
         Args:
             handle (``int``)
                 The handle to promote to parent handle management context
+
+        Returns:
+            (``int``) the id of the layer the handle was promoted to, or
+            ``None`` if it could not be promoted
         '''
-        for (current_layer,
-             parent_layer) in pairwise(reversed(self.full_handles_stack)):
-            if handle in current_layer:
-                current_layer.remove(handle)
-                parent_layer.add(handle)
-                return parent_layer
-        print(f'failed to promote handle {handle}')
+        layer, generation = self._handle_table.get(handle, (None, None))
+        parent = self._layer_parents.get(layer)
+        if parent is not None and parent not in self._layer_handles:
+            # the parent of a layer opened with `open_layer` has been released
+            parent = self._layer_stack[-1]
+        if parent is None or parent == layer:
+            print(f'failed to promote handle {handle}')
+            return None
+        self._layer_handles[layer].remove(handle)
+        self._layer_handles[parent].add(handle)
+        self._handle_table[handle] = (parent, generation)
+        return parent
 
     @property
     def raw_api(self):
@@ -422,38 +646,49 @@ class Xelib(ElementValuesMethods,
         # uncomment the `self._wrapper_api` below to log debug calls; will
         # affect performance, so only enable when necessary
         # return self._wrapper_api
-        return self._raw_api
+        return self._detecting_api or self._raw_api
+
+    @contextmanager
+    def detect_call_patterns(self, **kwargs):
+        '''
+        A context manager that watches the api calls made within it for
+        wasteful patterns, with a ``CallPatternDetector``: identical calls
+        repeated in close succession, and the same sequence of calls made
+        once per item of a loop. Keyword arguments are passed on to the
+        detector.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            with xelib.detect_call_patterns() as detector:
+                for npc in xedit['Skyrim.esm']['NPC_'].child_elements:
+                    npc.full_name
+            print(detector.format_report())
+
+        Detection walks the stack on every api call, which is slow; it is
+        meant for finding hot spots, not for production runs.
+        '''
+        if not self._raw_api:
+            # raises the usual error for use outside of a session
+            self.raw_api
+        detector = CallPatternDetector(**kwargs)
+        previous = self._detecting_api
+        self._detecting_api = DetectingAPI(self._raw_api, detector)
+        try:
+            yield detector
+        finally:
+            detector.flush()
+            if self._raw_api:
+                self._detecting_api = previous
 
     @staticmethod
     def load_lib(dll_path):
         '''
         Loads ``XEditLib.dll`` into python and wrap it with ctypes definitions
-        based on known calling signatures of the DLL functions.
-
-        Args:
-            dll_path (``str``):
-                Path to the ``XEditLib.dll`` file
-        Returns:
-            ``ctypes.CDLL``: handle to the loaded library
+        based on known calling signatures of the DLL functions. See
+        ``DLLBackend.load_lib``.
         '''
-        # load XEditLib.dll
-        lib = ctypes.CDLL(str(dll_path))
-
-        # define type signatures for XEditLib.dll methods
-        for signature in XEditLibSignatures:
-            method_name = signature.name
-            params, return_type = signature.value
-            try:
-                method = getattr(lib, method_name)
-                method.argtypes = [DelphiTypes[type_].value
-                                   for _, type_ in params.items()]
-                if return_type:
-                    method.restype = DelphiTypes[return_type].value
-            except AttributeError:
-                print(f'WARNING: missing function {method_name}')
-
-        # return a handle to the loaded library
-        return lib
+        return DLLBackend.load_lib(dll_path)
 
 
 '''
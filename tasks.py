@@ -6,6 +6,16 @@ def test(c, test='test'):
     c.run(f'python -m pytest -v {test}')
 
 
+@task
+def bench(c, workloads='', update=False):
+    c.run(f'python -m benchmarks {workloads}{" --update" if update else ""}')
+
+
+@task
+def bench_startup(c, update=False):
+    c.run(f'python -m benchmarks.startup{" --update" if update else ""}')
+
+
 @task
 def docs(c):
     c.run('sphinx-build -b html docs docs/_build')
@@ -1,10 +1,13 @@
+import copy
 from functools import wraps
 import hashlib
 from pathlib import Path
 import pytest
 import shutil
 
+from benchmarks.fixture import MASTER, build_fixture
 from pyxedit import XEdit
+from pyxedit.xelib.backends import SimulatedBackend
 
 
 @pytest.fixture(scope='class')
@@ -57,6 +60,39 @@ def xedit():
             shutil.copyfile(backup, file_)
 
 
+@pytest.fixture
+def simulated_xedit(request):
+    '''
+    An xedit session over a small generated load order, on a simulated
+    XEditLib; see `benchmarks.fixture`. Use `simulated_load_order` to load
+    more plugins after the master, or to instrument the backend.
+    '''
+    options = getattr(request, 'param', {})
+    files = copy.deepcopy(options.get('files', []))
+    fixture = build_fixture(npc_count=3, armor_count=2, cell_count=1)
+    fixture['files'] += files
+    backend = SimulatedBackend(fixture,
+                               instrument=options.get('instrument', False))
+    xedit = XEdit(plugins=[MASTER] + [file_['name'] for file_ in files],
+                  backend=backend)
+    with xedit.session():
+        yield xedit
+
+
+def simulated_load_order(*files, instrument=False):
+    '''
+    Marks a test (or every test of a class) to run `simulated_xedit` with
+    the given file specs loaded after the master, in order.
+
+    @param files: file specs as `benchmarks.fixture` builds them
+    @param instrument: whether the backend counts calls, for measuring them
+                       with `xedit.xelib.backend.measure()`
+    '''
+    options = {'files': list(files), 'instrument': instrument}
+    return pytest.mark.parametrize('simulated_xedit', [options],
+                                   indirect=True, ids=['load_order'])
+
+
 def assert_no_opened_handles_after(test):
     @wraps(test)
     def wrapped_test(self, xedit, *args, **kwargs):
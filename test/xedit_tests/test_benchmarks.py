@@ -0,0 +1,25 @@
+from benchmarks.fixture import build_fixture
+from benchmarks.run import compare, run_workload
+from benchmarks.workloads import WORKLOADS
+
+
+def test_run_workload():
+    fixture = build_fixture(npc_count=20, armor_count=5, cell_count=2)
+    result = run_workload(WORKLOADS['iterate_records'], fixture, repeat=1)
+    assert result.operations == 20
+    assert result.calls_per_operation > 0
+    assert result.to_dict()['calls']['GetElements'] >= 1
+
+
+def test_compare():
+    fixture = build_fixture(npc_count=20, armor_count=5, cell_count=2)
+    result = run_workload(WORKLOADS['iterate_records'], fixture, repeat=1)
+    baseline = result.to_dict()
+    assert compare(result, baseline) == []
+
+    baseline['calls_per_operation'] = result.calls_per_operation / 2
+    (regression,) = compare(result, baseline)
+    assert 'api calls per operation' in regression
+
+    baseline['seconds_per_operation'] = result.seconds_per_operation / 10
+    assert len(compare(result, baseline)) == 2
@@ -0,0 +1,56 @@
+import pytest
+
+from benchmarks.fixture import MASTER, NPCS, npc
+from pyxedit.xedit.conflicts import XEditConflictReport
+
+from . fixtures import simulated_load_order, simulated_xedit  # NOQA: pytest
+
+ConflictAll = XEditConflictReport.ConflictAll
+
+
+@pytest.fixture(autouse=True)
+def unnamed_npc(simulated_xedit):
+    # the master's first NPC_ has no short name; the patch overriding it
+    # adds one and renames it
+    simulated_xedit[MASTER][f'NPC_\\{NPCS:08X}'].delete('SHRT')
+
+
+@simulated_load_order(
+    {'name': 'Patch.esp', 'masters': [MASTER],
+     'records': [dict(npc(0), **{'FULL - Name': 'Patched NPC'})]})
+class TestXEditConflictReport:
+    def test_union_of_versions(self, simulated_xedit):
+        entries = list(simulated_xedit.iter_conflicts(
+            plugins=[MASTER], min_conflict=ConflictAll.Override))
+        assert [entry['path'] for entry in entries] == \
+            ['FULL - Name', 'SHRT - Short Name']
+        full, short = entries
+        assert full == {'record': f'NPC_:{NPCS:08X}',
+                        'editor_id': 'BenchNPC0000',
+                        'plugin': MASTER,
+                        'path': 'FULL - Name',
+                        'conflict_all': 'Override',
+                        'conflict_this': 'Master',
+                        'winning_value': 'Patched NPC'}
+        # the short name only exists in the override
+        assert short['conflict_this'] == 'NotDefined'
+        assert short['winning_value'] == 'NPC 0'
+
+    def test_override_version(self, simulated_xedit):
+        entries = list(simulated_xedit.iter_conflicts(
+            plugins=['Patch.esp'], min_conflict=ConflictAll.Override))
+        assert [(entry['plugin'], entry['path'], entry['conflict_this'])
+                for entry in entries] == \
+            [('Patch.esp', 'FULL - Name', 'Override'),
+             ('Patch.esp', 'SHRT - Short Name', 'Override')]
+
+    def test_pruned(self, simulated_xedit):
+        # nothing conflicts beyond an override
+        assert list(simulated_xedit.iter_conflicts()) == []
+
+    def test_write(self, simulated_xedit, tmp_path):
+        path = tmp_path / 'conflicts.jsonl'
+        count = simulated_xedit.conflict_report(
+            path, min_conflict=ConflictAll.Override)
+        assert count == 2
+        assert len(path.read_text().splitlines()) == 2
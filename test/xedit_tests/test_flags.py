@@ -0,0 +1,61 @@
+import pytest
+
+from benchmarks.fixture import ACBS_FLAGS, MASTER
+from pyxedit import XEditError
+from pyxedit.xedit.flags import XEditFlags
+
+from . fixtures import simulated_load_order, simulated_xedit  # NOQA: pytest
+
+
+class TestXEditFlags:
+    def test_dict_access(self, simulated_xedit):
+        flags = simulated_xedit[MASTER]['NPC_\\00001000']['ACBS\\Flags']
+        assert isinstance(flags, XEditFlags)
+        assert list(flags) == ACBS_FLAGS
+        assert len(flags) == len(ACBS_FLAGS)
+
+        as_dict = flags.to_dict()
+        assert as_dict == {flag_name: flags[flag_name]
+                           for flag_name in ACBS_FLAGS}
+        assert flags.enabled == [flag_name for flag_name, state
+                                 in as_dict.items() if state]
+
+    def test_bitmask(self, simulated_xedit):
+        flags = simulated_xedit[MASTER]['NPC_\\00001000']['ACBS\\Flags']
+        bitmask = flags.bitmask
+        assert isinstance(bitmask, flags.Flags)
+        assert bool(bitmask & flags.Flags.Female) == flags['Female']
+        assert int(bitmask) == simulated_xedit.xelib.get_uint_value(
+            flags.handle)
+
+        flags.bitmask = flags.Flags.Essential | flags.Flags.Unique
+        assert flags.enabled == ['Essential', 'Unique']
+
+    def test_from_dict(self, simulated_xedit):
+        flags = simulated_xedit[MASTER]['NPC_\\00001000']['ACBS\\Flags']
+        flags.from_dict({'Female': False, 'Unique': True})
+        assert not flags['Female']
+        assert flags['Unique']
+
+        with pytest.raises(XEditError, match='has no flag'):
+            flags.from_dict({'Flying': True})
+
+    @simulated_load_order(instrument=True)
+    def test_single_call_reads(self, simulated_xedit):
+        flags = simulated_xedit[MASTER]['NPC_\\00001000']['ACBS\\Flags']
+        flags.to_dict()
+        with simulated_xedit.xelib.backend.measure() as stats:
+            flags.to_dict()
+            flags.from_dict({'Female': True})
+        assert dict(stats.calls) == {'GetUIntValue': 2, 'SetUIntValue': 1}
+
+    def test_read_flags(self, simulated_xedit):
+        npcs = list(simulated_xedit[MASTER]['NPC_'].child_elements)
+        values = simulated_xedit.read_flags(npcs, 'ACBS\\Flags')
+        assert [value.__class__ for value in values] == \
+            [npcs[0]['ACBS\\Flags'].Flags] * len(npcs)
+        assert [int(value) for value in values] == \
+            [int(npc['ACBS\\Flags'].bitmask) for npc in npcs]
+
+        # records without flags at the path get None
+        assert simulated_xedit.read_flags(npcs, 'XXXX') == [None] * len(npcs)
@@ -0,0 +1,62 @@
+import pytest
+
+from benchmarks.fixture import MASTER
+from pyxedit import XEditError
+
+from . fixtures import simulated_xedit  # NOQA: pytest
+
+
+class TestDeferredRelease:
+    def test_release_is_deferred(self, simulated_xedit):
+        xelib = simulated_xedit.xelib
+        api = xelib.raw_api
+        with xelib.manage_handles():
+            npc = simulated_xedit[MASTER]['NPC_\\00001000']
+            handle = npc.handle
+            del npc
+
+            # the handle stops being tracked right away, but is only
+            # released later
+            assert handle not in xelib.all_opened_handles
+            assert handle in xelib._release_queue
+            assert handle in api.handles
+
+        # exiting the handle management context flushes the queue
+        assert not xelib._release_queue
+        assert handle not in api.handles
+
+    def test_release_in_batches(self, simulated_xedit):
+        xelib = simulated_xedit.xelib
+        xelib.release_batch_size = 4
+        api = xelib.raw_api
+        for npc in simulated_xedit[MASTER]['NPC_'].child_elements:
+            npc.editor_id
+            # whatever is neither tracked nor queued has been released
+            assert set(api.handles) - {0} == \
+                xelib.all_opened_handles | set(xelib._release_queue)
+            assert len(xelib._release_queue) < 4
+
+    def test_released_handles_are_ignored(self, simulated_xedit):
+        xelib = simulated_xedit.xelib
+        with xelib.manage_handles():
+            npc = simulated_xedit[MASTER]['NPC_\\00001000']
+        # the handle was released with its context; the object going out of
+        # scope afterwards must not release it again
+        del npc
+        assert not xelib._release_queue
+
+    def test_reissued_handles(self, simulated_xedit):
+        xelib = simulated_xedit.xelib
+        with xelib.manage_handles():
+            npc = simulated_xedit[MASTER]['NPC_\\00001000']
+
+        # xedit-lib hands the released handle out again; the stale object
+        # must neither use it nor release it from under its new holder
+        other = simulated_xedit[MASTER]['NPC_\\00001001']
+        assert other.handle == npc.handle
+        with pytest.raises(XEditError, match='already been released'):
+            npc.editor_id
+        del npc
+        assert other.handle in xelib.all_opened_handles
+        assert other.handle not in xelib._release_queue
+        assert other.form_id == 0x1001
@@ -0,0 +1,72 @@
+from benchmarks.fixture import MASTER
+from pyxedit.xedit.load_order import PluginInfo
+from pyxedit.xedit.plugin import XEditPlugin
+
+from . fixtures import simulated_load_order, simulated_xedit  # NOQA: pytest
+
+PATCH = 'Patch.esp'
+
+
+@simulated_load_order({'name': PATCH, 'masters': [MASTER], 'records': []},
+                      instrument=True)
+class TestXEditLoadOrder:
+    def test_model(self, simulated_xedit):
+        xedit = simulated_xedit
+        load_order = xedit.load_order
+        assert load_order.names == [MASTER, PATCH]
+        assert xedit.plugin_names == [MASTER, PATCH]
+        assert xedit.plugin_count == 2
+        master = load_order[MASTER]
+        assert isinstance(master, PluginInfo)
+        assert master.load_order == 0
+        assert master.masters == ()
+        assert master.is_esm and not master.is_esl
+        assert master.num_records == 3 + 2 + 1 + 35
+        patch = load_order[1]
+        assert patch.name == PATCH
+        assert patch.masters == (MASTER,)
+        assert not patch.is_esm
+        assert PATCH in load_order
+
+        plugins = xedit.plugins
+        assert all(isinstance(plugin, XEditPlugin) for plugin in plugins)
+        assert [plugin.name for plugin in plugins] == [MASTER, PATCH]
+
+    def test_cached(self, simulated_xedit):
+        xedit = simulated_xedit
+        # plugin handles outlive the context the model is read in
+        with xedit.manage_handles():
+            xedit.plugins
+        with xedit.xelib.backend.measure() as stats:
+            for _ in range(10):
+                plugins = xedit.plugins
+                xedit.plugin_count
+                xedit.plugin_names
+        assert stats.total == 0
+        assert plugins[0].name == MASTER
+
+    def test_invalidated(self, simulated_xedit):
+        xedit = simulated_xedit
+        load_order = xedit.load_order
+        assert xedit.load_order is load_order
+
+        xedit.add_file('New.esp')
+        assert xedit.plugin_names == [MASTER, PATCH, 'New.esp']
+        assert not load_order.is_current
+
+        xedit.plugins[-1].rename('Renamed.esp')
+        assert xedit.plugin_names == [MASTER, PATCH, 'Renamed.esp']
+
+    def test_masters_and_flags(self, simulated_xedit):
+        xedit = simulated_xedit
+        new = xedit.add_file('New.esp')
+        assert xedit.load_order['New.esp'].masters == ()
+
+        xedit.xelib.add_masters(new.handle, [MASTER, PATCH])
+        assert xedit.load_order['New.esp'].masters == (MASTER, PATCH)
+
+        xedit.xelib.clean_masters(new.handle)
+        assert xedit.load_order['New.esp'].masters == ()
+
+        xedit.xelib.set_is_esl(new.handle, True)
+        assert xedit.load_order['New.esp'].is_esl
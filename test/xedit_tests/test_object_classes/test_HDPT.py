@@ -0,0 +1,74 @@
+from enum import Enum
+
+import pytest
+
+from pyxedit import XEdit, XEditError
+from pyxedit.xedit.object_classes.HDPT import HeadPartTypes
+from pyxedit.xelib.backends import SimulatedBackend
+
+OPTIONS = [member.value for member in HeadPartTypes]
+
+
+# the same options, with sparse values not starting at 0
+SPARSE_OPTIONS = {2 + 3 * i: option for i, option in enumerate(OPTIONS)}
+
+
+class Beards(Enum):
+    Full = 'Beard'
+
+
+FIXTURE = {
+    'files': [
+        {'name': 'HeadParts.esm',
+         'records': [
+             {'$signature': 'HDPT',
+              '$form_id': 0x800 + i,
+              'EDID - Editor ID': f'HeadPart{i}',
+              'PNAM - Type': {'$enum': option, '$options': OPTIONS}}
+             for i, option in enumerate(['Hair', 'Eyes'])] + [
+             {'$signature': 'HDPT',
+              '$form_id': 0x802,
+              'EDID - Editor ID': 'HeadPartSparse',
+              'PNAM - Type': {'$enum': 'Eyes', '$options': SPARSE_OPTIONS}}]},
+    ],
+}
+
+
+@pytest.fixture
+def simulated():
+    backend = SimulatedBackend(FIXTURE, instrument=True)
+    xedit = XEdit(plugins=['HeadParts.esm'], backend=backend)
+    with xedit.session():
+        yield xedit, backend
+
+
+class TestHDPT:
+    def test_headpart_type(self, simulated):
+        xedit, backend = simulated
+        hair = xedit['HeadParts.esm\\HDPT\\00000800']
+        eyes = xedit['HeadParts.esm\\HDPT\\00000801']
+        assert hair.headpart_type == HeadPartTypes.Hair
+
+        # enum options are only retrieved once per session
+        with backend.measure() as stats:
+            assert eyes.headpart_type == HeadPartTypes.Eyes
+        assert 'GetEnumOptions' not in stats.calls
+
+        hair.headpart_type = HeadPartTypes.FacialHair
+        assert hair.pnam == HeadPartTypes.FacialHair
+        assert xedit.xelib.get_value(hair.handle, 'PNAM') == 'Facial Hair'
+
+    def test_sparse_options(self, simulated):
+        xedit, _ = simulated
+        sparse = xedit['HeadParts.esm\\HDPT\\00000802']
+        assert sparse.headpart_type == HeadPartTypes.Eyes
+
+        sparse.headpart_type = HeadPartTypes.Scar
+        assert sparse.headpart_type == HeadPartTypes.Scar
+        assert xedit.xelib.get_int_value(sparse.handle, 'PNAM') == 17
+
+    def test_invalid_option(self, simulated):
+        xedit, _ = simulated
+        hair = xedit['HeadParts.esm\\HDPT\\00000800']
+        with pytest.raises(XEditError, match='not one of the options'):
+            hair.headpart_type = Beards.Full
@@ -0,0 +1,267 @@
+import pytest
+
+from benchmarks.fixture import ARMORS, MASTER, NPCS, build_fixture, npc
+from pyxedit import XEdit, XEditError
+from pyxedit.xelib.backends import SimulatedBackend
+
+
+@pytest.fixture
+def xedit():
+    backend = SimulatedBackend(build_fixture(npc_count=50, armor_count=5,
+                                             cell_count=2))
+    xedit = XEdit(plugins=[MASTER], backend=backend)
+    with xedit.session():
+        yield xedit
+
+
+class TestIterRecords:
+    def test_signatures(self, xedit):
+        plugin = xedit[MASTER]
+        form_ids = [record.form_id for record in plugin.iter_records('NPC_')]
+        assert form_ids == [NPCS + i for i in range(50)]
+
+        signatures = [record.signature
+                      for record in plugin.iter_records('NPC_,ARMO')]
+        assert signatures == ['NPC_'] * 50 + ['ARMO'] * 5
+        assert [record.form_id for record
+                in plugin.iter_records(['ARMO'])] == \
+            [ARMORS + i for i in range(5)]
+
+    def test_all_records(self, xedit):
+        plugin = xedit[MASTER]
+        expected = {xedit.xelib.get_form_id(handle)
+                    for handle in xedit.xelib.get_records(plugin.handle)}
+        assert {record.form_id for record in plugin.iter_records()} == \
+            expected
+
+    def test_handles(self, xedit):
+        plugin = xedit[MASTER]
+        before = xedit.xelib.all_opened_handles
+        first = kept = None
+        peak = 0
+        for i, record in enumerate(plugin.iter_records('NPC_',
+                                                       chunk_size=10)):
+            record['EDID']
+            peak = max(peak, len(xedit.xelib.all_opened_handles))
+            if i == 0:
+                first = record
+            elif i == 1:
+                kept = record
+                kept.promote()
+            elif i == 10:
+                # the first chunk has been released
+                with pytest.raises(XEditError, match='already been released'):
+                    first.editor_id
+        assert peak <= len(before) + 50 + 10 + 1
+        assert kept.editor_id == 'BenchNPC0001'
+        assert xedit.xelib.all_opened_handles - before == {kept.handle}
+
+    def test_early_exit(self, xedit):
+        plugin = xedit[MASTER]
+        before = xedit.xelib.all_opened_handles
+        records = plugin.iter_records('NPC_', chunk_size=10)
+        for i, record in zip(range(15), records):
+            pass
+        records.close()
+        del record
+        assert xedit.xelib.all_opened_handles == before
+
+    def test_resumed_in_other_contexts(self):
+        backend = SimulatedBackend(build_fixture(npc_count=50, armor_count=5,
+                                                 cell_count=2))
+        xedit = XEdit(plugins=[MASTER], backend=backend)
+        with xedit.session():
+            plugin = xedit[MASTER]
+            before = xedit.xelib.all_opened_handles
+            records = plugin.iter_records('NPC_', chunk_size=10)
+            with xedit.xelib.manage_handles():
+                first = next(records)
+                assert first.form_id == NPCS
+            assert [record.form_id for record in records] == \
+                [NPCS + i for i in range(1, 50)]
+            assert xedit.xelib.all_opened_handles == before
+
+            # interleaved iterators
+            pairs = zip(plugin.iter_records('NPC_', chunk_size=10),
+                        plugin.iter_records('ARMO', chunk_size=2))
+            assert [(npc.form_id, armor.form_id) for npc, armor in pairs] == \
+                [(NPCS + i, ARMORS + i) for i in range(5)]
+            del pairs
+            assert xedit.xelib.all_opened_handles == before
+        assert not xedit.xelib.all_opened_handles
+
+
+class TestCopyRecords:
+    def test_copy_records(self, xedit):
+        patch = xedit.add_file('Patch.esp')
+        npcs = list(xedit[MASTER]['NPC_'].child_elements)[:5]
+        result = patch.copy_records(npcs)
+        assert result.ok
+        assert len(result) == 5
+        assert patch.master_names == [MASTER]
+        assert [record.form_id for record in result] == \
+            [npc.form_id for npc in npcs]
+        assert result[0] is result[0]
+        assert all(record.is_override for record in result)
+
+    def test_new_records(self, xedit):
+        patch = xedit.add_file('Patch.esp')
+        armor = xedit[MASTER][f'ARMO\\{ARMORS:08X}']
+        result = patch.copy_records([armor], mode='new')
+        assert result.ok
+        assert result[0].form_id != armor.form_id
+        assert result[0].editor_id == armor.editor_id
+
+        with pytest.raises(XEditError, match='Unknown copy mode'):
+            patch.copy_records([armor], mode='duplicate')
+
+    def test_failures(self, xedit):
+        patch = xedit.add_file('Patch.esp')
+        npc = xedit[MASTER][f'NPC_\\{NPCS:08X}']
+        patch.copy_records([npc])
+
+        # records of plugins loading later, and records the plugin already
+        # has, fail without stopping the rest of the batch
+        later = xedit.add_file('Later.esp')
+        later_record = later.copy_records([npc], mode='new')[0]
+        result = patch.copy_records([later_record, npc,
+                                     xedit[MASTER][f'ARMO\\{ARMORS:08X}']])
+        assert len(result) == 1
+        assert [record for record, _ in result.failures] == \
+            [later_record, npc]
+        assert 'loads after' in str(result.failures[0][1])
+        assert patch.master_names == [MASTER]
+
+    def test_clean_masters(self):
+        # the dependent plugin has a master its NPC does not refer to
+        fixture = build_fixture(npc_count=1, armor_count=1, cell_count=1)
+        fixture['files'] += [
+            {'name': 'Other.esm', 'records': []},
+            {'name': 'Dependent.esp', 'masters': [MASTER, 'Other.esm'],
+             'records': [dict(npc(1), **{'$form_id': 0x02000800})]},
+        ]
+        xedit = XEdit(plugins=[MASTER, 'Other.esm', 'Dependent.esp'],
+                      backend=SimulatedBackend(fixture))
+        with xedit.session():
+            record = xedit['Dependent.esp']['NPC_\\02000800']
+            patch = xedit.add_file('Patch.esp')
+            assert patch.copy_records([record]).ok
+            assert patch.master_names == [MASTER, 'Dependent.esp']
+
+            kept = xedit.add_file('Kept.esp')
+            assert kept.copy_records([record], clean_masters=False).ok
+            assert kept.master_names == [MASTER, 'Other.esm',
+                                         'Dependent.esp']
+
+    def test_chained_copies(self, xedit):
+        # the masters a copy adds to a plugin count when records are copied
+        # on out of it
+        first = xedit.add_file('A.esp')
+        second = xedit.add_file('B.esp')
+        npc = xedit[MASTER][f'NPC_\\{NPCS:08X}']
+        override = first.copy_records([npc])[0]
+        assert first.master_names == [MASTER]
+
+        result = second.copy_records([override])
+        assert result.ok
+        assert second.master_names == [MASTER]
+
+    def test_single_master_batch(self):
+        backend = SimulatedBackend(build_fixture(npc_count=20, armor_count=1,
+                                                 cell_count=1),
+                                   instrument=True)
+        xedit = XEdit(plugins=[MASTER], backend=backend)
+        with xedit.session():
+            patch = xedit.add_file('Patch.esp')
+            npcs = list(xedit[MASTER]['NPC_'].child_elements)
+            xedit.load_order
+            with backend.measure() as stats:
+                patch.copy_records(npcs)
+            assert stats.calls['AddMasters'] == 1
+            assert stats.calls['CopyElement'] == 20
+            assert 'AddRequiredMasters' not in stats.calls
+
+
+class TestFormIDs:
+    def test_allocate(self, xedit):
+        plugin = xedit.add_file('Patch.esp')
+        assert plugin.allocate_form_ids(10) == range(0x800, 0x80A)
+        assert plugin.next_object_id == 0x80A
+        assert plugin.allocate_form_ids(0x1000) == range(0x80A, 0x180A)
+
+        light = xedit.add_file('Patch.esl')
+        assert light.is_esl
+        assert light.allocate_form_ids(0x700) == range(0x800, 0xF00)
+        with pytest.raises(XEditError, match='only 256 are left'):
+            light.allocate_form_ids(0x101)
+        assert light.next_object_id == 0xF00
+        assert plugin.allocate_form_ids(0x101, esl=False)
+
+    def test_assign(self, xedit):
+        plugin = xedit.add_file('Patch.esp')
+        npcs = list(xedit[MASTER]['NPC_'].child_elements)[:3]
+        records = list(plugin.copy_records(npcs, mode='new'))
+        object_ids = plugin.assign_form_ids(records)
+        assert object_ids == range(0x803, 0x806)
+        assert [record.local_form_id for record in records] == \
+            list(object_ids)
+        assert plugin[f'NPC_\\{records[0].form_id:08X}'] == records[0]
+
+        with pytest.raises(XEditError, match='Got 2 object IDs'):
+            plugin.assign_form_ids(records, object_ids=[0x900, 0x901])
+
+    def test_create_records(self, xedit):
+        plugin = xedit.add_file('Patch.esl')
+        template = xedit[MASTER][f'NPC_\\{NPCS:08X}']
+        plugin.next_object_id = 0x900
+        records = plugin.create_records(
+            template, values=[{'EDID': f'Clone{i}', 'FULL': f'Clone {i}'}
+                              for i in range(4)])
+        assert plugin.master_names == [MASTER]
+        assert [record.local_form_id for record in records] == \
+            [0x900, 0x901, 0x902, 0x903]
+        assert [record.editor_id for record in records] == \
+            ['Clone0', 'Clone1', 'Clone2', 'Clone3']
+        assert records[3]['FULL'].value == 'Clone 3'
+        assert records[0].race == template.race
+        assert plugin.next_object_id == 0x904
+        assert len(plugin.create_records(template, 2)) == 2
+
+        plugin.next_object_id = 0xFFF
+        with pytest.raises(XEditError, match='Cannot allocate 2'):
+            plugin.create_records(template, 2)
+        assert plugin.num_records == 6
+
+    def test_used_object_ids(self, xedit):
+        plugin = xedit.add_file('Patch.esp')
+        template = xedit[MASTER][f'NPC_\\{NPCS:08X}']
+        created = plugin.create_records(template, 3)
+        assert [record.local_form_id for record in created] == \
+            [0x800, 0x801, 0x802]
+
+        # the next object ID points at IDs records already use; the block
+        # starts past them
+        plugin.next_object_id = 0x801
+        assert plugin.allocate_form_ids(2) == range(0x803, 0x805)
+        plugin.next_object_id = 0x7F0
+        records = plugin.create_records(template, 3)
+        assert [record.local_form_id for record in records] == \
+            [0x803, 0x804, 0x805]
+        assert len({record.form_id for record in created + records}) == 6
+        assert plugin.num_records == 6
+
+    def test_create_records_calls(self):
+        backend = SimulatedBackend(build_fixture(npc_count=1, armor_count=1,
+                                                 cell_count=1),
+                                   instrument=True)
+        xedit = XEdit(plugins=[MASTER], backend=backend)
+        with xedit.session():
+            plugin = xedit.add_file('Patch.esp')
+            template = xedit[MASTER][f'NPC_\\{NPCS:08X}']
+            xedit.load_order
+            with backend.measure() as stats:
+                plugin.create_records(template, 20)
+            assert stats.calls['AddMasters'] == 1
+            assert stats.calls['CopyElement'] == 20
+            assert stats.calls['SetFormID'] == 20
+            assert stats.calls['SetUIntValue'] == 2
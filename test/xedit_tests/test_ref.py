@@ -0,0 +1,97 @@
+import pytest
+
+from benchmarks.fixture import (KEYWORDS, MASTER, RACES, npc, ref,
+                               simple_records)
+from pyxedit import XEditError
+from pyxedit.xedit.ref import XEditRef
+
+from . fixtures import simulated_load_order, simulated_xedit  # NOQA: pytest
+
+
+class TestXEditRef:
+    @simulated_load_order(instrument=True)
+    def test_lazy(self, simulated_xedit):
+        backend = simulated_xedit.xelib.backend
+        rnam = simulated_xedit[MASTER]['NPC_\\00001000']['RNAM']
+        assert rnam.type == rnam.Types.Ref
+        with backend.measure() as stats:
+            race = rnam.value
+            assert isinstance(race, XEditRef)
+            assert race.form_id == RACES
+            assert race.form_id_str == f'{RACES:08X}'
+        assert dict(stats.calls) == {'GetLinksTo': 1, 'GetFormID': 1}
+        assert not race.is_resolved
+
+        # anything else resolves the record, once
+        assert race.editor_id == 'BenchRace000'
+        assert race.is_resolved
+        assert race.signature == 'RACE'
+        with backend.measure() as stats:
+            assert race['FULL'].value == 'BenchRace 0'
+        assert 'GetRecord' not in stats.calls
+
+    def test_equality(self, simulated_xedit):
+        master = simulated_xedit[MASTER]
+        npcs = [master[f'NPC_\\{0x1000 + i:08X}'] for i in range(3)]
+        race = master[f'RACE\\{RACES:08X}']
+        assert npcs[0].race == npcs[0]['RNAM'].value
+
+        # references are equal to record objects with their FormID, and hash
+        # the same
+        assert npcs[0].race == race
+        assert race == npcs[0].race
+        assert npcs[1].race != race
+        assert race != npcs[1].race
+        assert race in {npcs[0].race}
+        assert npcs[0].race in {race}
+        assert npcs[0].race != npcs[1].race
+        assert len({npc.race for npc in npcs + npcs}) == 3
+        assert npcs[0].race in {npcs[0].race: True}
+
+    def test_null_and_unloaded(self, simulated_xedit):
+        cell = simulated_xedit[MASTER]['CELL\\00006000']
+        assert cell['XCWT'].value is None
+
+        ref = XEditRef(cell, 0x00ABCDEF)
+        with pytest.raises(XEditError, match='not loaded'):
+            ref.editor_id
+
+    def test_arrays(self, simulated_xedit):
+        armor = simulated_xedit[MASTER]['ARMO\\00004000']
+        keywords = armor.keywords
+        first = keywords[0]
+        assert isinstance(first, XEditRef)
+        assert first.form_id == KEYWORDS
+        assert keywords.has_item_with(first)
+        assert keywords.index(first) == 0
+
+        # record objects are found among references
+        keyword = simulated_xedit[MASTER][f'KYWD\\{KEYWORDS:08X}']
+        assert keyword in keywords
+        assert keywords.index(keyword) == 0
+
+    @simulated_load_order(
+        {'name': 'Other.esm',
+         'records': simple_records('RACE', 0x900, 1, 'OtherRace')},
+        {'name': 'Patch.esp', 'masters': ['Other.esm', MASTER],
+         'records': [
+             dict(npc(1), **{'$form_id': 0x02000800,
+                             'RNAM - Race': ref(0x01000000 | RACES)}),
+             dict(npc(2), **{'$form_id': 0x02000801,
+                             'RNAM - Race': ref(0x00000900),
+                             'CNAM - Class': ref(0x02000800)}),
+         ]})
+    def test_native_form_ids(self, simulated_xedit):
+        # the patch lists its masters in another order than they are loaded
+        # in, so FormIDs stored in it differ from load order FormIDs
+        patch = simulated_xedit['Patch.esp']
+        first = patch['NPC_\\02000800']
+        second = patch['NPC_\\02000801']
+        assert first.race.form_id == RACES
+        assert first.race.editor_id == 'BenchRace000'
+        assert second.race.form_id == 0x01000900
+        assert second.race.editor_id == 'OtherRace000'
+
+        # references to the plugin's own records
+        assert second['CNAM'].value.form_id == 0x02000800
+        assert second['CNAM'].value.editor_id == 'BenchNPC0001'
@@ -0,0 +1,135 @@
+from benchmarks.fixture import MASTER, NPCS, RACES, npc, ref
+from pyxedit.xedit.reference_index import XEditReferenceIndex
+
+from . fixtures import simulated_load_order, simulated_xedit  # NOQA: pytest
+
+# a patch overriding the first NPC_ of the master, and a plugin adding a new
+# NPC_ of the same race, which has the master but not the patch as a master
+PATCH_NPC = NPCS
+DEPENDENT_NPC = 0x02000800
+with_dependents = simulated_load_order(
+    {'name': 'Patch.esp', 'masters': [MASTER], 'records': [npc(0)]},
+    {'name': 'Dependent.esp', 'masters': [MASTER],
+     'records': [dict(npc(3), **{'$form_id': 0x01000800,
+                                 'RNAM - Race': ref(RACES)})]})
+
+
+class TestXEditReferenceIndex:
+    def test_from_pairs(self):
+        index = XEditReferenceIndex.from_pairs(iter([
+            (0x10, 0x1),
+            (0x20, 0x1),
+            (0x10, 0x2),
+            (0x10, 0x1),  # same record, second field referencing 0x10
+            (0x30, 0x3)]))
+
+        # referrers come back deduplicated, in scan order
+        assert index.referenced_by(0x10) == (0x1, 0x2)
+        assert index.referenced_by(0x20) == (0x1,)
+        assert index.referenced_by(0x30) == (0x3,)
+
+        # unknown FormIDs are referenced by nothing
+        assert index.referenced_by(0x40) == ()
+        assert 0x40 not in index
+        assert 0x10 in index
+        assert len(index) == 3
+
+    def test_empty(self):
+        index = XEditReferenceIndex.from_pairs([])
+        assert index.referenced_by(0x10) == ()
+        assert len(index) == 0
+
+    def test_incremental_updates(self):
+        index = XEditReferenceIndex.from_pairs([(0x10, 0x1),
+                                                (0x10, 0x1),
+                                                (0x20, 0x2)])
+
+        # re-pointing one of two fields keeps the referrer on the old target
+        index.move_reference(0x1, 0x10, 0x20)
+        assert index.referenced_by(0x10) == (0x1,)
+        assert set(index.referenced_by(0x20)) == {0x1, 0x2}
+
+        # re-pointing the second one removes it
+        index.move_reference(0x1, 0x10, 0x30)
+        assert index.referenced_by(0x10) == ()
+        assert index.referenced_by(0x30) == (0x1,)
+
+        # null references on either side are ignored
+        index.move_reference(0x2, 0, 0x10)
+        index.move_reference(0x2, 0x20, None)
+        assert index.referenced_by(0x10) == (0x2,)
+        assert index.referenced_by(0x20) == (0x1,)
+
+    def test_compact(self):
+        index = XEditReferenceIndex.from_pairs([(0x10, 0x1), (0x20, 0x2)])
+        index.move_reference(0x1, 0x10, 0x30)
+        before = {form_id: set(index.referenced_by(form_id))
+                  for form_id in (0x10, 0x20, 0x30)}
+
+        index.compact()
+        after = {form_id: set(index.referenced_by(form_id))
+                 for form_id in (0x10, 0x20, 0x30)}
+
+        assert before == after
+        assert not index._deltas
+        assert 0x10 not in index._rows
+
+
+@with_dependents
+class TestReferencedBy:
+    def test_plugins_referencing(self, simulated_xedit):
+        expected = [MASTER, 'Patch.esp', 'Dependent.esp']
+        master = simulated_xedit[MASTER][f'NPC_\\{PATCH_NPC:08X}']
+        override = simulated_xedit['Patch.esp'][f'NPC_\\{PATCH_NPC:08X}']
+        assert simulated_xedit.plugins_referencing(master) == expected
+        # the plugins requiring the master are found from overrides too
+        assert simulated_xedit.plugins_referencing(override) == expected
+
+    def test_get_referenced_by(self, simulated_xedit):
+        race = simulated_xedit[MASTER][f'RACE\\{RACES:08X}']
+        # the master and the override of the first NPC_ both reference the
+        # race, but it is listed once
+        assert simulated_xedit.get_referenced_by(race) == \
+            (PATCH_NPC, DEPENDENT_NPC)
+        assert [record.form_id for record in race.referenced_by] == \
+            [PATCH_NPC, DEPENDENT_NPC]
+
+
+@with_dependents
+class TestBuildReferenceIndex:
+    def test_build(self, simulated_xedit):
+        index = simulated_xedit.build_reference_index()
+        assert simulated_xedit.reference_index is index
+        # the master and the override of the first NPC_ count once
+        assert index.referenced_by(RACES) == (PATCH_NPC, DEPENDENT_NPC)
+        assert index.referenced_by(RACES + 1) == (NPCS + 1,)
+
+        index = simulated_xedit.build_reference_index(
+            plugins=['Dependent.esp'])
+        assert index.referenced_by(RACES) == (DEPENDENT_NPC,)
+        assert index.referenced_by(RACES + 1) == ()
+
+    def test_value_assignment(self, simulated_xedit):
+        index = simulated_xedit.build_reference_index()
+        npc = simulated_xedit['Dependent.esp'][f'NPC_\\{DEPENDENT_NPC:08X}']
+        npc['RNAM'].value = simulated_xedit[MASTER][f'RACE\\{RACES + 2:08X}']
+        assert index.referenced_by(RACES) == (PATCH_NPC,)
+        assert set(index.referenced_by(RACES + 2)) == \
+            {NPCS + 2, DEPENDENT_NPC}
+        # the change is applied in place, without a rebuild
+        assert index.is_current
+
+    def test_other_changes(self, simulated_xedit):
+        index = simulated_xedit.build_reference_index()
+        xelib = simulated_xedit.xelib
+        npc = simulated_xedit['Dependent.esp'][f'NPC_\\{DEPENDENT_NPC:08X}']
+        race = simulated_xedit[MASTER][f'RACE\\{RACES + 2:08X}']
+        xelib.set_links_to(npc.handle, race.handle, path='RNAM')
+        assert not index.is_current
+        assert index.referenced_by(RACES) == (PATCH_NPC,)
+        assert set(index.referenced_by(RACES + 2)) == \
+            {NPCS + 2, DEPENDENT_NPC}
+        assert index.is_current
+
+        xelib.remove_element(npc.handle)
+        assert index.referenced_by(RACES + 2) == (NPCS + 2,)
@@ -0,0 +1,127 @@
+import pytest
+
+from benchmarks.fixture import MASTER, build_fixture
+from pyxedit import XEdit, XEditError
+from pyxedit.xedit.object_classes.NPC_ import XEditNPC
+from pyxedit.xedit.schema import (XEditSchema, attribute_name,
+                                  default_schema_path, short_path)
+from pyxedit.xelib.backends import SimulatedBackend
+
+from . fixtures import simulated_xedit  # NOQA: pytest
+
+
+class TestXEditSchema:
+    def test_paths(self):
+        assert short_path('ACBS - Configuration\\Flags') == 'ACBS\\Flags'
+        assert attribute_name('ACBS - Configuration\\Flags') == 'acbs_flags'
+        assert attribute_name('Record Header\\Form Version') == \
+            'record_header_form_version'
+
+    def test_build(self, simulated_xedit):
+        schema = XEditSchema.build(simulated_xedit, sample=1)
+        assert schema.kind('NPC_', 'EDID - Editor ID') == 'string'
+        assert schema.kind('NPC_', 'EDID') == 'string'
+        assert schema.kind('NPC_', 'RNAM') == 'reference'
+        assert schema.kind('NPC_', 'NAM6 - Height') == 'float'
+        assert schema.kind('NPC_', 'ACBS\\Level') == 'integer'
+        assert schema.kind('NPC_', 'ACBS') == 'container'
+        assert schema.kind('NPC_', 'XXXX') is None
+        assert schema.kind('XXXX', 'EDID') is None
+
+    def test_load_schema(self, tmp_path):
+        path = tmp_path / 'SSE.json'
+        backend = SimulatedBackend(build_fixture(npc_count=3, armor_count=1,
+                                                 cell_count=1),
+                                   instrument=True)
+        xedit = XEdit(plugins=[MASTER], backend=backend)
+
+        # building a schema needs a session
+        with pytest.raises(XEditError, match='needs an xedit session'):
+            xedit.load_schema(path)
+
+        with xedit.session():
+            npc = xedit[MASTER]['NPC_\\00001000']
+            expected = (npc.editor_id, npc.race.form_id, npc.height,
+                        npc.full_name)
+
+            xedit.load_schema(path)
+            assert path.is_file()
+            npc = xedit[MASTER]['NPC_\\00001000']
+            assert isinstance(npc, XEditNPC)
+            assert npc.acbs_level == 1
+            npc.signature
+
+            # known fields are read without probing their types
+            with backend.measure() as stats:
+                assert (npc.editor_id, npc.race.form_id, npc.height,
+                        npc.full_name) == expected
+            assert 'DefType' not in stats.calls
+            assert 'GetElement' not in stats.calls
+
+        # later, the schema is loaded from the file, without a session
+        xedit = XEdit(plugins=[MASTER], backend=backend)
+        schema = xedit.load_schema(path)
+        assert schema.kind('NPC_', 'FULL') == 'string'
+
+    def test_union_kinds(self):
+        fixture = build_fixture(npc_count=2, armor_count=1, cell_count=1)
+        npcs = [record for record in fixture['files'][0]['records']
+                if record['$signature'] == 'NPC_']
+        npcs[1]['NAM7 - Weight'] = 'heavy'
+        xedit = XEdit(plugins=[MASTER], backend=SimulatedBackend(fixture))
+        with xedit.session():
+            schema = XEditSchema.build(xedit, sample=2)
+            assert sorted(schema.records['NPC_']['NAM7 - Weight']) == \
+                ['float', 'string']
+            assert schema.kind('NPC_', 'NAM7 - Weight') is None
+            assert schema.kind('NPC_', 'NAM7') is None
+            assert schema.kind('NPC_', 'NAM6') == 'float'
+
+            # fields of more than one kind are read the generic way
+            xedit.schema = schema
+            assert xedit[MASTER]['NPC_\\00001000'].nam7 == 0.0
+            assert xedit[MASTER]['NPC_\\00001001'].nam7 == 'heavy'
+
+    def test_union_members(self):
+        # the union resolves to a reference in the sampled package, and to a
+        # number in the other one
+        def package(form_id, value):
+            return {'$signature': 'PACK', '$form_id': form_id,
+                    'EDID - Editor ID': f'Package{form_id:X}',
+                    'CTDA - Condition': {
+                        'Parameter #1': {'$union': {'Value': value}}}}
+        fixture = build_fixture(npc_count=1, armor_count=1, cell_count=1)
+        fixture['files'][0]['records'] += [package(0x7000, {'$ref': 0x1000}),
+                                           package(0x7001, 5)]
+        xedit = XEdit(plugins=[MASTER], backend=SimulatedBackend(fixture))
+        with xedit.session():
+            schema = XEditSchema.build(xedit, sample=1)
+            assert schema.kind('PACK', 'EDID') == 'string'
+            assert schema.kind('PACK', 'CTDA\\Parameter #1\\Value') is None
+            assert schema.records['PACK']['CTDA - Condition\\Parameter #1'
+                                          '\\Value'] == []
+
+            xedit.schema = schema
+            first = xedit[MASTER]['PACK\\00007000']
+            second = xedit[MASTER]['PACK\\00007001']
+            assert first.ctda_parameter_1_value.form_id == 0x1000
+            assert second.ctda_parameter_1_value == 5
+
+    def test_plugins(self, tmp_path):
+        path = tmp_path / 'SSE.json'
+        backend = SimulatedBackend(build_fixture(npc_count=1, armor_count=1,
+                                                 cell_count=1))
+        xedit = XEdit(plugins=[MASTER], backend=backend)
+        with xedit.session():
+            schema = xedit.load_schema(path)
+            assert schema.plugins == [MASTER]
+            assert xedit.load_schema(path).plugins == [MASTER]
+
+            # the schema is built again for another load order
+            xedit.add_file('Patch.esp')
+            assert xedit.load_schema(path).plugins == [MASTER, 'Patch.esp']
+
+        assert default_schema_path(xedit.game_mode, [MASTER]) != \
+            default_schema_path(xedit.game_mode, [MASTER, 'Patch.esp'])
+        assert default_schema_path(xedit.game_mode, [MASTER]) == \
+            default_schema_path(xedit.game_mode, [MASTER.upper()])
@@ -0,0 +1,42 @@
+from pyxedit import XEdit
+from pyxedit.xelib.backends import SimulatedBackend
+
+FIXTURE = {
+    'files': [
+        {'name': 'Signatures.esm',
+         'records': [
+             {'$signature': 'ARMO',
+              '$form_id': 0x800,
+              'EDID - Editor ID': 'IronHelmet'},
+             {'$signature': 'KYWD',
+              '$form_id': 0x801,
+              'EDID - Editor ID': 'ArmorHeavy'}]},
+    ],
+    'signature_names': {'ARMO': 'Armor', 'KYWD': 'Keyword'},
+}
+
+
+class TestSignatureNames:
+    def test_signature_names(self):
+        backend = SimulatedBackend(FIXTURE, instrument=True)
+        xedit = XEdit(plugins=['Signatures.esm'], backend=backend)
+        with xedit.session():
+            helmet = xedit['Signatures.esm\\ARMO\\00000800']
+            keyword = xedit['Signatures.esm\\KYWD\\00000801']
+            assert helmet.signature_name == 'Armor'
+
+            # the name map is loaded once per session, after which names
+            # and signatures are dictionary lookups
+            with backend.measure() as stats:
+                assert keyword.signature_name == 'Keyword'
+                assert xedit.signature_from_name('Armor') == 'ARMO'
+                assert xedit.name_from_signature('KYWD') == 'Keyword'
+                assert xedit.name_from_signature('NPC_') == ''
+            assert 'GetSignatureNameMap' not in stats.calls
+            assert 'NameFromSignature' not in stats.calls
+
+        # a new session loads the map again
+        with xedit.session():
+            with backend.measure() as stats:
+                assert xedit.signature_from_name('Keyword') == 'KYWD'
+            assert stats.calls['GetSignatureNameMap'] == 1
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from benchmarks.fixture import MASTER
+from pyxedit import XEditError
+from pyxedit.xedit.base import XEditBase
+from pyxedit.xedit.spans import SpanTracer
+from pyxedit.xelib.wrapper_methods.elements import ElementsMethods
+
+from . fixtures import simulated_xedit  # NOQA: pytest
+
+
+class TestSpans:
+    def test_trace_spans(self, simulated_xedit, tmp_path):
+        xedit = simulated_xedit
+        patch = xedit.add_file('Patch.esp')
+        get, copy_element = XEditBase.get, ElementsMethods.copy_element
+        path = tmp_path / 'trace.json'
+
+        with xedit.trace_spans(path) as tracer:
+            assert XEditBase.get is not get
+            for npc in xedit[MASTER]['NPC_'].child_elements:
+                npc.copy_into(patch)
+
+        # the original methods are put back when tracing stops
+        assert XEditBase.get is get
+        assert ElementsMethods.copy_element is copy_element
+        assert not tracer.enabled
+
+        events = json.loads(path.read_text())['traceEvents']
+        assert len(events) == len(tracer.events)
+        spans = {}
+        for event in events:
+            assert event['ph'] == 'X'
+            spans.setdefault(event['name'], []).append(event)
+
+        assert len(spans['XEditGenericObject.copy_into']) == 3
+        assert spans['ElementsMethods.copy_element'][0]['cat'] == 'xelib'
+
+        # spans nest within the spans of the calls that made them
+        outer = spans['XEditGenericObject.copy_into'][0]
+        inner = spans['ElementsMethods.copy_element'][0]
+        assert outer['ts'] <= inner['ts']
+        assert inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+
+        # generators get a span per step
+        assert len(spans['XEditBase.iter_child_elements']) == 4
+
+    def test_one_tracer_at_a_time(self):
+        tracer = SpanTracer(targets={})
+        tracer.enable()
+        try:
+            with pytest.raises(XEditError):
+                SpanTracer(targets={}).enable()
+        finally:
+            tracer.disable()
+        assert SpanTracer._enabled_tracer is None
@@ -0,0 +1,137 @@
+import pytest
+
+from pyxedit import XEdit, XEditError
+from pyxedit.xedit.values import (BYTES, CONTAINER, FLAG, INTEGER, REFERENCE,
+                                  STRING, UNSIGNED, value_accessor)
+from pyxedit.xelib import Xelib
+from pyxedit.xelib.backends import SimulatedBackend
+
+DefTypes = Xelib.DefTypes
+ValueTypes = Xelib.ValueTypes
+
+PLUGIN = 'Values.esm'
+
+FIXTURE = {
+    'files': [{
+        'name': PLUGIN,
+        'records': [{
+            '$signature': 'NPC_',
+            '$form_id': 0x800,
+            'EDID - Editor ID': 'ValuesNPC',
+            'ACBS - Configuration': {
+                'Flags': {'$flags': {'Female': True, 'Essential': False}},
+                'Level': 12,
+            },
+            'NAM6 - Height': 1.25,
+            'RNAM - Race': {'$ref': 0x800},
+            'DATA - Data': b'\x00\x1a\xff',
+        }],
+    }],
+}
+
+
+@pytest.fixture
+def backend():
+    return SimulatedBackend(FIXTURE, instrument=True)
+
+
+@pytest.fixture
+def npc(backend):
+    xedit = XEdit(plugins=[PLUGIN], backend=backend)
+    with xedit.session():
+        yield xedit[PLUGIN]['NPC_\\00000800']
+
+
+class TestValueAccessors:
+    def test_table(self):
+        # every def type has an accessor, whatever its value type
+        for def_type in DefTypes:
+            for value_type in ValueTypes:
+                assert value_accessor(def_type, value_type)
+
+        assert value_accessor(DefTypes.LString) is STRING
+        assert value_accessor(DefTypes.ByteArray) is BYTES
+        assert value_accessor(DefTypes.Flag) is FLAG
+        assert value_accessor(DefTypes.Struct) is CONTAINER
+        assert value_accessor(None) is CONTAINER
+        assert value_accessor(DefTypes.IntegerFormater,
+                              ValueTypes.Reference) is REFERENCE
+        assert value_accessor(DefTypes.Integer, ValueTypes.Flags) is UNSIGNED
+        assert value_accessor(DefTypes.Integer, ValueTypes.Enum) is INTEGER
+
+        # value types are only retrieved for def types that need them
+        def value_type():
+            raise AssertionError('value type retrieved')
+        assert value_accessor(DefTypes.String, value_type) is STRING
+
+    def test_values(self, npc):
+        assert npc['EDID'].value == 'ValuesNPC'
+        assert npc['ACBS\\Level'].value == 12
+        assert npc['NAM6'].value == 1.25
+        assert npc['RNAM'].value.form_id == npc.form_id
+        assert npc['DATA'].value == b'\x00\x1a\xff'
+        assert npc['ACBS'].value is None
+
+        # flags read unsigned, as a bitmask
+        assert npc.xelib.get_uint_value(npc['ACBS\\Flags'].handle) == 1
+
+    def test_set_values(self, npc):
+        npc['ACBS\\Level'].value = 20
+        npc['NAM6'].value = 0.5
+        npc['DATA'].value = b'\x01\x02'
+        assert npc['ACBS\\Level'].value == 20
+        assert npc['NAM6'].value == 0.5
+        assert npc['DATA'].value == b'\x01\x02'
+
+        with pytest.raises(XEditError, match='Cannot set the value'):
+            npc['ACBS'].value = 1
+
+    def test_single_call_reads(self, backend, npc):
+        elements = [npc['EDID'], npc['ACBS\\Level'], npc['NAM6'],
+                    npc['DATA']]
+        for element in elements:
+            element.value
+        with backend.measure() as stats:
+            for element in elements:
+                element.value
+        # string results take a second call to fetch the string
+        assert dict(stats.calls) == {'GetValue': 2, 'GetResultString': 2,
+                                     'GetIntValue': 1, 'GetFloatValue': 1}
+
+    def test_types_per_definition(self, backend, npc):
+        npc['NAM6'].value
+        npc['ACBS\\Level'].value
+        with backend.measure() as stats:
+            height = npc['NAM6']
+            assert height.value == 1.25
+            assert npc['NAM6'].value == 1.25
+        # the types of an element are probed once per definition; each new
+        # object of it only takes the lookup and the read
+        assert dict(stats.calls) == {'GetElement': 2, 'GetFloatValue': 2}
+        assert height._definition == ('NPC_', 'NAM6')
+
+        # integers tell references from numbers by their value type, which
+        # is probed per object
+        with backend.measure() as stats:
+            assert npc['ACBS\\Level'].value == 12
+        assert dict(stats.calls) == {'GetElement': 1, 'ValueType': 1,
+                                     'GetIntValue': 1}
+
+    def test_union_members(self):
+        # a union member xEdit resolves per record, to a reference in one
+        # record and to a number in another
+        def package(form_id, parameter):
+            return {'$signature': 'PACK', '$form_id': form_id,
+                    'CTDA - Condition': {'Parameter #1': parameter}}
+        fixture = {'files': [{'name': PLUGIN, 'records': [
+            FIXTURE['files'][0]['records'][0],
+            package(0x801, {'$ref': 0x800}),
+            package(0x802, 5),
+        ]}]}
+        xedit = XEdit(plugins=[PLUGIN], backend=SimulatedBackend(fixture))
+        with xedit.session():
+            plugin = xedit[PLUGIN]
+            reference = plugin['PACK\\00000801']['CTDA\\Parameter #1']
+            assert reference.value.form_id == 0x800
+            number = plugin['PACK\\00000802']['CTDA\\Parameter #1']
+            assert number.value == 5
@@ -0,0 +1,76 @@
+import pytest
+
+from benchmarks.fixture import MASTER
+from pyxedit import XEditError
+from pyxedit.xedit.array import XEditArray
+from pyxedit.xedit.view import XEditView
+
+from . fixtures import simulated_xedit  # NOQA: pytest
+
+
+class TestXEditView:
+    def test_descendants(self, simulated_xedit):
+        npc = simulated_xedit[MASTER]['NPC_\\00001000']
+        full = list(npc.descendants())
+        with simulated_xedit.manage_handles():
+            views = list(npc.descendants(fast=True))
+            assert all(isinstance(view, XEditView) for view in views)
+            assert [view.path for view in views] == \
+                [obj.path for obj in full]
+            assert [view.element_type for view in views] == \
+                [obj.element_type for obj in full]
+
+            # views are slotted, without a __dict__ or finalizer
+            assert not hasattr(views[0], '__dict__')
+            assert not hasattr(XEditView, '__del__')
+
+        # handles of views are released with their manage_handles context
+        with pytest.raises(XEditError, match='already been released'):
+            views[0].name
+
+    def test_child_elements(self, simulated_xedit):
+        group = simulated_xedit[MASTER]['NPC_']
+        with simulated_xedit.manage_handles():
+            views = list(group.iter_child_elements(fast=True))
+            assert len(views) == 3
+            assert views[0].signature == 'NPC_'
+            assert views[0] == next(group.child_elements)
+
+    def test_reissued_handles(self, simulated_xedit):
+        group = simulated_xedit[MASTER]['NPC_']
+        with simulated_xedit.manage_handles():
+            view = next(group.iter_child_elements(fast=True))
+
+        # the handle is handed out again, but not to the view
+        npc = simulated_xedit[MASTER]['NPC_\\00001001']
+        assert npc.handle == view.handle
+        with pytest.raises(XEditError, match='already been released'):
+            view.name
+
+    def test_array(self, simulated_xedit):
+        armor = simulated_xedit[MASTER]['ARMO\\00004001']
+        keywords = armor['KWDA']
+        assert isinstance(keywords, XEditArray)
+        with simulated_xedit.manage_handles():
+            views = list(keywords.iter_objects(fast=True))
+            assert [view.value for view in views] == [
+                simulated_xedit.xelib.get_value(obj.handle)
+                for obj in keywords.objects]
+            assert [view.upgrade().value.editor_id for view in views] == \
+                ['BenchKeyword001', 'BenchKeyword002', 'BenchKeyword003',
+                 'BenchKeyword004']
+
+    def test_upgrade(self, simulated_xedit):
+        cell = simulated_xedit[MASTER]['CELL\\00006000']
+        with simulated_xedit.manage_handles():
+            (view,) = [view for view in cell.descendants(fast=True)
+                       if view.signature == 'XCLW']
+            obj = view.upgrade()
+            assert obj.handle == view.handle
+            assert obj.value == -2147483648.0
+
+            water = [view for view in cell.descendants(fast=True)
+                     if view.signature == 'XCWT'][0]
+            with simulated_xedit.manage_handles():
+                with pytest.raises(XEditError, match='Cannot upgrade'):
+                    water.upgrade()
@@ -1,6 +1,7 @@
 import pytest
 
 from pyxedit import Xelib
+from pyxedit.xelib.backends import SimulatedBackend
 
 
 @pytest.fixture(scope='class')
@@ -20,3 +21,41 @@ def xelib():
             game_mode=Xelib.GameModes.TES5,
             plugins=plugins).session() as xelib:
         yield xelib
+
+
+SIMULATED_FIXTURE = {
+    'files': [
+        {'name': 'Skyrim.esm',
+         'records': [
+             {'$signature': 'KYWD',
+              '$form_id': 0x00000800,
+              'EDID - Editor ID': 'ArmorHeavy'},
+             {'$signature': 'ARMO',
+              '$form_id': 0x00000801,
+              'EDID - Editor ID': 'IronHelmet',
+              'FULL - Name': 'Iron Helmet',
+              'KWDA - Keywords': [{'$ref': 0x00000800}],
+              'DATA - Data': {'Value': 60, 'Weight': 5.0}}]},
+        {'name': 'Patch.esp',
+         'masters': ['Skyrim.esm'],
+         'records': [
+             {'$signature': 'ARMO',
+              '$form_id': 0x00000801,
+              '$record_flags': {'Deleted': False, 'Non-Playable': True},
+              'EDID - Editor ID': 'IronHelmet',
+              'FULL - Name': 'Rusty Iron Helmet',
+              'KWDA - Keywords': [{'$ref': 0x00000800}],
+              'DATA - Data': {'Value': 60, 'Weight': 5.0}},
+             {'$signature': 'KYWD',
+              '$form_id': 0x01000800,
+              'EDID - Editor ID': 'PatchKeyword'}]},
+    ],
+    'signature_names': {'ARMO': 'Armor', 'KYWD': 'Keyword'},
+}
+
+
+@pytest.fixture
+def simulated_xelib():
+    backend = SimulatedBackend(SIMULATED_FIXTURE, instrument=True)
+    with Xelib(plugins=['Patch.esp'], backend=backend).session() as xelib:
+        yield xelib
@@ -0,0 +1,179 @@
+import ctypes
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from pyxedit import XEdit, Xelib, XelibError
+from pyxedit.xedit.base import XEditBase
+from pyxedit.xelib.backends import (DLLBackend,
+                                    InstrumentedAPI,
+                                    SimulatedAPI,
+                                    SimulatedBackend)
+from pyxedit.xelib.backends.dll import LazyLibrary, PROTOTYPES
+
+from . fixtures import SIMULATED_FIXTURE as FIXTURE, simulated_xelib  # NOQA: for pytest
+
+
+class TestBackends:
+    def test_default_backend(self):
+        xelib = Xelib()
+        assert isinstance(xelib.backend, DLLBackend)
+        assert not xelib.loaded
+
+    def test_session(self):
+        backend = SimulatedBackend(FIXTURE)
+        xelib = Xelib(plugins=['Patch.esp'], backend=backend)
+        with xelib.session():
+            assert isinstance(xelib.raw_api, SimulatedAPI)
+            # masters are loaded ahead of the requested plugins
+            assert xelib.get_loaded_file_names() == ['Skyrim.esm', 'Patch.esp']
+            assert xelib.get_global('FileCount') == '2'
+        assert not xelib.loaded
+
+    def test_elements_and_values(self, simulated_xelib):
+        xelib = simulated_xelib
+        record = xelib.get_element(0, 'Patch.esp\\ARMO\\00000801')
+        assert xelib.element_type(record) == Xelib.ElementTypes.MainRecord
+        assert xelib.signature(record) == 'ARMO'
+        assert xelib.get_value(record, 'FULL') == 'Rusty Iron Helmet'
+        assert xelib.get_int_value(record, 'DATA\\Value') == 60
+        assert xelib.get_float_value(record, 'DATA\\Weight') == 5.0
+        assert xelib.long_path(record) == 'Patch.esp\\ARMO\\00000801'
+        assert xelib.local_path(xelib.get_element(record, 'DATA\\Value')) == \
+            'DATA - Data\\Value'
+
+        xelib.set_value(record, 'Steel Helmet', path='FULL - Name')
+        assert xelib.get_value(record, 'FULL') == 'Steel Helmet'
+        assert xelib.get_is_modified(record)
+
+        keywords = xelib.get_element(record, 'KWDA')
+        assert xelib.element_type(keywords) == \
+            Xelib.ElementTypes.SubRecordArray
+        keyword = xelib.get_links_to(keywords, '[0]')
+        assert xelib.editor_id(keyword) == 'ArmorHeavy'
+        assert xelib.get_value(keywords, '[0]') == \
+            'ArmorHeavy [KYWD:00000800]'
+
+        assert xelib.get_enabled_flags(
+            record, 'Record Header\\Record Flags') == ['Non-Playable']
+        assert xelib.get_uint_value(record, 'Record Header\\Record Flags') == 2
+
+    def test_records(self, simulated_xelib):
+        xelib = simulated_xelib
+        patch = xelib.file_by_name('Patch.esp')
+        records = xelib.get_records(patch, 'KYWD', include_overrides=True)
+        assert [xelib.get_hex_form_id(r) for r in records] == ['01000800']
+        assert xelib.get_form_id(records[0], native=True) == 0x01000800
+
+        helmet = xelib.get_record(0, 0x00000801)
+        assert xelib.is_master(helmet)
+        assert xelib.get_value(helmet, 'FULL') == 'Iron Helmet'
+        (override,) = xelib.get_overrides(helmet)
+        assert xelib.element_equals(xelib.get_winning_override(helmet),
+                                    override)
+
+        new = xelib.add_file('New.esp')
+        copy = xelib.copy_element(override, new, as_new=True)
+        assert xelib.get_hex_form_id(copy) == '02000800'
+        assert xelib.get_master_names(new) == []
+
+    def test_errors(self, simulated_xelib):
+        with pytest.raises(XelibError, match='Failed to resolve path'):
+            simulated_xelib.get_element(0, 'Skyrim.esm\\NOPE', ex=True)
+        assert not simulated_xelib.get_element(0, 'Skyrim.esm\\NOPE')
+
+        # functions that aren't simulated fail loudly
+        with pytest.raises(NotImplementedError, match='GetRefValue'):
+            simulated_xelib.get_ref_value(0, 'Skyrim.esm')
+
+    def test_handles(self, simulated_xelib):
+        xelib = simulated_xelib
+        api = xelib.raw_api.api
+        opened = len(api.handles)
+        with xelib.manage_handles():
+            xelib.get_element(0, 'Skyrim.esm\\00000801')
+            assert len(api.handles) == opened + 1
+        assert len(api.handles) == opened
+
+    def test_call_counts(self, simulated_xelib):
+        backend = simulated_xelib.backend
+        assert isinstance(simulated_xelib.raw_api, InstrumentedAPI)
+
+        with backend.measure() as stats:
+            simulated_xelib.get_value(0, 'Skyrim.esm\\00000801\\FULL')
+        assert stats.calls == {'GetValue': 1, 'GetResultString': 1}
+        assert stats.total == 2
+        assert backend.call_counts['GetValue'] >= 1
+
+    def test_latency(self):
+        backend = SimulatedBackend(FIXTURE, latency=0.0005)
+        with Xelib(plugins=['Skyrim.esm'], backend=backend).session() as xelib:
+            with backend.measure() as stats:
+                for _ in range(10):
+                    xelib.get_element(0, 'Skyrim.esm')
+        assert stats.total == 10
+        assert stats.elapsed >= 10 * 0.0005
+
+    def test_xedit(self):
+        backend = SimulatedBackend(FIXTURE, instrument=True)
+        xedit = XEdit(plugins=['Patch.esp'], backend=backend)
+        with xedit.session():
+            helmet = xedit['Patch.esp']['ARMO\\00000801']
+            assert helmet.signature == 'ARMO'
+            assert helmet.form_id == 0x801
+            assert helmet.is_override
+            assert helmet.master.editor_id == 'IronHelmet'
+            assert helmet['DATA\\Weight'].value == 5.0
+            assert [keyword.editor_id for keyword in helmet['KWDA']] == \
+                ['ArmorHeavy']
+
+    def test_lazy_library(self):
+        functions = {name: SimpleNamespace(argtypes=None, restype=None)
+                     for name in ('GetValue', 'Unknown')}
+        lib = LazyLibrary(SimpleNamespace(**functions, _handle=1234))
+        assert lib._handle == 1234
+
+        # prototypes are only bound once a function is looked up
+        assert functions['GetValue'].argtypes is None
+        get_value = lib.GetValue
+        assert get_value is functions['GetValue']
+        assert get_value.argtypes == [ctypes.c_uint, ctypes.c_wchar_p,
+                                      ctypes.POINTER(ctypes.c_int)]
+        assert get_value.restype is ctypes.c_ushort
+        assert 'GetValue' in PROTOTYPES
+        assert vars(lib)['GetValue'] is get_value
+
+        # functions without a known signature are left as they are
+        assert lib.Unknown.argtypes is None
+        with pytest.raises(AttributeError):
+            lib.Missing
+
+    def test_lazy_backends(self):
+        # backends only used for testing and debugging, and the thread pool
+        # of resource extraction, are not imported along with pyxedit
+        script = ('import sys, pyxedit; '
+                  'print(sorted(name for name in sys.modules if name in ('
+                  '"pyxedit.xelib.backends.simulated", '
+                  '"pyxedit.xelib.backends.trace", '
+                  '"concurrent.futures.thread")))')
+        result = subprocess.run([sys.executable, '-c', script], check=True,
+                                capture_output=True, text=True)
+        assert result.stdout.strip() == '[]'
+
+        from pyxedit.xelib import backends
+        assert backends.read_trace.__module__ == \
+            'pyxedit.xelib.backends.trace'
+        with pytest.raises(AttributeError):
+            backends.Missing
+
+    def test_object_classes(self):
+        xedit = XEdit(plugins=['Patch.esp'],
+                      backend=SimulatedBackend(FIXTURE))
+        with xedit.session():
+            helmet = xedit['Patch.esp']['ARMO\\00000801']
+            assert type(helmet).__name__ == 'XEditArmor'
+        assert XEditBase.object_class_for('ARMO') is type(helmet)
+        assert XEditBase.object_class_for('NPC_').__name__ == 'XEditNPC'
+        assert XEditBase.object_class_for('XXXX') is None
@@ -0,0 +1,158 @@
+import struct
+import zlib
+
+import pytest
+
+from pyxedit.xelib.bsa import (BSAArchive,
+                               BSAError,
+                               FOLDER_RECORDS,
+                               FILE_RECORD,
+                               HEADER,
+                               normalize_path,
+                               path_hashes,
+                               tes4_hash)
+
+
+def build_bsa(path, files, version=104, compress=False, embed_names=False,
+              toggled=()):
+    '''
+    Writes a synthetic BSA archive holding the given ``{path: data}`` files.
+    Files in ``toggled`` have their compression inverted from the archive's.
+    '''
+    folders = {}
+    for file_path, data in files.items():
+        folder, _, name = normalize_path(file_path).rpartition('\\')
+        folders.setdefault(folder, []).append((name, file_path, data))
+    folders = sorted(folders.items(), key=lambda item: tes4_hash(item[0]))
+
+    folder_record = FOLDER_RECORDS[version]
+    flags = 0x1 | 0x2 | (0x4 if compress else 0) | (0x100 if embed_names else 0)
+    file_names = b''.join(name.encode() + b'\0'
+                          for _, entries in folders for name, _, _ in entries)
+    folder_names_length = sum(len(folder) + 1 for folder, _ in folders)
+
+    file_records_offset = HEADER.size + len(folders) * folder_record.size
+    file_records_length = sum(len(folder) + 2 + len(entries) * FILE_RECORD.size
+                              for folder, entries in folders)
+    data_offset = file_records_offset + file_records_length + len(file_names)
+
+    folder_block = b''
+    file_block = b''
+    data_block = b''
+    for folder, entries in folders:
+        offset = file_records_offset + len(file_block) + len(file_names)
+        if version == 104:
+            folder_block += folder_record.pack(tes4_hash(folder), len(entries),
+                                               offset)
+        else:
+            folder_block += folder_record.pack(tes4_hash(folder), len(entries),
+                                               0, offset)
+        file_block += bytes([len(folder) + 1]) + folder.encode() + b'\0'
+        for name, file_path, data in entries:
+            stored = data
+            if compress != (file_path in toggled):
+                if version == 104:
+                    packed = zlib.compress(data)
+                else:
+                    import lz4.frame
+                    packed = lz4.frame.compress(data)
+                stored = struct.pack('<I', len(data)) + packed
+            if embed_names:
+                full_name = normalize_path(file_path).encode()
+                stored = bytes([len(full_name)]) + full_name + stored
+
+            size = len(stored) | (0x40000000 if file_path in toggled else 0)
+            file_block += FILE_RECORD.pack(path_hashes(file_path)[1], size,
+                                           data_offset + len(data_block))
+            data_block += stored
+
+    header = HEADER.pack(b'BSA\0', version, HEADER.size, flags, len(folders),
+                         len(files), folder_names_length, len(file_names), 0)
+    with open(path, 'wb') as fp:
+        fp.write(header + folder_block + file_block + file_names + data_block)
+    return path
+
+
+FILES = {
+    'textures\\sky\\skyrimclouds01.dds': b'clouds' * 100,
+    'textures\\sky\\skyrimstars.dds': b'stars' * 50,
+    'meshes\\actors\\character\\male.nif': b'\x00\x01\x02' * 30,
+    'sound\\fx\\wind.wav': b'whoosh',
+    'scripts\\noextension': b'',
+}
+
+
+class TestBSA:
+    def test_tes4_hash(self):
+        # low half is last char, second to last char, length, first char
+        assert tes4_hash('meshes') & 0xFFFFFFFF == 0x6D066573
+        # with extension bits for some file types
+        assert tes4_hash('meshes', '.dds') & 0xFFFFFFFF == 0x6D06E5F3
+        assert tes4_hash('') == 0
+        assert path_hashes('Textures/Sky/SkyrimClouds01.DDS') == \
+            path_hashes('textures\\sky\\skyrimclouds01.dds')
+
+    @pytest.mark.parametrize('compress', [False, True])
+    @pytest.mark.parametrize('embed_names', [False, True])
+    def test_read(self, tmp_path, compress, embed_names):
+        path = build_bsa(tmp_path / 'test.bsa', FILES, compress=compress,
+                         embed_names=embed_names,
+                         toggled={'sound\\fx\\wind.wav'})
+
+        with BSAArchive(path) as archive:
+            assert archive.version == 104
+            assert len(archive) == len(FILES)
+            assert sorted(archive.file_paths) == sorted(FILES)
+
+            # should read every file, looking them up in any form
+            for file_path, data in FILES.items():
+                assert archive.read(file_path) == data
+                assert archive.read(file_path.upper().replace('\\', '/')) == data
+
+            # should fail on files not in the archive
+            assert 'textures\\sky\\nope.dds' not in archive
+            with pytest.raises(BSAError):
+                archive.read('textures\\sky\\nope.dds')
+
+    def test_read_many(self, tmp_path):
+        path = build_bsa(tmp_path / 'test.bsa', FILES, compress=True)
+
+        with BSAArchive(path) as archive:
+            assert dict(archive.read_many(FILES, max_workers=3)) == FILES
+
+    def test_v105(self, tmp_path):
+        pytest.importorskip('lz4.frame')
+        path = build_bsa(tmp_path / 'test.bsa', FILES, version=105,
+                         compress=True)
+
+        with BSAArchive(path) as archive:
+            assert archive.version == 105
+            for file_path, data in FILES.items():
+                assert archive.read(file_path) == data
+
+    def test_v105_without_lz4(self, tmp_path, monkeypatch):
+        path = build_bsa(tmp_path / 'test.bsa', FILES, version=105)
+        monkeypatch.setattr('pyxedit.xelib.bsa.lz4', None)
+
+        with BSAArchive(path) as archive:
+            # uncompressed files don't need lz4
+            assert archive.read('sound\\fx\\wind.wav') == b'whoosh'
+
+            # compressed ones should fail with a clear error
+            archive.archive_flags |= 0x4
+            with pytest.raises(BSAError, match='lz4'):
+                archive.read('sound\\fx\\wind.wav')
+
+    def test_invalid(self, tmp_path):
+        path = tmp_path / 'test.bsa'
+        path.write_bytes(b'')
+        with pytest.raises(BSAError):
+            BSAArchive(path)
+
+        path.write_bytes(b'BTDX' + bytes(40))
+        with pytest.raises(BSAError):
+            BSAArchive(path)
+
+        path.write_bytes(HEADER.pack(b'BSA\0', 103, 36, 0, 0, 0, 0, 0, 0))
+        with pytest.raises(BSAError):
+            BSAArchive(path)
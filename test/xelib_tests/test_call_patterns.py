@@ -0,0 +1,64 @@
+import pytest
+
+from pyxedit import Xelib, XelibError
+from pyxedit.xelib.backends import SimulatedBackend
+from pyxedit.xelib.call_patterns import (PER_ITEM,
+                                         REPEATED,
+                                         CallPatternDetector,
+                                         DetectingAPI,
+                                         summarize_calls)
+
+from . fixtures import simulated_xelib  # NOQA: for pytest
+
+
+class TestCallPatterns:
+    def test_repeated_calls(self, simulated_xelib):
+        xelib = simulated_xelib
+        record = xelib.get_element(0, 'Skyrim.esm\\00000801')
+        with xelib.detect_call_patterns() as detector:
+            assert isinstance(xelib.raw_api, DetectingAPI)
+            for _ in range(4):
+                xelib.get_value(record, 'FULL')
+        assert not isinstance(xelib.raw_api, DetectingAPI)
+
+        repeated = [p for p in detector.report() if p.kind == REPEATED]
+        (pattern,) = repeated
+        assert pattern.calls == 'GetValue'
+        assert pattern.count == 3
+        assert pattern.stack[:2] == ('Xelib.get_value', 'Xelib.get_string')
+        assert pattern.site.startswith(__file__)
+
+    def test_mutations_break_repeats(self, simulated_xelib):
+        xelib = simulated_xelib
+        record = xelib.get_element(0, 'Patch.esp\\00000801')
+        with xelib.detect_call_patterns() as detector:
+            for i in range(4):
+                xelib.get_value(record, 'FULL')
+                xelib.set_value(record, f'Helmet {i}', path='FULL')
+        assert not [p for p in detector.report() if p.kind == REPEATED]
+
+    def test_per_item_calls(self, simulated_xelib):
+        xelib = simulated_xelib
+        with xelib.detect_call_patterns(loop_threshold=3) as detector:
+            for _ in range(3):
+                with xelib.manage_handles():
+                    record = xelib.get_element(0, 'Skyrim.esm\\00000801')
+                    xelib.get_value(record, 'FULL')
+        patterns = [p for p in detector.report() if p.kind == PER_ITEM]
+        assert [(p.calls, p.count, p.stack) for p in patterns
+                if p.stack == ('Xelib.get_value',)] == [
+            (('GetValue', 'GetResultString'), 3, ('Xelib.get_value',))]
+        assert detector.total_calls >= 12
+        assert 'GetValue, GetResultString' in detector.format_report()
+
+    def test_outside_session(self):
+        xelib = Xelib(backend=SimulatedBackend({'files': []}))
+        with pytest.raises(XelibError):
+            with xelib.detect_call_patterns():
+                pass
+
+    def test_summarize_calls(self):
+        assert summarize_calls(['GetAllFlags', 'GetResultString', 'GetFlag',
+                                'GetFlag', 'GetFlag']) == \
+            'GetAllFlags, GetResultString, GetFlag x3'
+        assert CallPatternDetector().report() == []
@@ -0,0 +1,59 @@
+from . fixtures import simulated_xelib  # NOQA: for pytest
+
+
+class TestHandleTable:
+    def test_layers(self, simulated_xelib):
+        xelib = simulated_xelib
+        root = xelib.current_layer
+        h1 = xelib.get_element(0, 'Skyrim.esm')
+        assert xelib.handle_layer(h1) == root
+
+        with xelib.manage_handles():
+            outer = xelib.current_layer
+            h2 = xelib.get_element(0, 'Patch.esp')
+            with xelib.manage_handles():
+                inner = xelib.current_layer
+                h3 = xelib.get_element(0, 'Skyrim.esm\\00000801')
+                assert len({root, outer, inner}) == 3
+                assert xelib.handle_layer(h3) == inner
+                assert xelib.full_handles_stack[-1] == {h3}
+            assert xelib.handle_layer(h3) is None
+            assert xelib.handle_layer(h2) == outer
+
+        assert xelib.handle_layer(h2) is None
+        assert xelib.all_opened_handles == {h1}
+
+        # layer ids are never reused, so a handle tracked by a released layer
+        # cannot be mistaken for one tracked by a new layer
+        with xelib.manage_handles():
+            assert xelib.current_layer not in (root, outer, inner)
+
+    def test_promote_handle(self, simulated_xelib):
+        xelib = simulated_xelib
+        with xelib.manage_handles():
+            outer = xelib.current_layer
+            with xelib.manage_handles():
+                handle = xelib.get_element(0, 'Skyrim.esm\\00000801')
+                assert xelib.promote_handle(handle) == outer
+                assert xelib.handle_layer(handle) == outer
+            assert handle in xelib.all_opened_handles
+            assert xelib.get_value(handle, 'FULL') == 'Iron Helmet'
+        assert handle not in xelib.all_opened_handles
+
+        # handles in the outermost layer have nowhere to be promoted to
+        handle = xelib.get_element(0, 'Skyrim.esm\\00000801')
+        assert xelib.promote_handle(handle) is None
+
+    def test_release(self, simulated_xelib):
+        xelib = simulated_xelib
+        api = xelib.raw_api.api
+        handle = xelib.get_element(0, 'Skyrim.esm\\00000801')
+        layer = xelib.handle_layer(handle)
+
+        # deferring the release of a handle from the wrong layer does nothing
+        xelib.defer_release(handle, layer + 1)
+        assert xelib.handle_layer(handle) == layer
+
+        xelib.release_handle(handle)
+        assert xelib.handle_layer(handle) is None
+        assert handle not in api.handles
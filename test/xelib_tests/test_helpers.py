@@ -0,0 +1,63 @@
+import pytest
+
+from pyxedit import Xelib, XelibError
+
+
+class StandInAPI:
+    '''
+    Stands in for ``XEditLib.dll``, recording the name of every function
+    called on it. Functions succeed unless their name is in ``failing``, with
+    a result of ``42`` for ``Get*`` functions, and ``0`` (and empty string and
+    array results) otherwise.
+    '''
+    def __init__(self, failing=()):
+        self.calls = []
+        self.failing = set(failing)
+
+    def __getattr__(self, name):
+        def function(*args):
+            self.calls.append(name)
+            if name in self.failing:
+                return False
+            if args and hasattr(args[-1], '_obj'):
+                args[-1]._obj.value = 42 if name.startswith('Get') else 0
+            return True
+        return function
+
+
+@pytest.fixture
+def stand_in_xelib():
+    xelib = Xelib()
+    xelib._raw_api = StandInAPI()
+    return xelib
+
+
+class TestHelpers:
+    def test_get_element_dll_calls(self, stand_in_xelib):
+        # a successful call should not make any calls to build an error
+        # message it ends up not needing
+        assert stand_in_xelib.get_element(1, 'EDID', ex=True) == 42
+        assert stand_in_xelib.raw_api.calls == ['GetElement']
+
+        stand_in_xelib.raw_api.calls.clear()
+        assert stand_in_xelib.element_type(1) == Xelib.ElementTypes.File
+        assert stand_in_xelib.raw_api.calls == ['ElementType']
+
+    def test_lazy_error_context(self, stand_in_xelib):
+        api = stand_in_xelib.raw_api
+        api.failing.add('GetElement')
+
+        # error context is only built once a call fails, after retrieving
+        # the xedit-lib exception message so that it cannot be replaced
+        with pytest.raises(XelibError, match='Failed to get element at'):
+            stand_in_xelib.get_element(1, 'EDID', ex=True)
+        assert api.calls[0] == 'GetElement'
+        assert api.calls.index('GetExceptionMessage') < api.calls.index('Path')
+        assert api.calls.index('GetExceptionStack') < api.calls.index('Path')
+
+    def test_xelib_error(self, stand_in_xelib):
+        error = stand_in_xelib.xelib_error(lambda: 'Lazy', 'details')
+        assert str(error).startswith('Lazy: details: xedit-lib message:')
+
+        error = stand_in_xelib.xelib_error('Eager')
+        assert str(error).startswith('Eager: xedit-lib message:')
@@ -353,3 +353,21 @@ class TestRecords:
         assert xelib.get_conflict_data(n1, e) == (xelib.ConflictAll.OnlyOne,
                                                   xelib.ConflictThis.OnlyOne)
 
+    def test_get_conflict_data_many(self, xelib):
+        data = self.get_data(xelib)
+        n2 = xelib.get_nodes(data.kw2)
+
+        handles = [xelib.get_element(data.kw2, path=path)
+                   for path in ('', 'Record Header', 'CNAM - Color')]
+
+        # should match calling get_conflict_data on each element
+        assert (xelib.get_conflict_data_many(n2, handles) ==
+                [xelib.get_conflict_data(n2, h) for h in handles])
+        assert (xelib.get_conflict_data_many(n2, handles, as_string=True) ==
+                [('ConflictCritical', 'Master'),
+                 ('NoConflict', 'Master'),
+                 ('ConflictCritical', 'Master')])
+
+        # should return Unknown for elements it can't get conflict data for
+        assert xelib.get_conflict_data_many(n2, [0]) == [
+            (xelib.ConflictAll.Unknown, xelib.ConflictThis.Unknown)]
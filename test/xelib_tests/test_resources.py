@@ -1,11 +1,58 @@
 from pathlib import Path
+import threading
 import pytest
 
-from pyxedit import XelibError
+from pyxedit import Xelib, XelibError
+from pyxedit.xelib.wrapper_methods.resources import archive_group
 
 from . fixtures import xelib  # NOQA: for pytest
 
 
+class TextureAPI:
+    '''
+    Stands in for the texture functions of ``XEditLib.dll``, serving textures
+    of the given ``{name: (width, height)}`` sizes.
+    '''
+    def __init__(self, sizes):
+        self.sizes = sizes
+        self.current = None
+
+    @staticmethod
+    def pixels(width, height):
+        return bytes(range(width * height * 4))
+
+    def GetTextureData(self, name, width, height):
+        if name not in self.sizes:
+            return False
+        self.current = self.sizes[name]
+        width._obj.value, height._obj.value = self.current
+        return True
+
+    def GetResultBytes(self, buffer, size):
+        pixels = self.pixels(*self.current)
+        if size != len(pixels):
+            return False
+        buffer[:size] = pixels
+        return True
+
+
+class ExtractAPI:
+    '''
+    Stands in for ``ExtractFile`` of ``XEditLib.dll``, writing each file's
+    path as its contents, and recording the threads it is called from.
+    '''
+    def __init__(self, fail=()):
+        self.fail = fail
+        self.threads = set()
+
+    def ExtractFile(self, name, src, dst):
+        self.threads.add(threading.get_ident())
+        if src in self.fail:
+            return False
+        Path(dst).write_text(src)
+        return True
+
+
 class TestResources:
     def test_get_container_files(self, xelib):
         # should fail if container is not loaded
@@ -21,10 +68,83 @@ class TestResources:
         assert len(xelib.get_container_files(p, 'textures\\sky\\')) == 47
 
     def test_get_texture_data(self, xelib):
-        pytest.skip('this method is not yet implemented on my side')
         # should fail if the resource does not exist
-        # with pytest.raises(XelibError):
-        #     xelib.get_texture_data('abcdefghijk')
+        with pytest.raises(XelibError):
+            xelib.get_texture_data('abcdefghijk')
 
         # should return correct bitmap if resource exists
-        # w, h = xelib.get_texture_data('textures\\sky\\skyrimclouds01.dds')
+        image = xelib.get_texture_data('textures\\sky\\skyrimclouds01.dds')
+        assert image.width > 0 and image.height > 0
+        assert image.data.shape == (image.height, image.width, 4)
+        assert len(image.tobytes()) == image.width * image.height * 4
+
+    def test_get_texture_data_many(self):
+        xelib = Xelib()
+        xelib._raw_api = TextureAPI({'small': (2, 1), 'large': (3, 2)})
+        names = ['small', 'large', 'small']
+
+        # the buffer should only be reallocated for a larger texture
+        buffers = []
+        for name, image in xelib.get_texture_data_many(names):
+            assert image.data.shape == (image.height, image.width, 4)
+            assert image.tobytes() == TextureAPI.pixels(image.width,
+                                                        image.height)
+            buffers.append(image.data.obj)
+        assert buffers[0] is not buffers[1]
+        assert buffers[1] is buffers[2]
+
+        # copies should stay valid
+        images = dict(xelib.get_texture_data_many(names[:2], copy=True))
+        assert images['small'].tobytes() == TextureAPI.pixels(2, 1)
+
+    def test_extract_files(self, xelib, tmp_path):
+        p = str(Path(xelib.get_global('DataPath'), 'Skyrim - Shaders.bsa'))
+
+        # should extract every file in the container
+        stats = xelib.extract_files(p, tmp_path)
+        assert stats.files == 122
+        assert not stats.skipped and not stats.failed
+        assert stats.bytes == sum(f.stat().st_size
+                                  for f in tmp_path.rglob('*')
+                                  if f.is_file() and f.suffix != '.json')
+
+        # should skip files already extracted
+        stats = xelib.extract_files(p, tmp_path)
+        assert stats.files == 0
+        assert stats.skipped == 122
+
+        # should re-extract files that have changed since
+        changed = next(f for f in tmp_path.rglob('*') if f.is_file() and
+                       f.suffix != '.json')
+        changed.write_bytes(b'changed')
+        stats = xelib.extract_files(p, tmp_path)
+        assert stats.files == 1
+        assert stats.skipped == 121
+
+    def test_extract_files_thread(self, tmp_path):
+        xelib = Xelib()
+        xelib._raw_api = ExtractAPI(fail={'meshes\\b.nif'})
+        container = tmp_path / 'Test.bsa'
+        container.write_bytes(b'')
+        file_paths = [f'meshes\\{name}.nif' for name in 'abcdef']
+
+        done = []
+        stats = xelib.extract_files(
+            str(container), tmp_path / 'out', file_paths=file_paths,
+            window=2, progress=lambda num_done, total, path: done.append(path))
+        assert stats.files == 5
+        assert stats.failed == ['meshes\\b.nif']
+        assert sorted(done) == sorted(file_paths)
+
+        # the dll is only ever called from the calling thread
+        assert xelib._raw_api.threads == {threading.get_ident()}
+
+        stats = xelib.extract_files(str(container), tmp_path / 'out',
+                                    file_paths=file_paths)
+        assert stats.skipped == 5
+        assert stats.failed == ['meshes\\b.nif']
+
+    def test_archive_group(self):
+        assert archive_group('textures\\sky\\skyrimclouds01.dds') == 'Textures'
+        assert archive_group('sound\\fx\\foo.WAV') == 'Sounds'
+        assert archive_group('meshes\\foo.nif') == ''
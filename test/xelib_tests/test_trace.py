@@ -0,0 +1,99 @@
+import ctypes
+
+import pytest
+
+from pyxedit import XEdit
+from pyxedit.xelib.backends import (RecordingBackend,
+                                    ReplayBackend,
+                                    SimulatedBackend,
+                                    TraceError,
+                                    read_trace)
+from pyxedit.xelib.backends.trace import OUTPUT, TraceWriter
+
+from . fixtures import SIMULATED_FIXTURE as FIXTURE
+
+
+def read_helmet(xedit):
+    helmet = xedit['Patch.esp']['ARMO\\00000801']
+    return (helmet.form_id_str,
+            helmet.editor_id,
+            helmet['FULL'].value,
+            helmet['DATA\\Weight'].value,
+            [keyword.editor_id for keyword in helmet['KWDA']],
+            [plugin.name for plugin in xedit.plugins])
+
+
+class TestTrace:
+    def test_write_read(self, tmp_path):
+        path = tmp_path / 'calls.trace'
+        writer = TraceWriter(path)
+        len_ = ctypes.c_int(3)
+        res = ctypes.c_uint(7)
+        buffer = ctypes.create_unicode_buffer('abc', 3)
+        handles = (ctypes.c_uint * 2)(5, 6)
+        pixels = (ctypes.c_ubyte * 2)(1, 2)
+        writer.write_call('GetElement', (1, 'EDID', ctypes.byref(res)), True)
+        writer.write_call('GetResultString', (buffer, len_), True)
+        writer.write_call('GetResultArray', (handles, 2), True)
+        writer.write_call('GetResultBytes', (pixels, 2), False)
+        writer.write_call('SetFloatValue', (1, 'EDID', 0.5), None)
+        writer.write_call('GetElement', (1, 'EDID', ctypes.byref(res)), True)
+        writer.close()
+
+        calls = read_trace(path)
+        assert [call.name for call in calls] == [
+            'GetElement', 'GetResultString', 'GetResultArray',
+            'GetResultBytes', 'SetFloatValue', 'GetElement']
+        assert calls[0].args == (1, 'EDID', OUTPUT)
+        assert calls[0].outputs == {2: 7}
+        assert calls[1].args == (OUTPUT, 3)
+        assert calls[1].outputs == {0: 'abc'}
+        assert calls[2].outputs == {0: [5, 6]}
+        assert calls[3].outputs == {0: b'\x01\x02'}
+        assert calls[3].result is False
+        assert calls[4].args == (1, 'EDID', 0.5)
+        assert calls[4].result is None
+
+        # function names and strings are only stored once
+        assert path.read_bytes().count(b'GetElement') == 1
+        assert path.read_bytes().count(b'EDID') == 1
+
+    def test_invalid(self, tmp_path):
+        path = tmp_path / 'calls.trace'
+        path.write_bytes(b'nope')
+        with pytest.raises(TraceError):
+            read_trace(path)
+
+        writer = TraceWriter(path)
+        writer.write_call('GetElement', (1, 'EDID', 2), True)
+        writer.close()
+        path.write_bytes(path.read_bytes()[:-3])
+        with pytest.raises(TraceError, match='truncated'):
+            read_trace(path)
+
+    def test_record_replay(self, tmp_path):
+        path = tmp_path / 'session.trace'
+        backend = RecordingBackend(SimulatedBackend(FIXTURE), path)
+        with XEdit(plugins=['Patch.esp'], backend=backend).session() as xedit:
+            recorded = read_helmet(xedit)
+        assert backend.writer.count == len(read_trace(path))
+
+        # the same code path should get the same results back from the trace
+        backend = ReplayBackend(path, instrument=True)
+        with XEdit(plugins=['Patch.esp'], backend=backend).session() as xedit:
+            assert read_helmet(xedit) == recorded
+            assert xedit.xelib.raw_api.api.remaining > 0
+        assert backend.total_calls == len(backend.calls)
+
+    def test_divergence(self, tmp_path):
+        path = tmp_path / 'session.trace'
+        backend = RecordingBackend(SimulatedBackend(FIXTURE), path)
+        with XEdit(plugins=['Patch.esp'], backend=backend).session() as xedit:
+            read_helmet(xedit)
+
+        backend = ReplayBackend(path)
+        xedit = XEdit(plugins=['Patch.esp'], backend=backend)
+        xedit.xelib.start_session()
+        with pytest.raises(TraceError, match='diverges'):
+            xedit['Skyrim.esm']['ARMO\\00000801']
+        xedit.xelib._raw_api = None